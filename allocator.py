@@ -0,0 +1,355 @@
+#распределители оперативной памяти для разделов переменного размера (размеры в МБ)
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+import heapq
+from typing import Dict, List, Optional
+
+class Allocator(ABC):
+    #конструктор
+    def __init__(self, capacity: int):
+        self.capacity = capacity  #объем памяти
+        self.freeMemory = capacity  #объем свободной памяти
+        self.sizes: Dict[int, int] = {}  #адрес выделенного участка -> запрошенный размер
+
+    #выделение участка, возвращает адрес или None, если участок не найден
+    @abstractmethod
+    def allocate(self, size: int) -> Optional[int]:
+        pass
+
+    #освобождение участка по адресу
+    @abstractmethod
+    def free(self, address: int):
+        pass
+
+    #размер наибольшего свободного участка
+    @abstractmethod
+    def largestFree(self) -> int:
+        pass
+
+    #наибольший запрос, который может быть выполнен в пустой памяти
+    def maxRequest(self) -> int:
+        return self.capacity
+
+    #поместится ли участок заданного размера сейчас
+    def fits(self, size: int) -> bool:
+        return self.largestFree() >= max(1, size)
+
+    #внешняя фрагментация: доля свободной памяти вне наибольшего свободного участка
+    def fragmentation(self) -> float:
+        if self.freeMemory <= 0:
+            return 0.0
+        return 1 - self.largestFree() / self.freeMemory
+
+    #внутренняя фрагментация: память, выделенная сверх запрошенной
+    def internalWaste(self) -> int:
+        return 0
+
+#первый подходящий: дерево отрезков по мегабайтам хранит длины свободных серий
+class FirstFitAllocator(Allocator):
+    FREE, USED = 1, 2  #отложенные присваивания отрезка
+
+    #конструктор
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.leaves = 1  #количество листьев (степень двойки)
+        while self.leaves < capacity:
+            self.leaves *= 2
+        size = 2 * self.leaves
+        self.best = [0] * size  #наибольшая свободная серия в отрезке
+        self.prefix = [0] * size  #свободная серия в начале отрезка
+        self.suffix = [0] * size  #свободная серия в конце отрезка
+        self.lazy = [0] * size  #отложенное присваивание
+        for leaf in range(capacity):
+            node = self.leaves + leaf
+            self.best[node] = self.prefix[node] = self.suffix[node] = 1
+        for node in range(self.leaves - 1, 0, -1):
+            self.pull(node, (self.leaves >> (node.bit_length() - 1)) // 2)
+
+    #пересчет узла по потомкам, half - длина отрезка потомка
+    def pull(self, node: int, half: int):
+        left, right = 2 * node, 2 * node + 1
+        self.prefix[node] = self.prefix[left] if self.prefix[left] < half else half + self.prefix[right]
+        self.suffix[node] = self.suffix[right] if self.suffix[right] < half else half + self.suffix[left]
+        self.best[node] = max(self.best[left], self.best[right], self.suffix[left] + self.prefix[right])
+
+    #присваивание всему отрезку узла
+    def apply(self, node: int, length: int, value: int):
+        free = length if value == self.FREE else 0
+        self.best[node] = self.prefix[node] = self.suffix[node] = free
+        self.lazy[node] = value
+
+    #передача отложенного присваивания потомкам
+    def push(self, node: int, half: int):
+        if self.lazy[node]:
+            self.apply(2 * node, half, self.lazy[node])
+            self.apply(2 * node + 1, half, self.lazy[node])
+            self.lazy[node] = 0
+
+    #присваивание отрезку [start, end)
+    def assign(self, start: int, end: int, value: int, node: int = 1, low: int = 0, high: int = None):
+        if high is None:
+            high = self.leaves
+        if end <= low or high <= start:
+            return
+        if start <= low and high <= end:
+            self.apply(node, high - low, value)
+            return
+        half = (high - low) // 2
+        self.push(node, half)
+        self.assign(start, end, value, 2 * node, low, low + half)
+        self.assign(start, end, value, 2 * node + 1, low + half, high)
+        self.pull(node, half)
+
+    #адрес первой свободной серии длиной не меньше size
+    def findFirst(self, size: int) -> int:
+        node, low, length = 1, 0, self.leaves
+        while length > 1:
+            half = length // 2
+            self.push(node, half)
+            left = 2 * node
+            if self.best[left] >= size:
+                node = left
+            elif self.suffix[left] + self.prefix[left + 1] >= size:
+                return low + half - self.suffix[left]
+            else:
+                node, low = left + 1, low + half
+            length = half
+        return low
+
+    def allocate(self, size: int) -> Optional[int]:
+        size = max(1, size)
+        if self.best[1] < size:
+            return None
+        address = self.findFirst(size)
+        self.assign(address, address + size, self.USED)
+        self.sizes[address] = size
+        self.freeMemory -= size
+        return address
+
+    def free(self, address: int):
+        size = self.sizes.pop(address)
+        self.assign(address, address + size, self.FREE)
+        self.freeMemory += size
+
+    def largestFree(self) -> int:
+        return self.best[1]
+
+#наилучший подходящий: дерево отрезков по размерам хранит количество свободных участков каждого размера,
+#участки одного размера лежат в куче по адресу, соседние свободные участки сливаются
+class BestFitAllocator(Allocator):
+    #конструктор
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.starts: Dict[int, int] = {}  #начало свободного участка -> конец
+        self.ends: Dict[int, int] = {}  #конец свободного участка -> начало
+        self.leaves = 1  #количество листьев (степень двойки больше наибольшего размера)
+        while self.leaves <= capacity:
+            self.leaves *= 2
+        self.counts = [0] * (2 * self.leaves)  #количество свободных участков в отрезке размеров
+        self.bySize: Dict[int, List[int]] = {}  #размер -> куча начал свободных участков (ленивая)
+        if capacity > 0:
+            self.addExtent(0, capacity)
+
+    #изменение количества свободных участков размера size
+    def count(self, size: int, delta: int):
+        node = self.leaves + size
+        while node:
+            self.counts[node] += delta
+            node //= 2
+
+    #наименьший размер не меньше size, для которого есть свободный участок
+    def findSize(self, size: int) -> Optional[int]:
+        if size >= self.leaves:
+            return None
+        node = self.leaves + size
+        if not self.counts[node]:
+            while node > 1 and (node % 2 or not self.counts[node + 1]):
+                node //= 2
+            if node == 1:
+                return None
+            node += 1
+            while node < self.leaves:
+                node = 2 * node if self.counts[2 * node] else 2 * node + 1
+        return node - self.leaves
+
+    #добавление свободного участка [start, end)
+    def addExtent(self, start: int, end: int):
+        self.starts[start] = end
+        self.ends[end] = start
+        self.count(end - start, 1)
+        heapq.heappush(self.bySize.setdefault(end - start, []), start)
+
+    #удаление свободного участка [start, end); запись в куче размера остается до извлечения,
+    #куча перестраивается, если в ней накопились устаревшие записи
+    def removeExtent(self, start: int, end: int):
+        del self.starts[start]
+        del self.ends[end]
+        size = end - start
+        self.count(size, -1)
+        live = self.counts[self.leaves + size]
+        if not live:
+            del self.bySize[size]
+        elif len(self.bySize[size]) > 2 * live + 16:
+            heap = [item for item in self.bySize[size] if self.starts.get(item) == item + size]
+            heapq.heapify(heap)
+            self.bySize[size] = heap
+
+    #свободный участок заданного размера с наименьшим адресом; устаревшие записи кучи отбрасываются
+    def popExtent(self, size: int) -> int:
+        heap = self.bySize[size]
+        while True:
+            start = heapq.heappop(heap)
+            if self.starts.get(start) == start + size:
+                self.removeExtent(start, start + size)
+                return start
+
+    def allocate(self, size: int) -> Optional[int]:
+        size = max(1, size)
+        length = self.findSize(size)
+        if length is None:
+            return None
+        start = self.popExtent(length)
+        if length > size:
+            self.addExtent(start + size, start + length)
+        self.sizes[start] = size
+        self.freeMemory -= size
+        return start
+
+    def free(self, address: int):
+        size = self.sizes.pop(address)
+        start, end = address, address + size
+        if start in self.ends:
+            previous = self.ends[start]
+            self.removeExtent(previous, start)
+            start = previous
+        if end in self.starts:
+            following = self.starts[end]
+            self.removeExtent(end, following)
+            end = following
+        self.addExtent(start, end)
+        self.freeMemory += size
+
+    def largestFree(self) -> int:
+        if not self.counts[1]:
+            return 0
+        node = 1
+        while node < self.leaves:
+            node = 2 * node + 1 if self.counts[2 * node + 1] else 2 * node
+        return node - self.leaves
+
+#двойники: участки размером в степень двойки, списки свободных блоков по порядкам;
+#выделяется свободный блок с наименьшим адресом, поэтому размещение не зависит от порядка обхода множеств
+class BuddyAllocator(Allocator):
+    #конструктор: объем, не равный степени двойки, делится на корневые блоки
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.maxOrder = max(0, capacity.bit_length() - 1)  #порядок наибольшего блока
+        self.freeLists = [set() for _ in range(self.maxOrder + 1)]  #свободные блоки каждого порядка
+        self.freeHeaps = [[] for _ in range(self.maxOrder + 1)]  #кучи адресов свободных блоков по порядкам (ленивые)
+        self.rootStarts = []  #начала корневых блоков по возрастанию
+        self.rootOrders = []  #порядки корневых блоков
+        self.orders: Dict[int, int] = {}  #адрес выделенного блока -> порядок
+        self.waste = 0  #память, выделенная сверх запрошенной
+        address = 0
+        for order in range(self.maxOrder, -1, -1):
+            if capacity & (1 << order):
+                self.rootStarts.append(address)
+                self.rootOrders.append(order)
+                self.addFree(order, address)
+                address += 1 << order
+
+    #порядок блока, достаточного для участка заданного размера
+    @staticmethod
+    def orderFor(size: int) -> int:
+        return (max(1, size) - 1).bit_length()
+
+    #порядок корневого блока, содержащего адрес
+    def rootOrder(self, address: int) -> int:
+        return self.rootOrders[bisect_left(self.rootStarts, address + 1) - 1]
+
+    #добавление свободного блока порядка order
+    def addFree(self, order: int, address: int):
+        self.freeLists[order].add(address)
+        heapq.heappush(self.freeHeaps[order], address)
+
+    #удаление блока, слитого с двойником; куча перестраивается, если в ней накопились устаревшие записи
+    def removeFree(self, order: int, address: int):
+        blocks = self.freeLists[order]
+        blocks.remove(address)
+        if len(self.freeHeaps[order]) > 2 * len(blocks) + 16:
+            self.freeHeaps[order] = sorted(blocks)
+
+    #извлечение свободного блока порядка order с наименьшим адресом; записи кучи,
+    #блоки которых уже слиты с двойниками, отбрасываются
+    def popFree(self, order: int) -> int:
+        blocks, heap = self.freeLists[order], self.freeHeaps[order]
+        while True:
+            address = heapq.heappop(heap)
+            if address in blocks:
+                blocks.remove(address)
+                return address
+
+    #наименьший порядок не ниже order, в котором есть свободный блок
+    def findOrder(self, order: int) -> Optional[int]:
+        for current in range(order, self.maxOrder + 1):
+            if self.freeLists[current]:
+                return current
+        return None
+
+    def allocate(self, size: int) -> Optional[int]:
+        order = self.orderFor(size)
+        current = self.findOrder(order)
+        if current is None:
+            return None
+        address = self.popFree(current)
+        while current > order:
+            current -= 1
+            self.addFree(current, address + (1 << current))
+        self.orders[address] = order
+        self.sizes[address] = max(1, size)
+        self.waste += (1 << order) - max(1, size)
+        self.freeMemory -= 1 << order
+        return address
+
+    def free(self, address: int):
+        order = self.orders.pop(address)
+        size = self.sizes.pop(address)
+        self.waste -= (1 << order) - size
+        self.freeMemory += 1 << order
+        limit = self.rootOrder(address)
+        while order < limit:
+            buddy = address ^ (1 << order)
+            if buddy not in self.freeLists[order]:
+                break
+            self.removeFree(order, buddy)
+            address = min(address, buddy)
+            order += 1
+        self.addFree(order, address)
+
+    def largestFree(self) -> int:
+        for order in range(self.maxOrder, -1, -1):
+            if self.freeLists[order]:
+                return 1 << order
+        return 0
+
+    def maxRequest(self) -> int:
+        return 1 << self.rootOrders[0] if self.rootOrders else 0
+
+    def fits(self, size: int) -> bool:
+        return self.findOrder(self.orderFor(size)) is not None
+
+    def internalWaste(self) -> int:
+        return self.waste
+
+#стратегии размещения задач в оперативной памяти
+ALLOCATORS = {
+    'firstFit': FirstFitAllocator,
+    'bestFit': BestFitAllocator,
+    'buddy': BuddyAllocator
+}
+
+#создание распределителя по названию стратегии
+def createAllocator(strategy: str, capacity: int) -> Allocator:
+    if strategy not in ALLOCATORS:
+        raise ValueError(f"Неизвестная стратегия размещения: {strategy}")
+    return ALLOCATORS[strategy](capacity)
@@ -0,0 +1,315 @@
+#пакетная симуляция: много независимых пакетов выполняются одновременно на массивах NumPy
+import time
+import numpy as np
+
+from packet import Packet
+from task import TypeTask, REQUIRED_TIME
+from history import CPU_STATES
+
+#коды состояний задач в массивах
+WAIT, RUN, READY = 0, 1, 2
+#коды состояний процессора (совпадают с порядком CPU_STATES)
+IDLE, EXECUTING, IO_WAIT = 0, 1, 2
+
+class BatchSimulation:
+    #загрузка пакетов: задачи всех пакетов раскладываются в двумерные массивы (пакет x задача)
+    def __init__(self, jsonFiles: list, maxBlocksCount: int, ram: int, maxTacts: int, quantumSize: int = 1):
+        self.jsonFiles = list(jsonFiles)  #файлы пакетов
+        self.maxBlocksCount = maxBlocksCount  #количество разделов памяти
+        self.ram = ram  #объем оперативной памяти в ГБ
+        self.maxTacts = maxTacts  #максимальное количество тактов
+        self.quantumSize = quantumSize  #размер кванта времени
+        self.startTime = 0  #время начала симуляции
+        self.endTime = 0  #время окончания симуляции
+
+        packets = [list(Packet.iterTasks(jsonFile)) for jsonFile in self.jsonFiles]
+        count = len(packets)
+        width = max([1] + [len(tasks) for tasks in packets])  #хотя бы один столбец, чтобы индексация не выходила за массив
+
+        self.packetTypes = []  #типы пакетов
+        self.tasksCount = np.zeros(count, dtype=np.int64)  #количество задач в пакетах
+        self.isMath = np.zeros((count, width), dtype=bool)  #признак MATH задачи
+        self.requiredTime = np.zeros((count, width), dtype=np.int64)  #требуемое время задач
+        for i, tasks in enumerate(packets):
+            self.tasksCount[i] = len(tasks)
+            self.isMath[i, :len(tasks)] = [task.type == TypeTask.MATH for task in tasks]
+            self.requiredTime[i, :len(tasks)] = [task.requiredTime for task in tasks]
+            mathCount = int(self.isMath[i].sum())
+            inoutCount = len(tasks) - mathCount
+            packetType = Packet.typeByCounts(mathCount, inoutCount,
+                                             mathCount * REQUIRED_TIME[TypeTask.MATH],
+                                             inoutCount * REQUIRED_TIME[TypeTask.INOUT]) if tasks else None
+            self.packetTypes.append(packetType)
+
+        #результаты по пакетам
+        self.totalTacts = np.zeros(count, dtype=np.int64)
+        self.contextSwitches = np.zeros(count, dtype=np.int64)
+        self.quantumExhaustions = np.zeros(count, dtype=np.int64)
+        self.tasksCompletedInQuantum = np.zeros(count, dtype=np.int64)
+        self.cpuStateCounts = np.zeros((count, len(CPU_STATES)), dtype=np.int64)
+
+    #запуск симуляции всех пакетов в ногу, такт за тактом
+    def runSimulation(self):
+        self.startTime = time.time()
+        state = BatchState(self.isMath, self.requiredTime, self.tasksCount)
+
+        for tact in range(1, self.maxTacts + 1):
+            if not len(state.ids):
+                break
+            state.runTact(self.maxBlocksCount, self.quantumSize)
+
+            complete = state.isComplete()
+            stalled = state.isStalled()
+            ids = state.ids
+            self.totalTacts[ids[complete]] = tact
+            self.totalTacts[ids[stalled]] = self.maxTacts
+            #зависший процессор не меняет состояние до конца симуляции: оставшиеся такты учитываются сразу
+            rows = np.flatnonzero(stalled)
+            state.cpuStateCounts[rows, state.cpuState[rows]] += 2 * (self.maxTacts - tact)
+
+            finished = complete | stalled
+            if tact == self.maxTacts:
+                self.totalTacts[ids[~finished]] = tact
+                finished[:] = True
+            if finished.any():
+                self.storeResults(state, finished)
+                state.keep(~finished)
+
+        self.endTime = time.time()
+
+    #перенос результатов завершившихся пакетов
+    def storeResults(self, state: 'BatchState', rows: np.ndarray):
+        ids = state.ids[rows]
+        self.contextSwitches[ids] = state.contextSwitches[rows]
+        self.quantumExhaustions[ids] = state.quantumExhaustions[rows]
+        self.tasksCompletedInQuantum[ids] = state.tasksCompletedInQuantum[rows]
+        self.cpuStateCounts[ids] = state.cpuStateCounts[rows]
+
+    #получить время выполнения симуляции
+    def getRunTime(self) -> float:
+        return self.endTime - self.startTime
+
+    #результаты по пакетам в формате Simulation.getResults(includeHistory=False)
+    def getResults(self) -> list:
+        runTime = self.getRunTime() / max(1, len(self.jsonFiles))  #доля общего времени на один пакет
+        return [
+            {
+                'jsonFile': jsonFile,
+                'maxBlocksCount': self.maxBlocksCount,
+                'ram': self.ram,
+                'maxTacts': self.maxTacts,
+                'quantumSize': self.quantumSize,
+                'totalTacts': int(self.totalTacts[i]),
+                'runTime': runTime,
+                'packetType': self.packetTypes[i].value if self.packetTypes[i] else None,
+                'rrStatistics': {
+                    'contextSwitches': int(self.contextSwitches[i]),
+                    'quantumExhaustions': int(self.quantumExhaustions[i]),
+                    'tasksCompletedInQuantum': int(self.tasksCompletedInQuantum[i])
+                },
+                'cpuStateCounts': {state.value: int(self.cpuStateCounts[i, code])
+                                   for code, state in enumerate(CPU_STATES)}
+            }
+            for i, jsonFile in enumerate(self.jsonFiles)
+        ]
+
+#состояние всех незавершенных симуляций; строка массивов - одна симуляция
+class BatchState:
+    #начальное состояние: все задачи ожидают загрузки и стоят в очереди Round Robin
+    def __init__(self, isMath: np.ndarray, requiredTime: np.ndarray, tasksCount: np.ndarray):
+        count, width = isMath.shape
+        self.ids = np.arange(count)  #номера пакетов в BatchSimulation
+        self.isMath = isMath
+        self.requiredTime = requiredTime
+        self.tasksCount = tasksCount
+        self.state = np.zeros((count, width), dtype=np.int8)  #состояния задач
+        self.executionTime = np.zeros((count, width), dtype=np.int64)  #время выполнения задач
+        self.inMemory = np.zeros((count, width), dtype=bool)  #задача загружена в раздел памяти
+
+        #очередь Round Robin: кольцевой буфер номеров задач и счетчики записей (как в RoundRobinQueue)
+        self.capacity = 2 * width + 2  #на задачу приходится не более двух записей, плюс текущая
+        self.queue = np.zeros((count, self.capacity), dtype=np.int64)
+        self.queue[:, :width] = np.arange(width)
+        self.head = np.zeros(count, dtype=np.int64)
+        self.tail = tasksCount.copy()
+        self.live = (np.arange(width) < tasksCount[:, None]).astype(np.int64)  #действующие записи задачи
+        self.tombstones = np.zeros((count, width), dtype=np.int64)  #удаленные, но не извлеченные записи
+        self.size = tasksCount.copy()  #количество действующих записей
+
+        self.loaded = np.zeros(count, dtype=np.int64)  #позиция очереди ожидания (задачи грузятся по порядку)
+        self.usedBlocks = np.zeros(count, dtype=np.int64)  #занятые разделы
+        self.readyInMemory = np.zeros(count, dtype=np.int64)  #завершенные задачи в разделах
+        self.activeInMemory = np.zeros(count, dtype=np.int64)  #незавершенные задачи в разделах
+        self.runningMath = np.zeros(count, dtype=np.int64)  #выполняющиеся MATH задачи
+        self.runningInOut = np.zeros(count, dtype=np.int64)  #выполняющиеся INOUT задачи
+
+        self.currentTask = np.full(count, -1, dtype=np.int64)  #задача на процессоре (-1 - нет)
+        self.cpuState = np.zeros(count, dtype=np.int64)  #состояние процессора
+        self.remainingQuantum = np.zeros(count, dtype=np.int64)  #остаток кванта процессора
+
+        self.contextSwitches = np.zeros(count, dtype=np.int64)
+        self.quantumExhaustions = np.zeros(count, dtype=np.int64)
+        self.tasksCompletedInQuantum = np.zeros(count, dtype=np.int64)
+        self.cpuStateCounts = np.zeros((count, len(CPU_STATES)), dtype=np.int64)
+
+    #оставить только выбранные симуляции
+    def keep(self, mask: np.ndarray):
+        for name, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                setattr(self, name, value[mask])
+
+    #один такт всех симуляций, порядок шагов как в OS.runTact
+    def runTact(self, blocksCount: int, quantumSize: int):
+        self.freeCompletedTasks()
+        self.loadTasksToMemory(blocksCount)
+        self.roundRobinSchedule(quantumSize)
+        self.executeCurrentTasks()
+        self.manageCpuStates()
+
+    #освобождение разделов с завершенными задачами
+    def freeCompletedTasks(self):
+        rows = np.flatnonzero(self.readyInMemory)
+        if not len(rows):
+            return
+        freed = self.inMemory[rows] & (self.state[rows] == READY)
+        self.inMemory[rows] &= ~freed
+        self.usedBlocks[rows] -= freed.sum(axis=1)
+        self.readyInMemory[rows] = 0
+
+    #загрузка задач в свободные разделы; задачи, которых нет в очереди, добавляются в ее конец
+    def loadTasksToMemory(self, blocksCount: int):
+        loads = np.minimum(blocksCount - self.usedBlocks, self.tasksCount - self.loaded)
+        for step in range(int(loads.max(initial=0))):
+            rows = np.flatnonzero(loads > step)
+            tasks = self.loaded[rows]
+            self.loaded[rows] += 1
+            self.inMemory[rows, tasks] = True
+            self.usedBlocks[rows] += 1
+            ready = self.state[rows, tasks] == READY
+            self.readyInMemory[rows] += ready
+            self.activeInMemory[rows] += ~ready
+
+            missing = self.live[rows, tasks] == 0
+            self.append(rows[missing], tasks[missing])
+
+    #добавление задач в конец очереди Round Robin
+    def append(self, rows: np.ndarray, tasks: np.ndarray):
+        self.queue[rows, self.tail[rows] % self.capacity] = tasks
+        self.tail[rows] += 1
+        self.live[rows, tasks] += 1
+        self.size[rows] += 1
+
+    #ленивое удаление записи задачи из очереди (RoundRobinQueue.remove)
+    def remove(self, rows: np.ndarray, tasks: np.ndarray):
+        present = self.live[rows, tasks] > 0
+        rows, tasks = rows[present], tasks[present]
+        self.live[rows, tasks] -= 1
+        self.tombstones[rows, tasks] += 1
+        self.size[rows] -= 1
+        emptied = rows[self.size[rows] == 0]
+        self.head[emptied] = self.tail[emptied]
+        self.tombstones[emptied] = 0
+
+    #извлечение следующей незавершенной задачи (Packet.getNextTaskRr), -1 - задач нет
+    def nextTasks(self, rows: np.ndarray, current: np.ndarray) -> np.ndarray:
+        found = np.full(len(rows), -1, dtype=np.int64)
+        returning = (current >= 0) & (self.state[rows, np.maximum(current, 0)] != READY)
+        self.append(rows[returning], current[returning])
+
+        searching = np.arange(len(rows))
+        while len(searching):
+            sims = rows[searching]
+            tasks = self.queue[sims, self.head[sims] % self.capacity]
+            self.head[sims] += 1
+
+            dead = self.tombstones[sims, tasks] > 0
+            self.tombstones[sims[dead], tasks[dead]] -= 1
+            alive = ~dead
+            self.live[sims[alive], tasks[alive]] -= 1
+            self.size[sims[alive]] -= 1
+
+            hit = alive & (self.state[sims, tasks] != READY)
+            found[searching[hit]] = tasks[hit]
+            searching = searching[~hit & (self.size[sims] > 0)]
+        return found
+
+    #планирование Round Robin (OS.roundRobinSchedule)
+    def roundRobinSchedule(self, quantumSize: int):
+        hasTask = self.currentTask >= 0
+        currentState = self.state[np.arange(len(self.ids)), np.maximum(self.currentTask, 0)]
+        completed = hasTask & (currentState == READY)
+        exhausted = hasTask & ~completed & (self.remainingQuantum <= 0)
+        self.tasksCompletedInQuantum += completed
+        self.quantumExhaustions += exhausted
+        needSwitch = completed | exhausted | (~hasTask & (self.cpuState == IDLE))
+
+        nextTask = np.full(len(self.ids), -1, dtype=np.int64)
+        rows = np.flatnonzero(needSwitch & (self.size > 0))
+        if len(rows):
+            nextTask[rows] = self.nextTasks(rows, self.currentTask[rows])
+
+        rows = np.flatnonzero(nextTask >= 0)
+        tasks = nextTask[rows]
+        math = self.isMath[rows, tasks]
+        started = self.state[rows, tasks] == WAIT
+        self.state[rows[started], tasks[started]] = RUN
+        self.runningMath[rows] += started & math
+        self.runningInOut[rows] += started & ~math
+        self.currentTask[rows] = tasks
+        self.remainingQuantum[rows] = quantumSize
+        self.cpuState[rows] = np.where(math, EXECUTING, IO_WAIT)
+        self.contextSwitches[rows] += 1
+
+        #нет новых задач: незавершенная текущая задача продолжает выполняться, иначе процессор простаивает
+        dropped = needSwitch & (nextTask < 0) & ~(hasTask & (currentState != READY))
+        self.currentTask[dropped] = -1
+        self.cpuState[dropped] = IDLE
+
+    #выполнение одного такта текущих задач (CPU.executeTick)
+    def executeCurrentTasks(self):
+        rows = np.flatnonzero(self.currentTask >= 0)
+        tasks = self.currentTask[rows]
+        running = self.state[rows, tasks] == RUN
+        rows, tasks = rows[running], tasks[running]
+
+        self.executionTime[rows, tasks] += 1
+        self.remainingQuantum[rows] -= self.remainingQuantum[rows] > 0
+
+        done = self.executionTime[rows, tasks] >= self.requiredTime[rows, tasks]
+        rows, tasks = rows[done], tasks[done]
+        self.state[rows, tasks] = READY
+        self.currentTask[rows] = -1
+        self.cpuState[rows] = IDLE
+        self.remainingQuantum[rows] = 0
+        math = self.isMath[rows, tasks]
+        self.runningMath[rows] -= math
+        self.runningInOut[rows] -= ~math
+        self.remove(rows, tasks)
+
+        released = self.inMemory[rows, tasks]
+        rows, tasks = rows[released], tasks[released]
+        self.inMemory[rows, tasks] = False
+        self.usedBlocks[rows] -= 1
+        self.activeInMemory[rows] -= 1
+
+    #переключение состояний процессора по выполняющимся задачам (OS.manageCpuStates)
+    def manageCpuStates(self):
+        hasMath = self.runningMath > 0
+        hasInOut = self.runningInOut > 0
+        self.cpuState = np.where(
+            self.cpuState == IO_WAIT,
+            np.where(hasInOut, IO_WAIT, np.where(hasMath, EXECUTING, IDLE)),
+            np.where(hasMath, EXECUTING, np.where(hasInOut, IO_WAIT, IDLE))
+        )
+        #состояние учитывается дважды за такт: в manageCpuStates и в collectStatistics
+        self.cpuStateCounts[np.arange(len(self.ids)), self.cpuState] += 2
+
+    #симуляции, в которых все задачи выполнены (OS.isSimulationComplete)
+    def isComplete(self) -> np.ndarray:
+        return ((self.loaded == self.tasksCount) &
+                (self.runningMath + self.runningInOut == 0) &
+                (self.activeInMemory == 0))
+
+    #симуляции, в которых процессор занят без текущей задачи: планировщик больше не выберет задачу
+    def isStalled(self) -> np.ndarray:
+        return (self.currentTask < 0) & (self.cpuState != IDLE)
@@ -0,0 +1,231 @@
+#тесты производительности: такты ОС, загрузка пакета, сбор статистики и отрисовка графиков
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from osys import OS
+from packet import Packet
+from simulation import Simulation
+from task import TypeTask
+
+BENCH_VERSION = 1  #версия формата результатов
+DEFAULT_SIZES = [100, 1000, 10000, 100000]  #размеры синтетических пакетов по умолчанию
+MIN_MEMORY, MAX_MEMORY = 50, 1000  #диапазон памяти синтетических задач в МБ
+CHUNK_SIZE = 1 << 14  #задач в одной записи при генерации пакета
+
+#синтетический пакет в формате ready_packets; пакет с тем же размером и зерном генерируется один раз
+def generatePacket(count: int, directory: str, seed: int = 0) -> str:
+    filename = os.path.join(directory, f"bench_{count}_{seed}.json")
+    if os.path.exists(filename):
+        return filename
+    rng = random.Random(seed)
+    types = [taskType.name for taskType in TypeTask]
+    partial = filename + ".part"
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write('{"tasks": [')
+        for start in range(0, count, CHUNK_SIZE):
+            records = (json.dumps({'num': num, 'type': rng.choice(types),
+                                   'memory': rng.randint(MIN_MEMORY, MAX_MEMORY)})
+                       for num in range(start + 1, min(start + CHUNK_SIZE, count) + 1))
+            if start:
+                f.write(',')
+            f.write(','.join(records))
+        f.write(']}')
+    os.replace(partial, filename)
+    return filename
+
+#операционная система на пакете, готовая к выполнению тактов
+def createOs(filename: str, args) -> OS:
+    system = OS(ram=args.ram, maxBlocksCount=args.blocks, quantumSize=args.quantum)
+    system.initialize(filename, streaming=args.stream, compact=args.compact)
+    return system
+
+#пропускная способность OS.runTact: такты в секунду
+def benchRunTact(filename: str, args):
+    system = createOs(filename, args)
+    start = time.perf_counter()
+    for _ in range(args.tacts):
+        system.runTact()
+    return time.perf_counter() - start, args.tacts
+
+#загрузка пакета Packet.createByJson: задачи в секунду
+def benchLoad(filename: str, args):
+    start = time.perf_counter()
+    tasks = Packet.createByJson(filename)
+    return time.perf_counter() - start, len(tasks)
+
+#накладные расходы OS.collectStatistics: вызовы в секунду
+def benchCollectStatistics(filename: str, args):
+    system = createOs(filename, args)
+    for _ in range(min(args.tacts, 10)):
+        system.runTact()
+    start = time.perf_counter()
+    for _ in range(args.tacts):
+        system.collectStatistics()
+    return time.perf_counter() - start, args.tacts
+
+#отрисовка Statistics.updateCharts по истории args.tacts тактов: отрисовки в секунду
+def benchUpdateCharts(filename: str, args):
+    from statisticsInfo import Statistics
+    simulation = Simulation(maxBlocksCount=args.blocks, ram=args.ram, jsonFile=filename, maxTacts=args.tacts,
+                            quantumSize=args.quantum, streaming=args.stream, compact=args.compact)
+    simulation.runSimulation()
+    widget = Statistics(simulation)
+    start = time.perf_counter()
+    widget.updateCharts()
+    elapsed = time.perf_counter() - start
+    widget.deleteLater()
+    return elapsed, 1
+
+#приложение Qt без окна для отрисовки графиков; None, если PyQt6 или pyqtgraph не установлены
+def createQtApplication():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtWidgets import QApplication
+        import pyqtgraph  # noqa: F401
+    except ImportError:
+        return None
+    return QApplication.instance() or QApplication([])
+
+#тесты: название -> (функция, единица измерения скорости)
+CASES = {
+    'runTact': (benchRunTact, "тактов/с"),
+    'createByJson': (benchLoad, "задач/с"),
+    'collectStatistics': (benchCollectStatistics, "вызовов/с"),
+    'updateCharts': (benchUpdateCharts, "отрисовок/с")
+}
+
+#запуск теста на пакете: лучшее время из args.repeat повторов
+def runCase(name: str, filename: str, count: int, args) -> dict:
+    function, unit = CASES[name]
+    best = None
+    for _ in range(args.repeat):
+        elapsed, operations = function(filename, args)
+        if best is None or elapsed < best[0]:
+            best = (elapsed, operations)
+    elapsed, operations = best
+    return {
+        'case': name,
+        'tasks': count,
+        'seconds': elapsed,
+        'operations': operations,
+        'rate': operations / elapsed if elapsed > 0 else float('inf'),
+        'unit': unit
+    }
+
+#запуск всех тестов на пакетах всех размеров
+def runBenchmarks(args) -> dict:
+    directory = args.packets_dir or os.path.join(tempfile.gettempdir(), "os_bench_packets")
+    os.makedirs(directory, exist_ok=True)
+    application = createQtApplication() if 'updateCharts' in args.cases else None
+
+    results = []
+    for count in args.sizes:
+        filename = generatePacket(count, directory, args.seed)
+        for name in args.cases:
+            if name == 'updateCharts' and application is None:
+                print("updateCharts пропущен: PyQt6 или pyqtgraph не установлены", file=sys.stderr)
+                continue
+            result = runCase(name, filename, count, args)
+            print(f"{name:>18} {count:>9} задач: {result['seconds']:.4f} с, {result['rate']:.1f} {result['unit']}",
+                  file=sys.stderr)
+            results.append(result)
+    return {
+        'version': BENCH_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'tacts': args.tacts,
+        'blocks': args.blocks,
+        'quantum': args.quantum,
+        'results': results
+    }
+
+#сравнение с базовыми результатами: время на операцию выросло больше допуска
+def compareResults(current: dict, baseline: dict, tolerance: float) -> list:
+    previous = {(result['case'], result['tasks']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base = previous.get((result['case'], result['tasks']))
+        if base is None:
+            continue
+        change = base['rate'] / result['rate'] - 1 if result['rate'] else float('inf')
+        status = "РЕГРЕССИЯ" if change > tolerance else "ok"
+        print(f"{result['case']:>18} {result['tasks']:>9} задач: {result['rate']:.1f} против {base['rate']:.1f} "
+              f"{result['unit']} ({(result['rate'] / base['rate'] - 1) * 100:+.1f}%) {status}", file=sys.stderr)
+        if change > tolerance:
+            regressions.append({'case': result['case'], 'tasks': result['tasks'],
+                                'rate': result['rate'], 'baselineRate': base['rate']})
+    return regressions
+
+#разбор списка размеров пакетов вида 100,1e4,1e7
+def parseSizes(text: str) -> list:
+    try:
+        return [int(float(part)) for part in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"неверный список размеров: {text}") from None
+
+#разбор списка тестов вида runTact,createByJson
+def parseCases(text: str) -> list:
+    names = text.split(',')
+    for name in names:
+        if name not in CASES:
+            raise argparse.ArgumentTypeError(f"неизвестный тест: {name}")
+    return names
+
+#разбор аргументов командной строки
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench",
+        description="Тесты производительности моделирования ОС на синтетических пакетах"
+    )
+    parser.add_argument("--sizes", type=parseSizes, default=DEFAULT_SIZES,
+                        help="размеры пакетов через запятую, от 1e2 до 1e7 (по умолчанию 100,1000,10000,100000)")
+    parser.add_argument("--cases", type=parseCases, default=list(CASES),
+                        help="тесты через запятую: " + ", ".join(CASES))
+    parser.add_argument("-t", "--tacts", type=int, default=1000, help="тактов и вызовов статистики в одном повторе")
+    parser.add_argument("--repeat", type=int, default=3, help="количество повторов, берется лучшее время")
+    parser.add_argument("-b", "--blocks", type=int, default=4, help="количество разделов памяти")
+    parser.add_argument("-r", "--ram", type=int, default=4, help="объем оперативной памяти в ГБ")
+    parser.add_argument("-q", "--quantum", type=int, default=1, help="размер кванта времени")
+    parser.add_argument("-s", "--stream", action="store_true", help="потоковое чтение пакета (для пакетов от 1e6 задач)")
+    parser.add_argument("-c", "--compact", action="store_true", help="хранить задачи в компактной таблице")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора синтетических пакетов")
+    parser.add_argument("--packets-dir", default=None,
+                        help="каталог синтетических пакетов (по умолчанию во временном каталоге)")
+    parser.add_argument("--baseline", default=None, help="файл базовых результатов для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="допустимое замедление относительно базовых результатов (0.2 - 20%%)")
+    parser.add_argument("-o", "--output", default="-", help="файл для результатов в JSON (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+#точка входа: код 1 при регрессии относительно базовых результатов
+def main(argv=None) -> int:
+    args = parseArgs(argv)
+    try:
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        report = runBenchmarks(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ошибка тестов производительности: {e}", file=sys.stderr)
+        return 1
+
+    if baseline is not None:
+        report['regressions'] = compareResults(report, baseline, args.tolerance)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report.get('regressions') else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#двоичный формат пакета задач с отображением файла в память
+import argparse
+import json
+import mmap
+import struct
+import sys
+
+from task import Task, TypeTask
+
+BINARY_MAGIC = b'OSPK'  #сигнатура файла
+BINARY_VERSION = 1  #версия формата
+BINARY_EXTENSIONS = ('.ospk',)  #расширения двоичных пакетов
+
+#заголовок: сигнатура, версия, размер записи, количество задач, MATH, INOUT, суммарная память
+HEADER = struct.Struct('<4sHHQQQQ')
+HEADER_SIZE = 64  #заголовок дополняется нулями до 64 байт
+#запись задачи: номер, память в МБ, код типа, выравнивание
+RECORD = struct.Struct('<IIB3x')
+
+#коды типов задач в записях
+TYPE_CODES = {TypeTask.MATH: 0, TypeTask.INOUT: 1}
+TYPES_BY_CODE = {code: taskType for taskType, code in TYPE_CODES.items()}
+
+#проверка, является ли файл двоичным пакетом
+def isBinaryPacket(filename: str) -> bool:
+    return filename.endswith(BINARY_EXTENSIONS)
+
+class BinaryPacketFile:
+    #открытие файла пакета: данные не разбираются, файл отображается в память
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, recordSize, count, mathCount, inoutCount, totalMemory = HEADER.unpack_from(self.map, 0)
+        if magic != BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"Файл {filename} не является двоичным пакетом")
+        if version != BINARY_VERSION or recordSize != RECORD.size:
+            self.close()
+            raise ValueError(f"Неподдерживаемая версия двоичного пакета: {version}")
+        if len(self.map) < HEADER_SIZE + count * RECORD.size:
+            self.close()
+            raise ValueError(f"Файл {filename} поврежден: не хватает записей")
+
+        self.count = count  #количество задач
+        self.mathCount = mathCount  #количество математических задач
+        self.inoutCount = inoutCount  #количество задач ввода-вывода
+        self.totalMemory = totalMemory  #суммарная память задач
+
+    #задача по порядковому номеру записи
+    def getTask(self, index: int) -> Task:
+        if not 0 <= index < self.count:
+            raise IndexError("индекс задачи вне пакета")
+        num, memory, typeCode = RECORD.unpack_from(self.map, HEADER_SIZE + index * RECORD.size)
+        return Task(num=num, type=TYPES_BY_CODE[typeCode], memory=memory)
+
+    #последовательное чтение задач
+    def iterTasks(self):
+        records = memoryview(self.map)[HEADER_SIZE:HEADER_SIZE + self.count * RECORD.size]
+        try:
+            for num, memory, typeCode in RECORD.iter_unpack(records):
+                yield Task(num=num, type=TYPES_BY_CODE[typeCode], memory=memory)
+        finally:
+            records.release()
+
+    #закрытие отображения и файла
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Task:
+        return self.getTask(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+#ленивое чтение задач двоичного пакета
+def iterBinaryTasks(filename: str):
+    with BinaryPacketFile(filename) as packetFile:
+        yield from packetFile.iterTasks()
+
+#запись задач в двоичный пакет; записи из JSON ({"num", "type", "memory"}) тоже допускаются
+def writeBinaryPacket(tasks, filename: str):
+    count = mathCount = inoutCount = totalMemory = 0
+    with open(filename, 'wb') as f:
+        f.write(bytes(HEADER_SIZE))
+        for task in tasks:
+            if isinstance(task, dict):
+                num, taskType, memory = task['num'], TypeTask[task['type']], task['memory']
+            else:
+                num, taskType, memory = task.num, task.type, task.memory
+            f.write(RECORD.pack(num, memory, TYPE_CODES[taskType]))
+            count += 1
+            totalMemory += memory
+            if taskType == TypeTask.MATH:
+                mathCount += 1
+            else:
+                inoutCount += 1
+        f.seek(0)
+        f.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, RECORD.size, count, mathCount, inoutCount, totalMemory))
+    return count
+
+#преобразование пакета JSON/JSON Lines в двоичный
+def jsonToBinary(source: str, target: str) -> int:
+    from packet import Packet
+    return writeBinaryPacket(Packet.iterTasks(source), target)
+
+#преобразование двоичного пакета в JSON формата ready_packets
+def binaryToJson(source: str, target: str) -> int:
+    with BinaryPacketFile(source) as packetFile:
+        tasksList = [{"num": task.num, "type": task.type.name, "memory": task.memory}
+                     for task in packetFile.iterTasks()]
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump({"tasks": tasksList}, f, ensure_ascii=False, indent=2)
+    return len(tasksList)
+
+#точка входа: python -m binpacket to-bin|to-json источник результат
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m binpacket",
+                                     description="Преобразование пакетов задач между JSON и двоичным форматом")
+    parser.add_argument("direction", choices=["to-bin", "to-json"], help="направление преобразования")
+    parser.add_argument("source", help="исходный файл пакета")
+    parser.add_argument("target", help="файл результата")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.direction == "to-bin":
+            count = jsonToBinary(args.source, args.target)
+        else:
+            count = binaryToJson(args.source, args.target)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ошибка преобразования: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Преобразовано задач: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+#контрольные точки: полное состояние симуляции в сжатом двоичном файле;
+#состояние хранится через pickle, а загрузка pickle может выполнить произвольный код,
+#поэтому загружать можно только контрольные точки из доверенного источника (сохраненные самим пользователем)
+import pickle
+import struct
+import time
+import zlib
+
+CHECKPOINT_MAGIC = b'OSCP'  #сигнатура файла
+CHECKPOINT_VERSION = 2  #версия формата
+
+#заголовок: сигнатура, версия, размер несжатых данных
+HEADER = struct.Struct('<4sHQ')
+
+#сохранение симуляции: разделы, очереди, процессоры, задачи, история и счетчики
+def saveCheckpoint(simulation, filename: str):
+    data = pickle.dumps(simulation, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(data)))
+        f.write(zlib.compress(data))
+
+#загрузка симуляции из контрольной точки; время выполнения отсчитывается заново.
+#заголовок и размер данных проверяются до распаковки pickle, но это защищает только от случайно
+#указанного или поврежденного файла: файл контрольной точки должен быть доверенным
+def loadCheckpoint(filename: str):
+    with open(filename, 'rb') as f:
+        header = f.read(HEADER.size)
+        payload = f.read()
+    if len(header) < HEADER.size:
+        raise ValueError(f"Файл {filename} не является контрольной точкой")
+    magic, version, size = HEADER.unpack(header)
+    if magic != CHECKPOINT_MAGIC:
+        raise ValueError(f"Файл {filename} не является контрольной точкой")
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия контрольной точки: {version}")
+    try:
+        data = zlib.decompress(payload)
+    except zlib.error as e:
+        raise ValueError(f"Файл {filename} поврежден: {e}") from None
+    if len(data) != size:
+        raise ValueError(f"Файл {filename} поврежден: неверный размер данных")
+    simulation = pickle.loads(data)
+    simulation.startTime = time.time()
+    simulation.endTime = 0
+    return simulation
@@ -0,0 +1,134 @@
+#проверка контрольных точек: симуляция, продолженная из контрольной точки или из копии (fork),
+#должна давать те же результаты, что и симуляция без остановки
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+
+from allocator import ALLOCATORS
+from checkpoint import loadCheckpoint
+from scheduler import SCHEDULERS
+from simulation import Simulation
+
+PLACEMENTS = (None,) + tuple(ALLOCATORS)  #фиксированные разделы и все стратегии размещения
+MODES = {  #режимы ОС: название -> параметры симуляции
+    'single': {},
+    'cores': {'cores': 3, 'dispatch': 'stealing'},
+    'io': {'ioDevices': 2, 'ioServiceTime': 2},
+    'coresIo': {'cores': 2, 'ioDevices': 1},
+    'stream': {'streaming': True},
+    'compact': {'compact': True}
+}
+VOLATILE_RESULTS = ('runTime', 'loadTime', 'profile')  #результаты, зависящие от времени выполнения
+DEFAULT_CUTS = [1, 7, 57]  #такты сохранения контрольных точек по умолчанию
+
+#результаты симуляции без замеров времени, пригодные для сравнения
+def comparableResults(simulation: Simulation) -> str:
+    results = simulation.getResults()
+    for key in VOLATILE_RESULTS:
+        results.pop(key, None)
+    return json.dumps(results, sort_keys=True, ensure_ascii=False, default=str)
+
+#все сочетания стратегии размещения, политики планирования и режима ОС
+def configurations(modes: list, eventDriven: bool):
+    for placement in PLACEMENTS:
+        for scheduler in SCHEDULERS:
+            for mode in modes:
+                parameters = dict(MODES[mode], placement=placement, scheduler=scheduler)
+                yield f"{placement or 'fixed'}/{scheduler}/{mode}", parameters
+                if eventDriven:
+                    yield f"{placement or 'fixed'}/{scheduler}/{mode}/event", dict(parameters, eventDriven=True)
+
+#сравнение прогона без остановки с прогонами, продолженными после такта cut:
+#исходной симуляцией, ее копией и симуляцией, загруженной из контрольной точки; возвращает расхождения
+def checkConfiguration(jsonFile: str, parameters: dict, cuts: list, filename: str) -> list:
+    straight = Simulation(jsonFile=jsonFile, **parameters)
+    straight.runSimulation()
+    expected = comparableResults(straight)
+
+    mismatches = []
+    for cut in cuts:
+        simulation = Simulation(jsonFile=jsonFile, **parameters)
+        simulation.runUntil(cut)
+        simulation.saveCheckpoint(filename)
+        forked = simulation.fork()
+        restored = loadCheckpoint(filename)
+        for kind, resumed in (('direct', simulation), ('fork', forked), ('checkpoint', restored)):
+            resumed.resumeSimulation()
+            if comparableResults(resumed) != expected:
+                mismatches.append(f"{kind}@{cut}")
+    return mismatches
+
+#запуск проверки на всех пакетах, возвращает количество расхождений
+def runChecks(args) -> int:
+    packets = []
+    for pattern in args.packets:
+        matched = sorted(glob.glob(pattern))
+        packets.extend(matched if matched else [pattern])
+
+    failures = 0
+    checked = 0
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "check.oscp")
+        for jsonFile in packets:
+            for name, parameters in configurations(args.modes, args.event_driven):
+                parameters.update(maxBlocksCount=args.blocks, ram=args.ram, maxTacts=args.tacts,
+                                  quantumSize=args.quantum)
+                mismatches = checkConfiguration(jsonFile, parameters, args.cuts, filename)
+                checked += 1
+                if mismatches:
+                    failures += len(mismatches)
+                    print(f"РАСХОЖДЕНИЕ {jsonFile} {name}: {', '.join(mismatches)}", file=sys.stderr)
+    print(f"Проверено конфигураций: {checked}, расхождений: {failures}", file=sys.stderr)
+    return failures
+
+#разбор списка тактов вида 1,7,57
+def parseCuts(text: str) -> list:
+    try:
+        return [int(part) for part in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"неверный список тактов: {text}") from None
+
+#разбор списка режимов вида single,io
+def parseModes(text: str) -> list:
+    names = text.split(',')
+    for name in names:
+        if name not in MODES:
+            raise argparse.ArgumentTypeError(f"неизвестный режим: {name}")
+    return names
+
+#разбор аргументов командной строки
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m checkpointcheck",
+        description="Сравнение симуляций, продолженных из контрольной точки и из копии, с симуляцией без остановки "
+                    "для всех стратегий размещения, политик планирования и режимов ОС"
+    )
+    parser.add_argument("packets", nargs="*", default=["ready_packets/*.json"],
+                        help="файлы пакетов задач (по умолчанию ready_packets/*.json)")
+    parser.add_argument("--cuts", type=parseCuts, default=DEFAULT_CUTS,
+                        help="такты сохранения контрольной точки через запятую (по умолчанию 1,7,57)")
+    parser.add_argument("--modes", type=parseModes, default=list(MODES),
+                        help="режимы ОС через запятую: " + ", ".join(MODES))
+    parser.add_argument("-e", "--event-driven", action="store_true",
+                        help="дополнительно проверить каждую конфигурацию в событийном режиме")
+    parser.add_argument("-b", "--blocks", type=int, default=3, help="максимальное количество разделов памяти")
+    parser.add_argument("-r", "--ram", type=int, default=2, help="объем оперативной памяти в ГБ")
+    parser.add_argument("-t", "--tacts", type=int, default=400, help="максимальное количество тактов")
+    parser.add_argument("-q", "--quantum", type=int, default=1, help="размер кванта времени")
+    return parser.parse_args(argv)
+
+#точка входа: код 1 при расхождении результатов
+def main(argv=None) -> int:
+    args = parseArgs(argv)
+    try:
+        failures = runChecks(args)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка проверки контрольных точек: {e}", file=sys.stderr)
+        return 1
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#консольный запуск симуляции без графического интерфейса
+import argparse
+import glob
+import json
+import pickle
+import sys
+
+from allocator import ALLOCATORS
+from checkpoint import loadCheckpoint
+from resultcache import ResultCache, cacheKey, cachedResults, DEFAULT_CACHE_DIRECTORY, DEFAULT_MAX_BYTES
+from scheduler import SCHEDULERS, DISPATCH_MODES
+from simulation import Simulation
+from tracing import TraceLevel
+
+#разбор аргументов командной строки
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="Моделирование ОС с Round Robin без графического интерфейса"
+    )
+    parser.add_argument("packets", nargs="*",
+                        help="файлы пакетов задач (JSON), допускаются шаблоны вида ready_packets/*.json")
+    parser.add_argument("-b", "--blocks", type=int, default=1, help="максимальное количество разделов памяти")
+    parser.add_argument("-r", "--ram", type=int, default=1, help="объем оперативной памяти в ГБ")
+    parser.add_argument("-t", "--tacts", type=int, default=1000, help="максимальное количество тактов")
+    parser.add_argument("-q", "--quantum", type=int, default=1, help="размер кванта времени")
+    parser.add_argument("-e", "--event-driven", action="store_true",
+                        help="событийный режим: такты без событий пропускаются")
+    parser.add_argument("-s", "--stream", action="store_true",
+                        help="читать пакет потоково (для очень больших пакетов, в том числе .jsonl)")
+    parser.add_argument("-c", "--compact", action="store_true",
+                        help="хранить задачи пакета в компактной таблице (меньше памяти на задачу)")
+    parser.add_argument("-p", "--placement", choices=list(ALLOCATORS), default=None,
+                        help="размещение задач в оперативной памяти по объему (по умолчанию фиксированные разделы)")
+    parser.add_argument("-S", "--scheduler", choices=list(SCHEDULERS), default='rr',
+                        help="политика планирования (по умолчанию Round Robin)")
+    parser.add_argument("-n", "--cores", type=int, default=1, help="количество ядер процессора")
+    parser.add_argument("-d", "--dispatch", choices=DISPATCH_MODES, default='global',
+                        help="распределение задач по ядрам: общая очередь или очереди ядер с перехватом")
+    parser.add_argument("-i", "--io-devices", type=int, default=0,
+                        help="количество устройств ввода-вывода (по умолчанию INOUT задачи выполняются на процессоре)")
+    parser.add_argument("--io-service-time", type=int, default=1,
+                        help="тактов устройства ввода-вывода на один такт задачи")
+    parser.add_argument("--checkpoint", metavar="FILE", default=None,
+                        help="сохранить контрольную точку симуляции в FILE на такте --checkpoint-tact")
+    parser.add_argument("--checkpoint-tact", type=int, default=0, help="такт сохранения контрольной точки")
+    parser.add_argument("--resume", metavar="FILE", default=None,
+                        help="продолжить симуляцию из контрольной точки вместо запуска пакетов "
+                             "(только доверенные файлы: контрольная точка загружается через pickle)")
+    parser.add_argument("--profile", action="store_true",
+                        help="замерять время фаз такта и выводить профиль в сводке и результатах")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="замерять пиковую память симулятора (tracemalloc, замедляет симуляцию)")
+    parser.add_argument("--profile-output", metavar="FILE", default=None,
+                        help="сохранить профили тактов в отдельный файл JSON")
+    parser.add_argument("--cache", action="store_true",
+                        help="брать результаты повторных прогонов из кэша на диске и сохранять новые")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIRECTORY, help="каталог кэша результатов")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // 2**20,
+                        help="наибольший размер кэша в МБ (давно не использованные записи вытесняются)")
+    parser.add_argument("-o", "--output", default="-", help="файл для результатов в JSON (по умолчанию stdout)")
+    parser.add_argument("--no-history", action="store_true", help="не сохранять потактовую историю")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="выводить журнал симуляции в stderr (-v сводка, -vv события, -vvv отладка)")
+    args = parser.parse_args(argv)
+    if not args.packets and not args.resume:
+        parser.error("укажите файлы пакетов или --resume")
+    if args.packets and args.resume:
+        parser.error("--resume не сочетается с файлами пакетов")
+    if args.checkpoint and len(expandPackets(args.packets)) > 1:
+        parser.error("--checkpoint допускается только для одного пакета")
+    return args
+
+#раскрытие шаблонов в списке файлов пакетов
+def expandPackets(patterns: list) -> list:
+    files = []
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern))
+        files.extend(matched if matched else [pattern])
+    return files
+
+#параметры симуляции, влияющие на результаты (без файла пакета)
+def simulationParameters(args) -> dict:
+    return {
+        'maxBlocksCount': args.blocks,
+        'ram': args.ram,
+        'maxTacts': args.tacts,
+        'quantumSize': args.quantum,
+        'eventDriven': args.event_driven,
+        'streaming': args.stream,
+        'compact': args.compact,
+        'placement': args.placement,
+        'scheduler': args.scheduler,
+        'cores': args.cores,
+        'dispatch': args.dispatch,
+        'ioDevices': args.io_devices,
+        'ioServiceTime': args.io_service_time
+    }
+
+#запуск одной симуляции и получение ее результатов; при наличии кэша повторный прогон берется из него
+def runOne(jsonFile: str, args, cache: ResultCache = None) -> dict:
+    parameters = simulationParameters(args)
+    profile = args.profile or args.profile_memory or bool(args.profile_output)
+    if profile or args.checkpoint:
+        cache = None
+    if cache is not None:
+        key = cacheKey(jsonFile, parameters, history=not args.no_history)
+        results = cache.get(key)
+        if results is not None:
+            if args.verbose:
+                print(f"Результаты для {jsonFile} взяты из кэша", file=sys.stderr)
+            return cachedResults(results, jsonFile)
+
+    simulation = Simulation(jsonFile=jsonFile, profile=profile, profileMemory=args.profile_memory, **parameters)
+    setupOutput(simulation, args)
+    if args.checkpoint:
+        simulation.runUntil(args.checkpoint_tact)
+        simulation.saveCheckpoint(args.checkpoint)
+    simulation.resumeSimulation()
+    results = simulation.getResults(includeHistory=not args.no_history)
+    if cache is not None:
+        cache.put(key, results)
+    return results
+
+#продолжение симуляции из контрольной точки
+def resumeOne(filename: str, args) -> dict:
+    simulation = loadCheckpoint(filename)
+    setupOutput(simulation, args)
+    simulation.resumeSimulation()
+    return simulation.getResults(includeHistory=not args.no_history)
+
+#вывод журнала симуляции в stderr
+def setupOutput(simulation: Simulation, args):
+    if args.verbose:
+        simulation.os.setVerbosity(TraceLevel(min(args.verbose, TraceLevel.DEBUG)))
+        simulation.os.setOutputCallback(lambda message: print(message, file=sys.stderr))
+
+#точка входа
+def main(argv=None) -> int:
+    args = parseArgs(argv)
+
+    try:
+        cache = ResultCache(args.cache_dir, args.cache_size * 2**20) if args.cache else None
+    except OSError as e:
+        print(f"Ошибка открытия кэша {args.cache_dir}: {e}", file=sys.stderr)
+        return 1
+
+    results = []
+    if args.resume:
+        try:
+            results.append(resumeOne(args.resume, args))
+        except (OSError, ValueError, pickle.UnpicklingError) as e:
+            print(f"Ошибка восстановления из контрольной точки {args.resume}: {e}", file=sys.stderr)
+            return 1
+    for jsonFile in expandPackets(args.packets):
+        try:
+            results.append(runOne(jsonFile, args, cache))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ошибка симуляции пакета {jsonFile}: {e}", file=sys.stderr)
+            return 1
+
+    if args.profile_output:
+        profiles = [{'jsonFile': result['jsonFile'], 'loadTime': result['loadTime'], 'runTime': result['runTime'],
+                     'profile': result.get('profile')} for result in results]
+        with open(args.profile_output, 'w', encoding='utf-8') as f:
+            json.dump(profiles, f, ensure_ascii=False, indent=2)
+
+    if args.output == "-":
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
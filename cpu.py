@@ -29,11 +29,13 @@ class CPU:
     def isQuantumExhausted(self) -> bool:
         return self.remainingQuantum <= 0
     
-    #выделение кванта задаче
-    def allocateQuantumToTask(self, task: Task):
+    #выделение кванта задаче (по умолчанию квант процессора)
+    def allocateQuantumToTask(self, task: Task, quantum: int = None):
         if task:
-            task.allocateQuantum(self.quantumSize)
-            self.remainingQuantum = self.quantumSize
+            if quantum is None:
+                quantum = self.quantumSize
+            task.allocateQuantum(quantum)
+            self.remainingQuantum = quantum
             self.currentTask = task
             
             if task.type == TypeTask.MATH:
@@ -0,0 +1,101 @@
+#прореживание рядов истории для отрисовки: видимая часть ряда делится на интервалы,
+#в каждом интервале остаются точки минимума и максимума, поэтому пики не теряются
+import numpy as np
+
+MIN_BUCKETS = 100  #наименьшее количество интервалов прореживания
+
+#видимая часть ряда [start, end] с одной точкой запаса с каждой стороны; x упорядочен по возрастанию
+def clipToView(x, y, start, end):
+    left = max(int(np.searchsorted(x, start, 'left')) - 1, 0)
+    right = min(int(np.searchsorted(x, end, 'right')) + 1, len(x))
+    return x[left:right], y[left:right]
+
+#прореживание min/max: не больше 2 * buckets + 2 точек, первая и последняя точки ряда сохраняются;
+#остаток от деления ряда на интервалы входит в последний интервал, поэтому просматривается каждая точка
+def minMaxDecimate(x, y, buckets: int):
+    count = len(x)
+    if count <= 2 * buckets + 2:
+        return x, y
+    size = count // buckets
+    used = size * (buckets - 1)
+    values = np.asarray(y)
+    blocks = values[:used].reshape(buckets - 1, size)
+    offsets = np.arange(0, used, size)
+    tail = values[used:]
+    lows = np.append(blocks.argmin(axis=1) + offsets, tail.argmin() + used)
+    highs = np.append(blocks.argmax(axis=1) + offsets, tail.argmax() + used)
+    indices = np.empty(2 * buckets + 2, dtype=np.intp)
+    indices[0] = 0
+    indices[1:-1:2] = np.minimum(lows, highs)
+    indices[2:-1:2] = np.maximum(lows, highs)
+    indices[-1] = count - 1
+    return x[indices], y[indices]
+
+#ряд для графика шириной buckets точек: диапазон (start, end) или весь ряд, если start равен None
+def decimate(x, y, buckets: int, start=None, end=None):
+    if start is not None and len(x):
+        x, y = clipToView(x, y, start, end)
+    return minMaxDecimate(x, y, max(buckets, MIN_BUCKETS))
+
+#прореживание растущего ряда (обновление графика во время симуляции): индексы минимума и максимума
+#заполненных интервалов запоминаются, поэтому при обновлении просматриваются только добавленные точки;
+#когда интервалов становится больше 2 * buckets, соседние интервалы попарно сливаются
+class GrowingDecimation:
+    #конструктор
+    def __init__(self, buckets: int):
+        self.buckets = max(buckets, MIN_BUCKETS)  #нужное количество интервалов
+        self.clear()
+
+    #сброс к пустому ряду
+    def clear(self):
+        self.size = 1  #количество точек в интервале
+        self.done = 0  #количество точек в заполненных интервалах
+        self.lows = np.empty(0, dtype=np.intp)  #индексы минимумов заполненных интервалов
+        self.highs = np.empty(0, dtype=np.intp)  #индексы максимумов заполненных интервалов
+        self.indices = np.empty(0, dtype=np.intp)  #индексы точек прореженного ряда
+
+    #учет точек, добавленных в ряд y с прошлого обновления; возвращает индексы точек прореженного ряда.
+    #ряд короче уже учтенного считается новым рядом
+    def update(self, y) -> np.ndarray:
+        values = np.asarray(y)
+        count = len(values)
+        if count < self.done:
+            self.clear()
+        complete = (count - self.done) // self.size
+        if complete:
+            end = self.done + complete * self.size
+            blocks = values[self.done:end].reshape(complete, self.size)
+            offsets = np.arange(self.done, end, self.size)
+            self.lows = np.concatenate((self.lows, blocks.argmin(axis=1) + offsets))
+            self.highs = np.concatenate((self.highs, blocks.argmax(axis=1) + offsets))
+            self.done = end
+            while len(self.lows) > 2 * self.buckets:
+                self.merge(values)
+        self.indices = self.collect(values, count)
+        return self.indices
+
+    #попарное слияние интервалов; непарный последний интервал возвращается в неполный хвост ряда
+    def merge(self, values):
+        if len(self.lows) % 2:
+            self.lows, self.highs = self.lows[:-1], self.highs[:-1]
+            self.done -= self.size
+        lows = self.lows.reshape(-1, 2)
+        highs = self.highs.reshape(-1, 2)
+        self.lows = np.where(values[lows[:, 0]] <= values[lows[:, 1]], lows[:, 0], lows[:, 1])
+        self.highs = np.where(values[highs[:, 0]] >= values[highs[:, 1]], highs[:, 0], highs[:, 1])
+        self.size *= 2
+
+    #индексы прореженного ряда: первая точка, минимум и максимум каждого интервала и хвоста, последняя точка
+    def collect(self, values, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=np.intp)
+        if self.size == 1:
+            return np.arange(count)
+        pairs = np.column_stack((np.minimum(self.lows, self.highs), np.maximum(self.lows, self.highs))).ravel()
+        parts = [np.zeros(1, dtype=np.intp), pairs]
+        if self.done < count:
+            tail = values[self.done:count]
+            low, high = tail.argmin() + self.done, tail.argmax() + self.done
+            parts.append(np.array([min(low, high), max(low, high)], dtype=np.intp))
+        parts.append(np.array([count - 1], dtype=np.intp))
+        return np.concatenate(parts)
@@ -0,0 +1,218 @@
+#история выполнения: потактовые ряды в типизированных буферах
+from array import array
+from cpu import StateCPU
+
+#коды состояний процессора для хранения в истории
+CPU_STATES = list(StateCPU)
+CPU_STATE_CODES = {state: code for code, state in enumerate(CPU_STATES)}
+
+class Series:
+    #конструктор
+    def __init__(self, typecode: str, capacity: int = 1024):
+        self.typecode = typecode  #тип элементов в обозначениях модуля array
+        self.data = array(typecode, bytes(capacity * array(typecode).itemsize))  #предвыделенный буфер
+        self.length = 0  #количество записанных значений
+        self.owners = [1]  #общий для ветвей счетчик рядов, разделяющих буфер
+
+    #перед записью ряд, разделяющий буфер с другими ветвями, получает собственную копию (копирование при записи)
+    def detach(self):
+        if self.owners[0] > 1:
+            self.owners[0] -= 1
+            self.owners = [1]
+            self.data = array(self.typecode, self.data)
+
+    #увеличение емкости буфера
+    def reserve(self, size: int):
+        if size <= len(self.data):
+            return
+        capacity = max(size, 2 * len(self.data))
+        data = array(self.typecode, bytes(capacity * self.data.itemsize))
+        data[:self.length] = self.data[:self.length]
+        #старый буфер не изменяется, поэтому выданные ранее представления остаются корректными
+        self.data = data
+
+    #добавление значения
+    def append(self, value):
+        self.detach()
+        if self.length == len(self.data):
+            self.reserve(self.length + 1)
+        self.data[self.length] = value
+        self.length += 1
+
+    #добавление нескольких значений
+    def extend(self, values):
+        values = array(self.typecode, values)
+        self.detach()
+        self.reserve(self.length + len(values))
+        self.data[self.length:self.length + len(values)] = values
+        self.length += len(values)
+
+    #добавление одного значения несколько раз
+    def fill(self, value, count: int):
+        if count <= 0:
+            return
+        self.detach()
+        self.reserve(self.length + count)
+        self.data[self.length:self.length + count] = array(self.typecode, [value]) * count
+        self.length += count
+
+    #представление записанных значений только для чтения (без копирования); длина читается раньше буфера,
+    #поэтому при чтении из другого потока во время записи в представление не попадают незаписанные значения
+    def view(self) -> memoryview:
+        length = self.length
+        return memoryview(self.data)[:length].toreadonly()
+
+    #копия значений в виде списка
+    def toList(self) -> list:
+        return self.data[:self.length].tolist()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.data[:self.length][index]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Series index out of range")
+        return self.data[index]
+
+    def __repr__(self) -> str:
+        return f"Series({self.typecode!r}, {self.toList()!r})"
+
+    #ветвление: новый ряд разделяет буфер с исходным до первой записи в любой из них
+    def __deepcopy__(self, memo):
+        fork = Series.__new__(Series)
+        fork.__dict__.update(self.__dict__)
+        self.owners[0] += 1
+        return fork
+
+    #в контрольную точку сохраняются только записанные значения, без запаса емкости
+    def __getstate__(self):
+        return {'typecode': self.typecode, 'data': self.data[:self.length]}
+
+    def __setstate__(self, state):
+        self.typecode = state['typecode']
+        self.data = state['data']
+        self.length = len(self.data)
+        self.owners = [1]
+
+#создание пустой истории выполнения
+def createHistory(mathTasks: int = 0, inoutTasks: int = 0) -> dict:
+    return {
+        'tacts': Series('i'),
+        'memoryBlocksUsed': Series('i'),
+        'cpuStates': Series('b'),
+        'taskStates': {'WAIT': Series('i'), 'RUN': Series('i'), 'READY': Series('i')},
+        'memoryUsage': Series('d'),
+        'taskTypes': {'MATH': mathTasks, 'INOUT': inoutTasks},
+        'rrQueueLength': Series('i')
+    }
+
+#создание пустой статистики Round Robin
+def createRrStatistics() -> dict:
+    return {
+        'contextSwitches': 0,
+        'quantumExhaustions': 0,
+        'tasksCompletedInQuantum': 0,
+        'rrQueueLengthHistory': [],
+        'quantumEfficiency': Series('d')
+    }
+
+#создание пустой статистики ядра процессора: переключения, занятость и такты в каждом состоянии
+def createCoreStatistics() -> dict:
+    return {
+        'contextSwitches': 0,
+        'quantumExhaustions': 0,
+        'tasksCompletedInQuantum': 0,
+        'steals': 0,
+        'completed': 0,
+        'busyTacts': 0,
+        'stateCounts': {state.value: 0 for state in CPU_STATES}
+    }
+
+#создание пустой статистики планирования: оборот и ожидание завершенных задач
+def createSchedulingStatistics(scheduler: str = 'rr') -> dict:
+    return {
+        'scheduler': scheduler,
+        'completed': 0,
+        'totalTurnaround': 0,
+        'totalWaiting': 0,
+        'maxWaiting': 0
+    }
+
+#создание пустой статистики размещения задач в оперативной памяти
+def createMemoryStatistics(strategy: str = None, capacity: int = 0) -> dict:
+    return {
+        'strategy': strategy,
+        'capacity': capacity,
+        'admitted': 0,
+        'rejected': 0,
+        'totalLatency': 0,
+        'maxLatency': 0,
+        'fragmentation': Series('d'),
+        'freeMemory': Series('i')
+    }
+
+#общая длина рядов истории (None, если рядов нет)
+def historyLength(history: dict):
+    lengths = []
+    for value in history.values():
+        if isinstance(value, Series):
+            lengths.append(len(value))
+        elif isinstance(value, dict):
+            length = historyLength(value)
+            if length is not None:
+                lengths.append(length)
+    return min(lengths) if lengths else None
+
+#согласованный срез истории для чтения во время симуляции: значения такта дописываются в ряды по очереди,
+#поэтому все ряды обрезаются до общей длины; ряды возвращаются представлениями без копирования
+def snapshotHistory(history: dict, length: int = None) -> dict:
+    if length is None:
+        length = historyLength(history)
+    result = {}
+    for key, value in history.items():
+        if isinstance(value, Series):
+            result[key] = value.view()[:length]
+        elif isinstance(value, dict):
+            result[key] = snapshotHistory(value, length)
+        else:
+            result[key] = value
+    return result
+
+#заполнение пустой истории template значениями из словаря, полученного historyToDict
+def historyFromDict(template: dict, data: dict) -> dict:
+    for key, value in template.items():
+        if key not in data:
+            continue
+        if key == 'cpuStates':
+            value.extend(CPU_STATE_CODES[StateCPU(name)] for name in data[key])
+        elif isinstance(value, Series):
+            value.extend(data[key])
+        elif isinstance(value, dict):
+            historyFromDict(value, data[key])
+        else:
+            template[key] = data[key]
+    return template
+
+#преобразование истории к обычным спискам (например, для сохранения в JSON)
+def historyToDict(history: dict) -> dict:
+    result = {}
+    for key, value in history.items():
+        if key == 'cpuStates':
+            result[key] = [CPU_STATES[code].value for code in value]
+        elif isinstance(value, Series):
+            result[key] = value.toList()
+        elif isinstance(value, dict):
+            result[key] = historyToDict(value)
+        else:
+            result[key] = value
+    return result
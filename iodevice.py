@@ -0,0 +1,67 @@
+#устройство ввода-вывода: INOUT задачи обслуживаются в его очереди, не занимая процессор
+from packet import Task, StateTask
+from dataclasses import dataclass, field
+from collections import deque
+from typing import Deque, Optional
+
+@dataclass
+class IoDevice:
+    serviceTime: int = 1  #тактов устройства на один такт задачи ввода-вывода
+    queue: Deque[Task] = field(default_factory=deque)  #очередь запросов
+    currentTask: Optional[Task] = None  #задача, запрос которой обслуживается
+    remainingService: int = 0  #оставшееся время обслуживания текущего запроса
+    servedCount: int = 0  #количество обслуженных запросов
+    busyTacts: int = 0  #такты, в которые устройство было занято
+    queueTacts: int = 0  #сумма длин очереди по тактам (для средней длины очереди)
+
+    #постановка запроса задачи в очередь устройства; задача блокируется до окончания обслуживания
+    def submit(self, task: Task):
+        if task.state == StateTask.WAIT:
+            task.changeState(StateTask.RUN)
+        self.queue.append(task)
+
+    #количество запросов на устройстве, включая обслуживаемый
+    def load(self) -> int:
+        return len(self.queue) + (self.currentTask is not None)
+
+    #начало обслуживания очередного запроса, если устройство свободно
+    def startNext(self):
+        if self.currentTask is None and self.queue:
+            self.currentTask = self.queue.popleft()
+            self.remainingService = self.currentTask.getRemainingTime() * self.serviceTime
+
+    #один такт устройства; возвращает задачу, запрос которой обслужен
+    def tick(self) -> Optional[Task]:
+        self.startNext()
+        self.queueTacts += len(self.queue)
+        if self.currentTask is None:
+            return None
+        self.busyTacts += 1
+        return self.advance(1)
+
+    #несколько тактов без завершения запроса и без изменения очереди
+    def advanceSteady(self, count: int):
+        self.queueTacts += len(self.queue) * count
+        if self.currentTask:
+            self.busyTacts += count
+            self.advance(count)
+
+    #продвижение обслуживания текущего запроса на count тактов
+    def advance(self, count: int) -> Optional[Task]:
+        task = self.currentTask
+        self.remainingService -= count
+        task.executionTime = task.requiredTime - max(0, -(-self.remainingService // self.serviceTime))
+        if self.remainingService <= 0:
+            task.changeState(StateTask.READY)
+            self.currentTask = None
+            self.servedCount += 1
+            return task
+        return None
+
+    #такт, в который завершится текущий запрос, или ближайший такт начала обслуживания
+    def nextEvent(self, currentTact: int) -> Optional[int]:
+        if self.currentTask:
+            return currentTact + self.remainingService
+        if self.queue:
+            return currentTact + 1
+        return None
@@ -3,15 +3,39 @@ import sys
 import random
 import json
 import os
+import traceback
+from collections import deque
 
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QObject, QThread, pyqtSignal
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QSpinBox, QMessageBox,
                              QLineEdit, QPushButton, QPlainTextEdit, QFileDialog, 
-                             QDialog, QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QGridLayout)
+                             QDialog, QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QGridLayout, QCheckBox)
 from PyQt6.QtGui import QKeyEvent, QPainter, QColor, QPen
 
 from simulation import Simulation, Packet
+from scheduler import SCHEDULER_NAMES
 from statisticsInfo import Statistics
+from resultcache import ResultCache, cacheKey
+
+LOG_MAX_LINES = 5000  #максимальное количество строк в окне журнала
+LOG_FLUSH_INTERVAL = 100  #период вывода накопленных строк журнала, мс
+CHART_REFRESH_INTERVAL = 250  #период обновления графиков во время симуляции, мс
+
+#выполнение симуляции в отдельном потоке
+class SimulationWorker(QObject):
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, simulation):
+        super().__init__()
+        self.simulation = simulation
+
+    def run(self):
+        try:
+            self.simulation.start()
+        except Exception:
+            self.failed.emit(traceback.format_exc())
+        self.finished.emit()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -117,7 +141,19 @@ class MainWindow(QMainWindow):
 
         self.startbutton = QPushButton("СТАРТ СИМУЛЯЦИИ",self)
         self.startbutton.setStyleSheet(btntext)
-        self.startbutton.clicked.connect(self.startSimulation)
+        self.startbutton.clicked.connect(self.toggleSimulation)
+
+        #выбор политики планирования: в списке короткое название, полное - во всплывающей подсказке
+        self.schedulervalue = QComboBox(self)
+        self.schedulervalue.setStyleSheet(btntext)
+        for name, title in SCHEDULER_NAMES.items():
+            self.schedulervalue.addItem(name.upper(), name)
+            self.schedulervalue.setItemData(self.schedulervalue.count() - 1, title, Qt.ItemDataRole.ToolTipRole)
+
+        #отказ от кэша результатов: прогоны не читаются из ~/.cache/os_simulation и не записываются в него
+        self.cachevalue = QCheckBox('Брать результаты из кэша и сохранять их в кэш', self)
+        self.cachevalue.setChecked(True)
+        self.cachevalue.setStyleSheet(maintext)
 
         self.infolabel = QLabel('Для выхода из программы нажмите клавижу ESC', self)
         self.infolabel.setAlignment(Qt.AlignmentFlag.AlignHCenter)
@@ -126,6 +162,23 @@ class MainWindow(QMainWindow):
         self.datatext = QPlainTextEdit('', self)
         self.datatext.setStyleSheet(maintext + "background-color: #D9D9D9; ")
         self.datatext.setReadOnly(True)
+        self.datatext.setMaximumBlockCount(LOG_MAX_LINES)
+        
+        #строки журнала из потока симуляции копятся здесь и выводятся пачками по таймеру
+        self.pendingLog = deque(maxlen=LOG_MAX_LINES)
+        self.logTimer = QTimer(self)
+        self.logTimer.setInterval(LOG_FLUSH_INTERVAL)
+        self.logTimer.timeout.connect(self.flushLog)
+        #графики во время симуляции обновляются с фиксированной частотой, а не на каждом такте
+        self.chartTimer = QTimer(self)
+        self.chartTimer.setInterval(CHART_REFRESH_INTERVAL)
+        self.chartTimer.timeout.connect(self.refreshLiveCharts)
+        self.simulationThread = None
+        self.simulationWorker = None
+        #повторные прогоны с тем же пакетом и параметрами берутся из кэша результатов на диске;
+        #кэш открывается при первом прогоне с включенным флажком cachevalue
+        self.resultCache = None
+        self.resultKey = None
 
         self.quantumlabel = QLabel('Размер кванта времени (тактов)', self)
         self.quantumlabel.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -223,10 +276,19 @@ class MainWindow(QMainWindow):
         self.inouttasklabel.setGeometry(2 * cellWidth + 10, cellHeight + padding * 8 - 7, cellWidth - 20, 30)
         self.intoutcountlabel.setGeometry(2 * cellWidth + 300, cellHeight + padding * 8 - 13, cellWidth - 20, 30)
         
+        self.schedulervalue.setGeometry(2 * cellWidth + 10, cellHeight + padding * 9 - 7, 130, 45)
         self.startbutton.setGeometry(2 * cellWidth + 150, cellHeight + padding * 9 - 7, 195, 45)
+        self.cachevalue.setGeometry(2 * cellWidth + 10, cellHeight + padding * 10 - 7, cellWidth - 20, 30)
 
         self.infolabel.setGeometry(2*cellWidth, 2*cellHeight + padding * 5, cellWidth, cellHeight)
     
+    def closeEvent(self, event):
+        if self.simulationThread is not None:
+            self.simulation.requestStop()
+            self.simulationThread.quit()
+            self.simulationThread.wait()
+        super().closeEvent(event)
+    
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key.Key_Escape:
             self.close()
@@ -260,12 +322,20 @@ class MainWindow(QMainWindow):
         self,
         "Выбрать пакет", 
         "ready_packets/", 
-        "Packet (*.json)"
+        "Packet (*.json *.jsonl *.ospk)"
         )
         if ok and filename:
             self.packname.setText(filename.split('/')[-1])  
             self.getPackInfo()
 
+    #кнопка запускает симуляцию, а во время выполнения прерывает ее
+    def toggleSimulation(self):
+        if self.simulationThread is not None:
+            self.startbutton.setEnabled(False)
+            self.simulation.requestStop()
+        else:
+            self.startSimulation()
+
     def startSimulation(self):
         try:
             self.datatext.clear()
@@ -275,6 +345,26 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Ошибка", f"Файл пакета не найден: {packetFile}")
                 return
             
+            parameters = {
+                'maxBlocksCount': self.blocksvalue.value(),
+                'ram': self.ramvalue.value(),
+                'maxTacts': self.tactsvalue.value(),
+                'quantumSize': self.quantumvalue.value(),
+                'scheduler': self.schedulervalue.currentData()
+            }
+            
+            #кэш проверяется до чтения пакета: при попадании пакет не загружается и ОС не создается
+            self.resultKey = None
+            if self.openResultCache() is not None:
+                self.resultKey = cacheKey(packetFile, parameters)
+                cached = self.resultCache.get(self.resultKey)
+                if cached is not None:
+                    self.simulation = Simulation.fromResults(cached, jsonFile=packetFile, **parameters)
+                    self.resultKey = None
+                    self.datatext.appendPlainText("Результаты взяты из кэша (пакет и параметры не изменились)")
+                    self.onSimulationFinished()
+                    return
+            
             try:
                 test_packet = Packet(packetFile)
                 if not test_packet.tasks:
@@ -284,21 +374,11 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Ошибка", f"Ошибка загрузки пакета: {str(e)}")
                 return
             
-            self.simulation = Simulation(
-                maxBlocksCount=self.blocksvalue.value(),
-                ram=self.ramvalue.value(),
-                jsonFile=packetFile,
-                maxTacts=self.tactsvalue.value(),
-                quantumSize=self.quantumvalue.value()
-            )
+            self.simulation = Simulation(jsonFile=packetFile, **parameters)
             
             if self.simulation and self.simulation.os:
                 self.simulation.os.setOutputCallback(self.outputCallback)
-                self.simulation.start()
-                
-                QTimer.singleShot(100, self.setupStatisticsAfterSimulation)
-                
-                self.datatext.appendPlainText(f"Время выполнения симуляции: {self.simulation.getRunTime():.2f} секунд")
+                self.runInBackground(self.simulation)
             else:
                 QMessageBox.critical(self, "Ошибка", "Не удалось создать симуляцию")
                 
@@ -306,14 +386,103 @@ class MainWindow(QMainWindow):
             errorMsg = f"Не удалось запустить симуляцию: {str(e)}"
             QMessageBox.critical(self, "Ошибка", errorMsg)
             self.datatext.appendPlainText(f"ОШИБКА: {errorMsg}")
-            import traceback
             self.datatext.appendPlainText(f"Трассировка:\n{traceback.format_exc()}")
 
+    #кэш результатов, если он включен; каталог кэша создается при первом обращении
+    def openResultCache(self):
+        if not self.cachevalue.isChecked():
+            return None
+        if self.resultCache is None:
+            try:
+                self.resultCache = ResultCache()
+            except OSError as e:
+                self.datatext.appendPlainText(f"Кэш результатов недоступен: {e}")
+        return self.resultCache
+
+    def runInBackground(self, simulation):
+        self.startbutton.setText("ПРЕРВАТЬ СИМУЛЯЦИЮ")
+        self.pendingLog.clear()
+        
+        self.simulationThread = QThread(self)
+        self.simulationWorker = SimulationWorker(simulation)
+        self.simulationWorker.moveToThread(self.simulationThread)
+        
+        self.simulationThread.started.connect(self.simulationWorker.run)
+        self.simulationWorker.failed.connect(self.onSimulationFailed)
+        self.simulationWorker.finished.connect(self.onSimulationFinished)
+        self.simulationWorker.finished.connect(self.simulationThread.quit)
+        self.simulationWorker.finished.connect(self.simulationWorker.deleteLater)
+        self.simulationThread.finished.connect(self.simulationThread.deleteLater)
+        
+        self.logTimer.start()
+        self.chartTimer.start()
+        self.simulationThread.start()
+
+    def onSimulationFinished(self):
+        self.logTimer.stop()
+        self.chartTimer.stop()
+        self.flushLog()
+        self.simulationThread = None
+        self.simulationWorker = None
+        self.startbutton.setText("СТАРТ СИМУЛЯЦИИ")
+        self.startbutton.setEnabled(True)
+        
+        if self.simulation:
+            QTimer.singleShot(100, self.setupStatisticsAfterSimulation)
+            
+            if self.resultKey is not None and not self.simulation.stopRequested and self.cachevalue.isChecked():
+                try:
+                    self.resultCache.put(self.resultKey, self.simulation.getResults())
+                except OSError as e:
+                    self.datatext.appendPlainText(f"Не удалось сохранить результаты в кэш: {e}")
+                self.resultKey = None
+            
+            if self.simulation.stopRequested:
+                self.datatext.appendPlainText(f"Симуляция прервана на такте {self.simulation.totalTacts}")
+            self.datatext.appendPlainText(f"Время выполнения симуляции: {self.simulation.getRunTime():.2f} секунд")
+
+    def onSimulationFailed(self, trace: str):
+        self.flushLog()
+        QMessageBox.critical(self, "Ошибка", "Ошибка во время симуляции")
+        self.datatext.appendPlainText(f"ОШИБКА: Трассировка:\n{trace}")
+        self.simulation = None
+
+    def flushLog(self):
+        if not self.pendingLog:
+            return
+        lines = []
+        while self.pendingLog:
+            lines.append(self.pendingLog.popleft())
+        self.datatext.appendPlainText("\n".join(lines))
+        cursor = self.datatext.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        self.datatext.setTextCursor(cursor)
+
+    #обновление графиков по таймеру во время симуляции; графики создаются, когда в истории появятся такты
+    def refreshLiveCharts(self):
+        if not self.simulation:
+            return
+        try:
+            if self.statisticsWidget is not None and self.statisticsWidget.simulation is self.simulation:
+                self.statisticsWidget.updateLiveCharts()
+            elif len(self.simulation.os.history['tacts']) > 0:
+                self.attachStatistics()
+        except Exception as e:
+            self.chartTimer.stop()
+            self.datatext.appendPlainText(f"\nОШИБКА: Не удалось обновить графики: {e}")
+
+    #графики создаются один раз за время работы окна; для новой симуляции они сбрасываются и заполняются заново
+    def attachStatistics(self):
+        if self.statisticsWidget is None:
+            self.statisticsWidget = Statistics(self.simulation)
+            self.replaceGraphPlaceholders()
+        elif self.statisticsWidget.simulation is not self.simulation:
+            self.statisticsWidget.setSimulation(self.simulation)
+
     def setupStatisticsAfterSimulation(self):
         try:
             if self.simulation:
-                self.statisticsWidget = Statistics(self.simulation)
-                self.replaceGraphPlaceholders()
+                self.attachStatistics()
 
                 if hasattr(self.statisticsWidget, 'updateCharts'):
                     self.statisticsWidget.updateCharts()
@@ -329,12 +498,9 @@ class MainWindow(QMainWindow):
             errorLabel.setStyleSheet("color: red;")
             self.datatext.appendPlainText(f"\nОШИБКА: Не удалось создать графики: {e}")
 
+    #вызывается из потока симуляции: строка только ставится в очередь, вывод делает flushLog
     def outputCallback(self, tactInfo: str):
-        self.datatext.appendPlainText(tactInfo)
-        cursor = self.datatext.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.datatext.setTextCursor(cursor)
-        QApplication.processEvents()
+        self.pendingLog.append(tactInfo)
 
     def replaceGraphPlaceholders(self):
         if not self.statisticsWidget:
@@ -850,7 +1016,8 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
 
-app = QApplication(sys.argv)
-window = MainWindow()
-window.show()
-app.exec()
\ No newline at end of file
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    app.exec()
\ No newline at end of file
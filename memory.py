@@ -0,0 +1,177 @@
+#разделы памяти
+from task import Task, StateTask
+from allocator import createAllocator
+from typing import Iterator, List, Optional, Tuple
+import heapq
+
+class MemoryBlocks:
+    #конструктор
+    def __init__(self, count: int = 0):
+        self.slots: List[Optional[Task]] = [None] * count  #разделы памяти с задачами
+        self.freeHeap: List[int] = list(range(count))  #куча номеров свободных разделов (ленивая)
+        self.positions = {}  #id задачи -> номер раздела
+        self.used = 0  #количество занятых разделов
+        self.completed: List[int] = []  #куча номеров разделов с завершившимися задачами (ленивая)
+
+    #количество занятых разделов
+    def usedCount(self) -> int:
+        return self.used
+
+    #количество свободных разделов
+    def freeCount(self) -> int:
+        return len(self.slots) - self.used
+
+    #есть ли свободный раздел
+    def hasFree(self) -> bool:
+        return self.used < len(self.slots)
+
+    #поместится ли задача в память сейчас (фиксированные разделы вмещают любую задачу)
+    def fits(self, task: Task) -> bool:
+        return True
+
+    #может ли задача когда-либо поместиться в память
+    def admissible(self, task: Task) -> bool:
+        return True
+
+    #загрузка задачи в свободный раздел с наименьшим номером, возвращает номер раздела
+    def load(self, task: Task) -> int:
+        while self.freeHeap:
+            index = heapq.heappop(self.freeHeap)
+            if self.slots[index] is None:
+                self.place(index, task)
+                return index
+        raise MemoryError("нет свободных разделов памяти")
+
+    #освобождение раздела по номеру, возвращает находившуюся в нем задачу
+    def free(self, index: int) -> Optional[Task]:
+        task = self.slots[index]
+        if task is not None:
+            self.slots[index] = None
+            del self.positions[id(task)]
+            self.used -= 1
+            heapq.heappush(self.freeHeap, index)
+        return task
+
+    #освобождение раздела, занятого задачей
+    def release(self, task: Task) -> Optional[int]:
+        index = self.positions.get(id(task))
+        if index is not None:
+            self.free(index)
+        return index
+
+    #номер раздела, занятого задачей
+    def indexOf(self, task: Task) -> Optional[int]:
+        return self.positions.get(id(task))
+
+    #занятые разделы в порядке возрастания номера
+    def occupied(self) -> List[Tuple[int, Task]]:
+        return [(index, self.slots[index]) for index in sorted(self.positions.values())]
+
+    #уведомление о смене состояния задачи: раздел завершившейся задачи попадает в кучу завершенных
+    def taskStateChanged(self, task: Task, oldState: StateTask, newState: StateTask):
+        if newState == StateTask.READY:
+            index = self.positions.get(id(task))
+            if index is not None:
+                heapq.heappush(self.completed, index)
+
+    #завершена ли задача в разделе (запись кучи устаревает, если раздел освобожден или занят другой задачей)
+    def isCompletedSlot(self, index: int) -> bool:
+        task = self.slots[index]
+        return task is not None and task.state == StateTask.READY
+
+    #есть ли разделы с завершенными задачами; устаревшие записи с вершины кучи отбрасываются
+    def hasCompleted(self) -> bool:
+        while self.completed and not self.isCompletedSlot(self.completed[0]):
+            heapq.heappop(self.completed)
+        return bool(self.completed)
+
+    #номера занятых разделов, задачи в которых завершены, по возрастанию; куча завершенных опустошается
+    def completedIndexes(self) -> List[int]:
+        indexes = []
+        while self.completed:
+            index = heapq.heappop(self.completed)
+            if self.isCompletedSlot(index) and (not indexes or indexes[-1] != index):
+                indexes.append(index)
+        return indexes
+
+    #задачи, находящиеся в памяти
+    def tasks(self) -> Iterator[Task]:
+        return (self.slots[index] for index in self.positions.values())
+
+    #размещение задачи в конкретном разделе
+    def place(self, index: int, task: Task):
+        self.slots[index] = task
+        self.positions[id(task)] = index
+        self.used += 1
+        if task.state == StateTask.READY:
+            heapq.heappush(self.completed, index)
+
+    def __getitem__(self, index: int) -> Optional[Task]:
+        return self.slots[index]
+
+    def __setitem__(self, index: int, task: Optional[Task]):
+        self.free(index)
+        if task is not None:
+            self.place(index, task)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __iter__(self) -> Iterator[Optional[Task]]:
+        return iter(self.slots)
+
+    #id задач меняются при восстановлении: сохраняются номера занятых разделов в порядке загрузки
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['positions'] = list(self.positions.values())
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.positions = {id(self.slots[index]): index for index in state['positions']}
+
+
+class VariablePartitions(MemoryBlocks):
+    #разделы переменного размера: задача занимает в оперативной памяти участок объемом task.memory
+    def __init__(self, count: int = 0, capacity: int = 0, strategy: str = 'firstFit'):
+        super().__init__(count)
+        self.strategy = strategy  #стратегия размещения
+        self.allocator = createAllocator(strategy, capacity)  #распределитель оперативной памяти
+        self.addresses = {}  #id задачи -> адрес участка
+
+    def fits(self, task: Task) -> bool:
+        return self.allocator.fits(task.memory)
+
+    def admissible(self, task: Task) -> bool:
+        return task.memory <= self.allocator.maxRequest()
+
+    def load(self, task: Task) -> int:
+        if not self.fits(task):
+            raise MemoryError(f"задача {task.num} не помещается в свободную память")
+        return super().load(task)
+
+    def free(self, index: int) -> Optional[Task]:
+        task = super().free(index)
+        if task is not None:
+            self.allocator.free(self.addresses.pop(id(task)))
+        return task
+
+    def place(self, index: int, task: Task):
+        address = self.allocator.allocate(task.memory)
+        if address is None:
+            raise MemoryError(f"задача {task.num} не помещается в свободную память")
+        self.addresses[id(task)] = address
+        super().place(index, task)
+
+    #адрес участка, занятого задачей
+    def addressOf(self, task: Task) -> Optional[int]:
+        return self.addresses.get(id(task))
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['addresses'] = [(self.positions[key], address) for key, address in self.addresses.items()]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.addresses = {id(self.slots[index]): address for index, address in state['addresses']}
@@ -1,8 +1,18 @@
 #операционная система
-from packet import Packet, Task, TypeTask, StateTask
+from packet import Packet, StreamPacket, TaskSet, RunningTasks, Task, TypeTask, StateTask
 from cpu import CPU, StateCPU
+from iodevice import IoDevice
+from memory import MemoryBlocks, VariablePartitions
+from history import (CPU_STATE_CODES, createHistory, createRrStatistics, createMemoryStatistics,
+                     createSchedulingStatistics, createCoreStatistics)
+from scheduler import DISPATCH_MODES
+from tracing import TraceLevel, TraceEvent
 from dataclasses import dataclass, field
-from typing import List, Optional, Callable
+from collections import deque
+from typing import Deque, Iterator, List, Optional, Callable
+
+#номер ядра в OS.coreTasks для задач, обслуживаемых устройствами ввода-вывода
+IO_CORE = -1
 
 @dataclass
 class OS:
@@ -10,34 +20,47 @@ class OS:
     maxBlocksCount: int                                               #максимальное количество разделов памяти
     quantumSize: int = 1                                               #размер кванта времени для Round Robin
     packet: Optional[Packet] = None                                     #пакет задач для выполнения
-    memoryBlocks: List[Optional[Task]] = field(default_factory=list)   #разделы памяти с задачами
-    waitQueue: List[Task] = field(default_factory=list)                #очередь ожидающих задач
-    readyQueue: List[Task] = field(default_factory=list)               #очередь завершенных задач
-    runningTasks: List[Task] = field(default_factory=list)             #список выполняющихся задач
-    ioWaitTasks: List[Task] = field(default_factory=list)             #список задач, ожидающих ввод/вывод
+    memoryBlocks: MemoryBlocks = field(default_factory=MemoryBlocks)   #разделы памяти с задачами
+    waitQueue: Deque[Task] = field(default_factory=deque)              #очередь ожидающих задач (записи Packet.entryOf)
+    readyQueue: List[Task] = field(default_factory=list)               #очередь завершенных задач (записи Packet.entryOf)
+    completedCount: int = 0                                            #количество завершенных задач
+    streaming: bool = False                                            #потоковый режим: задачи читаются из файла по мере загрузки
+    taskSource: Optional[Iterator[Task]] = None                        #поток еще не прочитанных задач пакета
+    pulledTasks: int = 0                                               #количество задач, прочитанных из потока пакета
+    runningTasks: RunningTasks = field(default_factory=RunningTasks)   #выполняющиеся задачи (проверка наличия и счетчики RUN за O(1))
+    ioWaitTasks: TaskSet = field(default_factory=TaskSet)              #задачи, ожидающие ввод/вывод (проверка наличия за O(1))
     cpu: CPU = field(default_factory=CPU)                               #процессор системы
     currentTact: int = 0                                               #текущий такт выполнения
     outputCallback: Optional[Callable[[str], None]] = None             #функция для вывода информации
+    traceCallback: Optional[Callable[[TraceEvent], None]] = None       #получатель структурированных событий трассировки
+    verbosity: TraceLevel = TraceLevel.DEBUG                            #запрошенный уровень подробности трассировки
+    traceLevel: TraceLevel = TraceLevel.OFF                             #действующий уровень (OFF, если вывод не подключен)
+    compressedStretches: List[tuple] = field(default_factory=list)     #пропущенные без событий такты (первый такт, количество)
+    placement: Optional[str] = None                                    #размещение в ram: firstFit, bestFit, buddy (None - фиксированные разделы)
+    scheduler: str = 'rr'                                              #политика планирования: rr, sjf, srtf, mlfq, priority
+    cores: int = 1                                                     #количество ядер процессора
+    dispatch: str = 'global'                                           #распределение задач по ядрам: global - общая очередь, stealing - очереди ядер с перехватом
+    globalCheckInterval: int = 61                                      #каждое N-е переключение ядро сначала проверяет общую очередь (stealing)
+    cpus: List[CPU] = field(default_factory=list)                      #ядра процессора, первое - self.cpu
+    coreTasks: dict = field(default_factory=dict)                      #id выполняемой задачи -> номер ядра (IO_CORE - на устройстве)
+    ioDevices: int = 0                                                 #количество устройств ввода-вывода (0 - INOUT задачи выполняются на процессоре)
+    ioServiceTime: int = 1                                             #тактов устройства на один такт задачи ввода-вывода
+    devices: List[IoDevice] = field(default_factory=list)              #устройства ввода-вывода
+    
+    #статистика каждого ядра: переключения, перехваты, занятость и такты в каждом состоянии
+    coreStatistics: list = field(default_factory=list)
+    
+    #статистика размещения задач в оперативной памяти
+    memoryStatistics: dict = field(default_factory=createMemoryStatistics)
+    
+    #статистика планирования: время оборота и ожидания задач
+    schedulingStatistics: dict = field(default_factory=createSchedulingStatistics)
     
     #статистика Round Robin
-    rrStatistics: dict = field(default_factory=lambda: {
-        'contextSwitches': 0,
-        'quantumExhaustions': 0,
-        'tasksCompletedInQuantum': 0,
-        'rrQueueLengthHistory': [],
-        'quantumEfficiency': []
-    })
+    rrStatistics: dict = field(default_factory=createRrStatistics)
     
     #история выполнения для статистики
-    history: dict = field(default_factory=lambda: {
-        'tacts': [],
-        'memoryBlocksUsed': [],
-        'cpuStates': [],
-        'taskStates': {'WAIT': [], 'RUN': [], 'READY': []},
-        'memoryUsage': [],
-        'taskTypes': {'MATH': 0, 'INOUT': 0},
-        'rrQueueLength': []
-    })
+    history: dict = field(default_factory=createHistory)
     
     #счетчики состояний процессора
     cpuStateCounts: dict = field(default_factory=lambda: {
@@ -47,36 +70,40 @@ class OS:
         "ПЕРЕГРУЗКА": 0
     })
     
+    #пост-инициализация
+    def __post_init__(self):
+        self.updateTraceLevel()
+    
     #инициализация системы
-    def initialize(self, jsonFile: str):
-        self.packet = Packet(jsonFile)
-        self.waitQueue = self.packet.tasks.copy()
-        self.memoryBlocks = [None] * self.maxBlocksCount
+    def initialize(self, jsonFile: str, streaming: bool = False, compact: bool = False):
+        self.streaming = streaming
+        if streaming:
+            self.packet = StreamPacket(jsonFile)
+            self.taskSource = self.packet.openStream()
+            self.pulledTasks = 0
+        else:
+            self.packet = Packet(jsonFile, compact=compact)
+            self.taskSource = None
+        if self.packet.scheduler != self.scheduler:
+            self.packet.setScheduler(self.scheduler)
+        self.createCores()
+        self.createIoDevices()
+        self.waitQueue = deque(self.packet.taskEntries())
+        self.readyQueue = []
+        self.completedCount = 0
+        self.createTaskSets()
+        self.setMemoryBlocks(self.createMemoryBlocks(self.maxBlocksCount))
+        self.memoryStatistics = createMemoryStatistics(self.placement, self.ramCapacity())
         self.currentTact = 0
+        self.compressedStretches = []
         
         self.cpu.setQuantumSize(self.quantumSize)
         self.cpu.state = StateCPU.IDLE
         
-        self.rrStatistics = {
-            'contextSwitches': 0,
-            'quantumExhaustions': 0,
-            'tasksCompletedInQuantum': 0,
-            'rrQueueLengthHistory': [],
-            'quantumEfficiency': []
-        }
+        self.rrStatistics = createRrStatistics()
+        self.schedulingStatistics = createSchedulingStatistics(self.scheduler)
         
-        self.history = {
-            'tacts': [],
-            'memoryBlocksUsed': [],
-            'cpuStates': [],
-            'taskStates': {'WAIT': [], 'RUN': [], 'READY': []},
-            'memoryUsage': [],
-            'taskTypes': {
-                'MATH': self.packet.getMathTasks(),
-                'INOUT': self.packet.getInOutTasks()
-            },
-            'rrQueueLength': []
-        }
+        self.history = createHistory(self.packet.getMathTasks(), self.packet.getInOutTasks())
         
         self.cpuStateCounts = {
             "ПРОСТОЙ": 0,
@@ -85,27 +112,96 @@ class OS:
             "ПЕРЕГРУЗКА": 0
         }
     
-    #планирование Round Robin
+    #создание ядер процессора: первое ядро - self.cpu, остальные создаются с тем же квантом
+    def createCores(self):
+        if self.cores < 1:
+            raise ValueError("Количество ядер процессора должно быть положительным")
+        if self.dispatch not in DISPATCH_MODES:
+            raise ValueError(f"Неизвестный способ распределения задач по ядрам: {self.dispatch}")
+        
+        self.cpus = [self.cpu] + [CPU() for _ in range(self.cores - 1)]
+        for cpu in self.cpus[1:]:
+            cpu.setQuantumSize(self.quantumSize)
+        self.coreTasks = {}
+        self.coreStatistics = [createCoreStatistics() for _ in self.cpus]
+        
+        if self.packet:
+            self.packet.setCoreQueues(self.cores if self.dispatch == 'stealing' else 0)
+    
+    #создание устройств ввода-вывода
+    def createIoDevices(self):
+        if self.ioDevices < 0:
+            raise ValueError("Количество устройств ввода-вывода не может быть отрицательным")
+        if self.ioServiceTime < 1:
+            raise ValueError("Время обслуживания ввода-вывода должно быть положительным")
+        self.devices = [IoDevice(serviceTime=self.ioServiceTime) for _ in range(self.ioDevices)]
+    
+    #объем оперативной памяти в МБ
+    def ramCapacity(self) -> int:
+        return self.ram * 1024
+    
+    #разделы памяти выбранной модели: фиксированные или переменного размера в пределах ram
+    def createMemoryBlocks(self, count: int) -> MemoryBlocks:
+        if self.placement:
+            return VariablePartitions(count, self.ramCapacity(), self.placement)
+        return MemoryBlocks(count)
+    
+    #замена разделов памяти: пакет уведомляет новые разделы о завершении задач
+    def setMemoryBlocks(self, memoryBlocks: MemoryBlocks):
+        self.memoryBlocks = memoryBlocks
+        if self.packet:
+            self.packet.memoryBlocks = memoryBlocks
+    
+    #создание множеств выполняющихся и ожидающих ввод/вывод задач; пакет уведомляет выполняющиеся о смене состояний
+    def createTaskSets(self):
+        table = self.packet.table if self.packet else None
+        self.runningTasks = RunningTasks(table)
+        self.ioWaitTasks = TaskSet(table)
+        if self.packet:
+            self.packet.runningTasks = self.runningTasks
+    
+    #планирование по политике очереди готовых задач (по умолчанию Round Robin) на каждом ядре
     def roundRobinSchedule(self):
+        for core, cpu in enumerate(self.cpus):
+            self.scheduleCore(core, cpu)
+    
+    #планирование одного ядра; вытеснение по решению политики учитывается как исчерпание кванта
+    #при устройствах ввода-вывода INOUT задачи передаются устройству, а ядро без задачи сразу берет следующую
+    def scheduleCore(self, core: int, cpu: CPU):
         needSwitch = False
+        statistics = self.coreStatistics[core]
         
-        if self.cpu.currentTask:
-            if self.cpu.currentTask.state == StateTask.READY:
+        if cpu.currentTask:
+            if cpu.currentTask.state == StateTask.READY:
                 needSwitch = True
                 self.rrStatistics['tasksCompletedInQuantum'] += 1
-            elif self.cpu.isQuantumExhausted():
+                statistics['tasksCompletedInQuantum'] += 1
+            elif self.packet and self.packet.queueFor(core).shouldPreempt(cpu):
                 needSwitch = True
                 self.rrStatistics['quantumExhaustions'] += 1
-        elif self.cpu.state == StateCPU.IDLE:
+                statistics['quantumExhaustions'] += 1
+        elif cpu.state == StateCPU.IDLE or self.devices:
             needSwitch = True
             
         if needSwitch and self.packet:
-            currentTask = self.cpu.currentTask
-            nextTask = self.packet.getNextTaskRr(currentTask)
+            currentTask = cpu.currentTask
+            preferGlobal = (statistics['contextSwitches'] + 1) % self.globalCheckInterval == 0
+            nextTask, source = self.packet.getNextTaskForCore(core, currentTask, self.coreTasks, preferGlobal)
+            while nextTask and self.devices and nextTask.type == TypeTask.INOUT:
+                self.submitIo(nextTask)
+                nextTask, source = self.packet.getNextTaskForCore(core, None, self.coreTasks, preferGlobal)
             
             if nextTask:  
-                self.cpu.allocateQuantumToTask(nextTask)
+                if currentTask:
+                    self.coreTasks.pop(id(currentTask), None)
+                cpu.allocateQuantumToTask(nextTask, self.packet.queueFor(core).quantumFor(nextTask, self.quantumSize))
+                self.coreTasks[id(nextTask)] = core
                 self.rrStatistics['contextSwitches'] += 1
+                statistics['contextSwitches'] += 1
+                if source == 'steal':
+                    statistics['steals'] += 1
+                    if self.traceLevel >= TraceLevel.EVENTS:
+                        self.trace(TraceLevel.EVENTS, 'taskStolen', core=core + 1, num=nextTask.num)
                 
                 if nextTask not in self.runningTasks:
                     self.runningTasks.append(nextTask)
@@ -113,14 +209,19 @@ class OS:
                 if nextTask.type == TypeTask.INOUT and nextTask not in self.ioWaitTasks:
                     self.ioWaitTasks.append(nextTask)
                     
-                self.output(f"Round Robin: переключение на задачу {nextTask.num} ({nextTask.type.value})")
+                if self.traceLevel >= TraceLevel.EVENTS:
+                    self.trace(TraceLevel.EVENTS, 'rrSwitch', num=nextTask.num, type=nextTask.type.value)
             else:
                 if currentTask and currentTask.state != StateTask.READY:
-                    self.output(f"Round Robin: нет новых задач, продолжаем выполнение задачи {currentTask.num}")
+                    if self.traceLevel >= TraceLevel.EVENTS:
+                        self.trace(TraceLevel.EVENTS, 'rrContinue', num=currentTask.num)
                 else:
-                    self.output("Round Robin: нет доступных задач для выполнения")
-                    self.cpu.currentTask = None
-                    self.cpu.state = StateCPU.IDLE
+                    if self.traceLevel >= TraceLevel.EVENTS:
+                        self.trace(TraceLevel.EVENTS, 'rrNoTasks')
+                    if currentTask:
+                        self.coreTasks.pop(id(currentTask), None)
+                    cpu.currentTask = None
+                    cpu.state = StateCPU.IDLE
     
     #выполнение одного такта с Round Robin
     def runTact(self):
@@ -131,101 +232,175 @@ class OS:
         self.loadTasksToMemory()
         
         self.roundRobinSchedule()
-        if self.cpu.currentTask:
-            self.executeCurrentTask()
+        for core, cpu in enumerate(self.cpus):
+            if cpu.currentTask:
+                self.executeCurrentTask(core)
+        if self.devices:
+            self.serviceIo()
             
         self.manageCpuStates()
+        self.manageCoreStates()
         
         self.collectStatistics()
         
-        if self.currentTact % 50 == 0 or self.currentTact <= 5:
-            if self.outputCallback:
-                usedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
-                completed = len(self.readyQueue)
-                total = len(self.packet.tasks) if self.packet else 0
-                
-                info = f"Такт {self.currentTact}: завершено {completed}/{total}, " \
-                    f"память {usedBlocks}/{self.maxBlocksCount}"
-                
-                if self.cpu.currentTask:
-                    info += f", задача {self.cpu.currentTask.num}"
-                
-                self.outputCallback(info)
+        if self.traceLevel >= TraceLevel.INFO and (self.currentTact % 50 == 0 or self.currentTact <= 5):
+            self.trace(TraceLevel.INFO, 'progress',
+                       tact=self.currentTact,
+                       completed=self.completedCount,
+                       total=self.packet.getTasksCount() if self.packet else 0,
+                       used=self.memoryBlocks.usedCount(),
+                       blocks=self.maxBlocksCount,
+                       current=f", задача {self.cpu.currentTask.num}" if self.cpu.currentTask else "")
     
-    #выполнение только текущей задачи (выбранной Round Robin) - ИСПРАВЛЕННЫЙ МЕТОД
-    def executeCurrentTask(self):
-        if not self.cpu.currentTask:
-            self.output("Нет активной задачи для выполнения")
+    #выполнение только текущей задачи ядра (выбранной Round Robin) - ИСПРАВЛЕННЫЙ МЕТОД
+    def executeCurrentTask(self, core: int = 0):
+        cpu = self.cpus[core]
+        if not cpu.currentTask:
+            if self.traceLevel >= TraceLevel.DEBUG:
+                self.trace(TraceLevel.DEBUG, 'noActiveTask')
             return
             
-        if self.cpu.currentTask.state == StateTask.RUN:
-            task_num = self.cpu.currentTask.num
-            task_type = self.cpu.currentTask.type.value
-            current_task_ref = self.cpu.currentTask 
+        if cpu.currentTask.state == StateTask.RUN:
+            current_task_ref = cpu.currentTask 
             
-            completed = self.cpu.executeTick()
+            completed = cpu.executeTick()
+            self.coreStatistics[core]['busyTacts'] += 1
             
             if completed:
-                self.output(f"Задача {task_num} ({task_type}) завершена!")
-
-                if current_task_ref in self.runningTasks:
-                    self.runningTasks.remove(current_task_ref)
-                if current_task_ref in self.ioWaitTasks:
-                    self.ioWaitTasks.remove(current_task_ref)
-                    
-                if self.packet:
-                    self.packet.removeCompletedTask(current_task_ref)
-                    
-                for i, task in enumerate(self.memoryBlocks):
-                    if task == current_task_ref:
-                        self.memoryBlocks[i] = None
-                        break
-                
-                self.readyQueue.append(current_task_ref)
+                self.coreStatistics[core]['completed'] += 1
+                self.finishTask(current_task_ref)
                 
-            else:
-                if self.cpu.currentTask:
-                    self.output(f"Задача {self.cpu.currentTask.num} ({self.cpu.currentTask.type.value}) выполняется: "
-                            f"{self.cpu.currentTask.executionTime}/{self.cpu.currentTask.requiredTime} тактов, "
-                            f"квант: {self.cpu.remainingQuantum}")
+            elif self.traceLevel >= TraceLevel.DEBUG:
+                if cpu.currentTask:
+                    self.trace(TraceLevel.DEBUG, 'taskRunning',
+                               num=cpu.currentTask.num,
+                               type=cpu.currentTask.type.value,
+                               executed=cpu.currentTask.executionTime,
+                               required=cpu.currentTask.requiredTime,
+                               quantum=cpu.remainingQuantum)
                 else:
-                    self.output(f"Задача {task_num} ({task_type}) была вытеснена")
-        elif self.cpu.currentTask:
-            self.output(f"Задача {self.cpu.currentTask.num} в состоянии {self.cpu.currentTask.state.value}")
-        else:
-            self.output("Нет активной задачи для выполнения")
+                    self.trace(TraceLevel.DEBUG, 'taskPreempted', num=current_task_ref.num, type=current_task_ref.type.value)
+        elif self.traceLevel >= TraceLevel.DEBUG:
+            self.trace(TraceLevel.DEBUG, 'taskState', num=cpu.currentTask.num, state=cpu.currentTask.state.value)
+    
+    #учет задачи, выполнение которой завершилось на ядре или на устройстве ввода-вывода
+    def finishTask(self, task: Task):
+        self.coreTasks.pop(id(task), None)
+        if self.traceLevel >= TraceLevel.EVENTS:
+            self.trace(TraceLevel.EVENTS, 'taskCompleted', num=task.num, type=task.type.value)
+
+        if task in self.runningTasks:
+            self.runningTasks.remove(task)
+        if task in self.ioWaitTasks:
+            self.ioWaitTasks.remove(task)
+            
+        if self.packet:
+            self.packet.removeCompletedTask(task)
+            
+        self.memoryBlocks.release(task)
+        
+        self.completeTask(task)
+        self.countTurnaround(task)
+    
+    #передача INOUT задачи наименее загруженному устройству ввода-вывода
+    def submitIo(self, task: Task):
+        device = min(self.devices, key=IoDevice.load)
+        device.submit(task)
+        self.coreTasks[id(task)] = IO_CORE
+        
+        if task not in self.runningTasks:
+            self.runningTasks.append(task)
+        if task not in self.ioWaitTasks:
+            self.ioWaitTasks.append(task)
+            
+        if self.traceLevel >= TraceLevel.EVENTS:
+            self.trace(TraceLevel.EVENTS, 'ioSubmitted', num=task.num, device=self.devices.index(device) + 1,
+                       queue=device.load())
+    
+    #такт устройств ввода-вывода: обслуженные задачи завершаются
+    def serviceIo(self):
+        for device in self.devices:
+            task = device.tick()
+            if task:
+                self.finishTask(task)
     
     #загрузка задачи в раздел с добавлением в очередь Round Robin
     def loadTasksToMemory(self) -> bool:
         loaded = False
     
-        for i in range(len(self.memoryBlocks)):
-            if self.memoryBlocks[i] is None and self.waitQueue:
-                task = self.waitQueue.pop(0)
-                self.memoryBlocks[i] = task
-                self.output(f"Задача {task.num} ({task.type.value}) загружена в раздел {i+1}")
-                loaded = True
-                
-                if self.packet and task not in self.packet.roundRobinQueue:
-                    self.packet.roundRobinQueue.append(task)
-                
-                currentUsedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
-                if currentUsedBlocks > self.maxBlocksCount:
-                    self.output(f"ПРЕДУПРЕЖДЕНИЕ: Превышено максимальное количество разделов! "
-                               f"({currentUsedBlocks} > {self.maxBlocksCount})")                   
+        while self.memoryBlocks.hasFree() and (self.waitQueue or self.pullTask()):
+            task = self.packet.taskOf(self.waitQueue[0])
+            if not self.memoryBlocks.fits(task):
+                if self.memoryBlocks.admissible(task):
+                    break
+                self.waitQueue.popleft()
+                self.rejectTask(task)
+                continue
+            self.waitQueue.popleft()
+            i = self.memoryBlocks.load(task)
+            if self.placement:
+                self.countAdmission()
+            if self.traceLevel >= TraceLevel.EVENTS:
+                self.trace(TraceLevel.EVENTS, 'taskLoaded', num=task.num, type=task.type.value, block=i + 1)
+            loaded = True
+            
+            if self.packet and not self.packet.isQueued(task):
+                self.packet.roundRobinQueue.append(task)
+            
+            currentUsedBlocks = self.memoryBlocks.usedCount()
+            if currentUsedBlocks > self.maxBlocksCount and self.traceLevel >= TraceLevel.EVENTS:
+                self.trace(TraceLevel.EVENTS, 'blocksExceeded', used=currentUsedBlocks, blocks=self.maxBlocksCount)
         return loaded
     
+    #учет времени оборота и ожидания: все задачи пакета поступают к началу симуляции
+    def countTurnaround(self, task: Task):
+        waiting = self.currentTact - task.executionTime
+        self.schedulingStatistics['completed'] += 1
+        self.schedulingStatistics['totalTurnaround'] += self.currentTact
+        self.schedulingStatistics['totalWaiting'] += waiting
+        self.schedulingStatistics['maxWaiting'] = max(self.schedulingStatistics['maxWaiting'], waiting)
+    
+    #учет задержки допуска: все задачи пакета поступают к началу симуляции
+    def countAdmission(self):
+        self.memoryStatistics['admitted'] += 1
+        self.memoryStatistics['totalLatency'] += self.currentTact
+        self.memoryStatistics['maxLatency'] = max(self.memoryStatistics['maxLatency'], self.currentTact)
+    
+    #задача, которая больше всей оперативной памяти, не загружается никогда
+    def rejectTask(self, task: Task):
+        self.memoryStatistics['rejected'] += 1
+        if self.traceLevel >= TraceLevel.EVENTS:
+            self.trace(TraceLevel.EVENTS, 'taskRejected', num=task.num, memory=task.memory,
+                       capacity=self.ramCapacity())
+    
+    #чтение следующей задачи из потока пакета в очередь ожидания
+    def pullTask(self) -> bool:
+        if self.taskSource is None:
+            return False
+        task = next(self.taskSource, None)
+        if task is None:
+            self.taskSource = None
+            return False
+        self.waitQueue.append(task)
+        self.pulledTasks += 1
+        return True
+    
+    #учет завершенной задачи; в потоковом режиме задачи не сохраняются, чтобы память не росла
+    def completeTask(self, task: Task):
+        self.completedCount += 1
+        if not self.streaming:
+            self.readyQueue.append(self.packet.entryOf(task) if self.packet else task)
+    
     #сбор статистики с учетом Round Robin
     def collectStatistics(self):
-        usedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
+        usedBlocks = self.memoryBlocks.usedCount()
         self.history['memoryBlocksUsed'].append(usedBlocks)
         
-        currentState = self.cpu.state.value
-        self.history['cpuStates'].append(currentState)
+        self.history['cpuStates'].append(CPU_STATE_CODES[self.cpu.state])
         
         waitCount = len(self.waitQueue)
-        runCount = len([task for task in self.runningTasks if task.state == StateTask.RUN])
-        readyCount = len(self.readyQueue)
+        runCount = self.runningTasks.runCount()
+        readyCount = self.completedCount
         
         self.history['taskStates']['WAIT'].append(waitCount)
         self.history['taskStates']['RUN'].append(runCount)
@@ -246,14 +421,180 @@ class OS:
                             max(1, self.rrStatistics['contextSwitches'])) * 100
                 self.rrStatistics['quantumEfficiency'].append(efficiency)
                 
+        if self.placement:
+            self.memoryStatistics['fragmentation'].append(self.memoryBlocks.allocator.fragmentation())
+            self.memoryStatistics['freeMemory'].append(self.memoryBlocks.allocator.freeMemory)
+                
         currentState = self.cpu.state.value
         if currentState in self.cpuStateCounts:
             self.cpuStateCounts[currentState] += 1
+        
+        for cpu, statistics in zip(self.cpus, self.coreStatistics):
+            statistics['stateCounts'][cpu.state.value] += 1
+    
+    #сбор статистики сразу за несколько тактов с неизменным состоянием системы
+    def collectRepeatedStatistics(self, count: int):
+        firstTact = self.currentTact - count + 1
+        usedBlocks = self.memoryBlocks.usedCount()
+        currentState = self.cpu.state.value
+        runCount = self.runningTasks.runCount()
+        freeMemoryPercent = max(0, 100 - (usedBlocks / self.maxBlocksCount) * 100)
+        
+        self.history['memoryBlocksUsed'].fill(usedBlocks, count)
+        self.history['cpuStates'].fill(CPU_STATE_CODES[self.cpu.state], count)
+        self.history['taskStates']['WAIT'].fill(len(self.waitQueue), count)
+        self.history['taskStates']['RUN'].fill(runCount, count)
+        self.history['taskStates']['READY'].fill(self.completedCount, count)
+        self.history['memoryUsage'].fill(freeMemoryPercent, count)
+        self.history['tacts'].extend(range(firstTact, self.currentTact + 1))
+        
+        if self.packet:
+            self.history['rrQueueLength'].fill(self.packet.getRrQueueLength(), count)
+            efficiency = (self.rrStatistics['tasksCompletedInQuantum'] / 
+                        max(1, self.rrStatistics['contextSwitches'])) * 100
+            self.rrStatistics['quantumEfficiency'].fill(efficiency, count)
+        
+        if self.placement:
+            self.memoryStatistics['fragmentation'].fill(self.memoryBlocks.allocator.fragmentation(), count)
+            self.memoryStatistics['freeMemory'].fill(self.memoryBlocks.allocator.freeMemory, count)
+        
+        #состояние учитывается дважды за такт: в manageCpuStates и в collectStatistics
+        if currentState in self.cpuStateCounts:
+            self.cpuStateCounts[currentState] += 2 * count
+        
+        for cpu, statistics in zip(self.cpus, self.coreStatistics):
+            statistics['stateCounts'][cpu.state.value] += count
+    
+    #проверка, что следующие такты не изменят загрузку памяти и состояние процессора
+    def isSteady(self) -> bool:
+        if (self.waitQueue or self.taskSource) and self.memoryBlocks.hasFree():
+            #задача в начале очереди, ожидающая освобождения ram, не загрузится до завершения другой задачи
+            if not self.waitQueue:
+                return False
+            task = self.packet.taskOf(self.waitQueue[0])
+            if self.memoryBlocks.fits(task) or not self.memoryBlocks.admissible(task):
+                return False
+        if self.memoryBlocks.hasCompleted():
+            return False
+        return self.isCpuStateSettled()
+    
+    #проверка, что manageCpuStates и manageCoreStates оставят состояния ядер без изменений
+    def isCpuStateSettled(self) -> bool:
+        overloaded = self.memoryBlocks.usedCount() > self.maxBlocksCount
+        if any(cpu.isOverloaded() != overloaded for cpu in self.cpus[1:]):
+            return False
+        
+        if overloaded:
+            return self.cpu.state == StateCPU.OVERLOADED
+        
+        hasMath = self.runningTasks.runCount(TypeTask.MATH) > 0
+        hasInOut = self.runningTasks.runCount(TypeTask.INOUT) > 0
+        
+        if self.cpu.state == StateCPU.IDLE:
+            return not hasMath and not hasInOut
+        if self.cpu.state == StateCPU.EXECUTING:
+            return hasMath
+        if self.cpu.state == StateCPU.IO_WAIT:
+            return hasInOut
+        return False
+    
+    #ближайшие события планировщика на всех ядрах и устройствах ввода-вывода
+    def getUpcomingEvents(self) -> list:
+        events = []
+        for core, cpu in enumerate(self.cpus):
+            events.extend(self.getCoreEvents(core, cpu))
+        for device in self.devices:
+            tact = device.nextEvent(self.currentTact)
+            if tact is not None:
+                events.append((tact, 'io'))
+        return events
+    
+    #ближайшие события ядра: переключение, истечение кванта, завершение текущей задачи
+    def getCoreEvents(self, core: int, cpu: CPU) -> list:
+        task = cpu.currentTask
+        
+        if task is None:
+            if (cpu.state == StateCPU.IDLE or self.devices) and self.packet and self.packet.hasQueuedTasks():
+                return [(self.currentTact + 1, 'schedule')]
+            return []
+        
+        if task.state != StateTask.RUN:
+            return [(self.currentTact + 1, 'schedule')]
+        
+        events = [(self.currentTact + task.getRemainingTime(), 'completion')]
+        if not self.packet or self.packet.queueFor(core).usesQuantum:
+            events.append((self.currentTact + 1 + cpu.remainingQuantum, 'quantum'))
+        return events
+    
+    #продвижение системы на несколько тактов без событий
+    def advanceSteadyTacts(self, count: int):
+        if count <= 0:
+            return
+        
+        for cpu, statistics in zip(self.cpus, self.coreStatistics):
+            if cpu.currentTask:
+                cpu.currentTask.executionTime += count
+                cpu.currentTask.remainingQuantum = max(0, cpu.currentTask.remainingQuantum - count)
+                cpu.remainingQuantum = max(0, cpu.remainingQuantum - count)
+                cpu.clockCounter += count
+                statistics['busyTacts'] += count
+        for device in self.devices:
+            device.advanceSteady(count)
+        
+        task = self.cpu.currentTask
+        
+        firstTact = self.currentTact + 1
+        self.currentTact += count
+        self.collectRepeatedStatistics(count)
+        self.compressedStretches.append((firstTact, count))
+        
+        if self.traceLevel >= TraceLevel.INFO:
+            self.trace(TraceLevel.INFO, 'steadyStretch',
+                       first=firstTact,
+                       last=self.currentTact,
+                       current=f", задача {task.num} выполняется: {task.executionTime}/{task.requiredTime} тактов" if task else "")
     
     #получение статистики Round Robin
     def getRoundRobinStatistics(self):
         return self.rrStatistics.copy()
     
+    #получение статистики ядер с долей тактов, в которые ядро выполняло задачу
+    def getCoreStatistics(self) -> list:
+        coreStatistics = []
+        for statistics in self.coreStatistics:
+            statistics = dict(statistics, stateCounts=statistics['stateCounts'].copy())
+            statistics['utilization'] = statistics['busyTacts'] / max(1, self.currentTact)
+            coreStatistics.append(statistics)
+        return coreStatistics
+    
+    #получение статистики устройств ввода-вывода: обслуженные запросы, занятость и средняя длина очереди
+    def getIoStatistics(self) -> dict:
+        tacts = max(1, self.currentTact)
+        return {
+            'devices': len(self.devices),
+            'serviceTime': self.ioServiceTime,
+            'served': [device.servedCount for device in self.devices],
+            'busyTacts': [device.busyTacts for device in self.devices],
+            'utilization': [device.busyTacts / tacts for device in self.devices],
+            'meanQueueLength': [device.queueTacts / tacts for device in self.devices]
+        }
+    
+    #получение статистики планирования со средними временами оборота и ожидания
+    def getSchedulingStatistics(self) -> dict:
+        statistics = self.schedulingStatistics.copy()
+        completed = max(1, statistics['completed'])
+        statistics['meanTurnaround'] = statistics['totalTurnaround'] / completed
+        statistics['meanWaiting'] = statistics['totalWaiting'] / completed
+        return statistics
+    
+    #получение статистики размещения в оперативной памяти со средней задержкой допуска
+    def getMemoryStatistics(self) -> dict:
+        statistics = self.memoryStatistics.copy()
+        statistics['meanLatency'] = statistics['totalLatency'] / max(1, statistics['admitted'])
+        if self.placement:
+            statistics['internalWaste'] = self.memoryBlocks.allocator.internalWaste()
+        return statistics
+    
     #изменение количества разделов памяти
     def changeMemoryBlocksCount(self, newCount: int):
         if newCount <= 0:
@@ -262,34 +603,36 @@ class OS:
         oldCount = self.maxBlocksCount
         self.maxBlocksCount = newCount
         
-        currentTasks = [task for task in self.memoryBlocks if task is not None]
+        currentTasks = [task for _, task in self.memoryBlocks.occupied()]
         
-        newMemoryBlocks = [None] * newCount
+        newMemoryBlocks = self.createMemoryBlocks(newCount)
         
-        tasksToKeep = min(len(currentTasks), newCount)
-        for i in range(tasksToKeep):
-            newMemoryBlocks[i] = currentTasks[i]
+        returnedTasks = []
+        for task in currentTasks:
+            if newMemoryBlocks.hasFree() and newMemoryBlocks.fits(task):
+                newMemoryBlocks.load(task)
+            else:
+                returnedTasks.append(task)
             
-        for i in range(tasksToKeep, len(currentTasks)):
-            task = currentTasks[i]
+        for task in returnedTasks:
             if task in self.runningTasks:
                 self.runningTasks.remove(task)
             if task in self.ioWaitTasks:
                 self.ioWaitTasks.remove(task)
-            self.waitQueue.insert(0, task)  
+            self.waitQueue.appendleft(self.packet.entryOf(task))
         
-        self.memoryBlocks = newMemoryBlocks
+        self.setMemoryBlocks(newMemoryBlocks)
         
         self.updateCpuStateAfterMemoryChange()
         
-        if self.outputCallback:
-            self.output(f"Изменено количество разделов памяти: {oldCount} -> {newCount}")
-            if len(currentTasks) > newCount:
-                self.output(f"Возвращено в очередь: {len(currentTasks) - newCount} задач")
+        if self.traceLevel >= TraceLevel.INFO:
+            self.trace(TraceLevel.INFO, 'blocksChanged', old=oldCount, new=newCount)
+            if returnedTasks:
+                self.trace(TraceLevel.INFO, 'tasksReturned', count=len(returnedTasks))
     
     #обновление состояния процессора после изменения настроек памяти
     def updateCpuStateAfterMemoryChange(self):
-        usedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
+        usedBlocks = self.memoryBlocks.usedCount()
         
         if usedBlocks > self.maxBlocksCount:
             self.changeCpuState(StateCPU.OVERLOADED, "(перегрузка после изменения памяти)")
@@ -309,6 +652,32 @@ class OS:
     #установка функции обратного вызова для вывода информации
     def setOutputCallback(self, callback: Callable[[str], None]):
         self.outputCallback = callback
+        self.updateTraceLevel()
+    
+    #установка получателя структурированных событий трассировки
+    def setTraceCallback(self, callback: Callable[[TraceEvent], None]):
+        self.traceCallback = callback
+        self.updateTraceLevel()
+    
+    #установка уровня подробности трассировки
+    def setVerbosity(self, level: TraceLevel):
+        self.verbosity = TraceLevel(level)
+        self.updateTraceLevel()
+    
+    #пересчет действующего уровня: без получателей трассировка ничего не стоит
+    def updateTraceLevel(self):
+        if self.outputCallback or self.traceCallback:
+            self.traceLevel = self.verbosity
+        else:
+            self.traceLevel = TraceLevel.OFF
+    
+    #отправка события трассировки; вызывается только после проверки self.traceLevel
+    def trace(self, level: TraceLevel, kind: str, **fields):
+        event = TraceEvent(self.currentTact, level, kind, fields)
+        if self.traceCallback:
+            self.traceCallback(event)
+        if self.outputCallback:
+            self.output(event.format())
     
     #вывод сообщения через установленный флаг
     def output(self, message: str):
@@ -319,16 +688,20 @@ class OS:
                 print(f"Ошибка вывода: {e}")
     
     #изменение состояние процессора с выводом информации о переходе из одного состояния в другое
-    def changeCpuState(self, newState: StateCPU, reason: str = ""):
+    #причина задается шаблоном, который форматируется только при включенной трассировке
+    def changeCpuState(self, newState: StateCPU, reason: str = "", **reasonFields):
         oldState = self.cpu.state
         if oldState != newState:
             self.cpu.state = newState
-            self.output(f"ПЕРЕКЛЮЧЕНИЕ CPU: {oldState.value} -> {newState.value} {reason}")
+            if self.traceLevel >= TraceLevel.EVENTS:
+                self.trace(TraceLevel.EVENTS, 'cpuSwitch', old=oldState.value, new=newState.value,
+                           reason=reason.format(**reasonFields) if reasonFields else reason)
             
-            currentUsedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
-            mathCount = len([task for task in self.runningTasks if task.type == TypeTask.MATH and task.state == StateTask.RUN])
-            ioCount = len([task for task in self.runningTasks if task.type == TypeTask.INOUT and task.state == StateTask.RUN])
-            self.output(f"Отладочная информация: Используется разделов={currentUsedBlocks}/{self.maxBlocksCount}, MATH={mathCount}, INOUT={ioCount}")
+            if self.traceLevel >= TraceLevel.DEBUG:
+                mathCount = self.runningTasks.runCount(TypeTask.MATH)
+                ioCount = self.runningTasks.runCount(TypeTask.INOUT)
+                self.trace(TraceLevel.DEBUG, 'cpuDebug', used=self.memoryBlocks.usedCount(), blocks=self.maxBlocksCount,
+                           math=mathCount, inout=ioCount)
     
     #возвращение счетчика состояний процессора для графика
     def getCpuStateCounts(self):
@@ -350,26 +723,35 @@ class OS:
         if currentState in self.cpuStateCounts:
             self.cpuStateCounts[currentState] += 1
 
+    #состояние дополнительных ядер задается их текущей задачей, а при перегрузке памяти - перегрузкой
+    def manageCoreStates(self):
+        overloaded = self.memoryBlocks.usedCount() > self.maxBlocksCount
+        for cpu in self.cpus[1:]:
+            if overloaded:
+                cpu.setOverloadedState()
+            elif cpu.isOverloaded():
+                cpu.clearOverloadedState()
+
     #проверка перегрузки системы
     def checkOverload(self):
-        currentUsedBlocks = sum(1 for block in self.memoryBlocks if block is not None)
+        currentUsedBlocks = self.memoryBlocks.usedCount()
     
         if currentUsedBlocks > self.maxBlocksCount:
             if self.cpu.state != StateCPU.OVERLOADED:
-                self.changeCpuState(StateCPU.OVERLOADED, 
-                                f"(перегрузка памяти: {currentUsedBlocks} > {self.maxBlocksCount} разделов)")
+                self.changeCpuState(StateCPU.OVERLOADED, "(перегрузка памяти: {used} > {blocks} разделов)",
+                                    used=currentUsedBlocks, blocks=self.maxBlocksCount)
         else:
             if self.cpu.state == StateCPU.OVERLOADED:
                 self.changeToNormalState()
 
     #возвращение процессора в нормальное состояние
     def changeToNormalState(self):
-        mathTasks = [task for task in self.runningTasks if task.type == TypeTask.MATH and task.state == StateTask.RUN]
-        ioTasks = [task for task in self.runningTasks if task.type == TypeTask.INOUT and task.state == StateTask.RUN]
+        mathCount = self.runningTasks.runCount(TypeTask.MATH)
+        ioCount = self.runningTasks.runCount(TypeTask.INOUT)
         
-        if mathTasks:
+        if mathCount:
             self.changeCpuState(StateCPU.EXECUTING, "(система восстановилась, есть MATH задачи)")
-        elif ioTasks:
+        elif ioCount:
             self.changeCpuState(StateCPU.IO_WAIT, "(система восстановилась, есть INOUT задачи)")
         else:
             self.changeCpuState(StateCPU.IDLE, "(система восстановилась, нет активных задач)")
@@ -380,13 +762,13 @@ class OS:
         if self.cpu.state == StateCPU.OVERLOADED:
             return
         
-        mathTasks = [task for task in self.runningTasks if task.type == TypeTask.MATH and task.state == StateTask.RUN]
-        ioTasks = [task for task in self.runningTasks if task.type == TypeTask.INOUT and task.state == StateTask.RUN]
+        mathCount = self.runningTasks.runCount(TypeTask.MATH)
+        ioCount = self.runningTasks.runCount(TypeTask.INOUT)
         
-        if mathTasks:
-            self.changeCpuState(StateCPU.EXECUTING, f"(найдены {len(mathTasks)} активных MATH задач)")
-        elif ioTasks:
-            self.changeCpuState(StateCPU.IO_WAIT, f"(найдены {len(ioTasks)} активных INOUT задач)")
+        if mathCount:
+            self.changeCpuState(StateCPU.EXECUTING, "(найдены {count} активных MATH задач)", count=mathCount)
+        elif ioCount:
+            self.changeCpuState(StateCPU.IO_WAIT, "(найдены {count} активных INOUT задач)", count=ioCount)
 
     #обработка состояния выполнения вычислений
     def handleExecutingState(self):
@@ -394,12 +776,12 @@ class OS:
         if self.cpu.state == StateCPU.OVERLOADED:
             return
         
-        mathTasks = [task for task in self.runningTasks if task.type == TypeTask.MATH and task.state == StateTask.RUN]
-        ioTasks = [task for task in self.runningTasks if task.type == TypeTask.INOUT and task.state == StateTask.RUN]
+        mathCount = self.runningTasks.runCount(TypeTask.MATH)
+        ioCount = self.runningTasks.runCount(TypeTask.INOUT)
         
-        if not mathTasks and ioTasks:
+        if not mathCount and ioCount:
             self.changeCpuState(StateCPU.IO_WAIT, "(MATH задачи завершены, есть активные INOUT)")
-        elif not mathTasks and not ioTasks:
+        elif not mathCount and not ioCount:
             self.changeCpuState(StateCPU.IDLE, "(все активные задачи завершены)")
 
     #обработка состояния выполнения ввода/вывода
@@ -408,27 +790,27 @@ class OS:
         if self.cpu.state == StateCPU.OVERLOADED:
             return
         
-        ioTasks = [task for task in self.runningTasks if task.type == TypeTask.INOUT and task.state == StateTask.RUN]
-        mathTasks = [task for task in self.runningTasks if task.type == TypeTask.MATH and task.state == StateTask.RUN]
+        ioCount = self.runningTasks.runCount(TypeTask.INOUT)
+        mathCount = self.runningTasks.runCount(TypeTask.MATH)
         
-        if not ioTasks and mathTasks:
+        if not ioCount and mathCount:
             self.changeCpuState(StateCPU.EXECUTING, "(INOUT задачи завершены, есть активные MATH)")
-        elif not ioTasks and not mathTasks:
+        elif not ioCount and not mathCount:
             self.changeCpuState(StateCPU.IDLE, "(все активные задачи завершены)")
     
     #освобождение разделов памяти
     def freeCompletedTasks(self) -> bool:
         freed = False
-        for i, task in enumerate(self.memoryBlocks):
-            if task and task.state == StateTask.READY:
-                self.output(f"Задача {task.num} завершена, освобождается раздел {i+1}")
-                self.memoryBlocks[i] = None
-                if task in self.runningTasks:
-                    self.runningTasks.remove(task)
-                if task in self.ioWaitTasks:
-                    self.ioWaitTasks.remove(task)
-                self.readyQueue.append(task)
-                freed = True
+        for i in self.memoryBlocks.completedIndexes():
+            task = self.memoryBlocks.free(i)
+            if self.traceLevel >= TraceLevel.EVENTS:
+                self.trace(TraceLevel.EVENTS, 'taskFreed', num=task.num, block=i + 1)
+            if task in self.runningTasks:
+                self.runningTasks.remove(task)
+            if task in self.ioWaitTasks:
+                self.ioWaitTasks.remove(task)
+            self.completeTask(task)
+            freed = True
         return freed
     
     #выполнение задачи в разделе памяти (старый метод, оставляем для совместимости)
@@ -436,7 +818,8 @@ class OS:
         for i, task in enumerate(self.memoryBlocks):
             if task and task.state == StateTask.WAIT:
                 self.cpu.useToDoTask(task)
-                self.output(f"Начато выполнение задачи {task.num} ({task.type.value}) в разделе {i+1}")
+                if self.traceLevel >= TraceLevel.EVENTS:
+                    self.trace(TraceLevel.EVENTS, 'taskStarted', num=task.num, type=task.type.value, block=i + 1)
                 
                 if task.type == TypeTask.INOUT:
                     self.ioWaitTasks.append(task)
@@ -445,43 +828,47 @@ class OS:
             
             elif task and task.state == StateTask.RUN:
                 completed = task.execute()
-                self.output(f"Задача {task.num} ({task.type.value}) выполняется: {task.executionTime}/{task.requiredTime} тактов")
+                if self.traceLevel >= TraceLevel.DEBUG:
+                    self.trace(TraceLevel.DEBUG, 'taskProgress', num=task.num, type=task.type.value,
+                               executed=task.executionTime, required=task.requiredTime)
                 
                 if completed:
-                    self.output(f"Задача {task.num} ({task.type.value}) завершена!")
+                    if self.traceLevel >= TraceLevel.EVENTS:
+                        self.trace(TraceLevel.EVENTS, 'taskCompleted', num=task.num, type=task.type.value)
                     if task in self.ioWaitTasks:
                         self.ioWaitTasks.remove(task)
     
     #сброс состояния ОС к начальному (для перезапуска программы)
     def reset(self):
         if self.packet:
-            self.waitQueue = self.packet.tasks.copy()
+            self.waitQueue = deque(self.packet.taskEntries())
         else:
-            self.waitQueue = []
+            self.waitQueue = deque()
+        
+        if self.streaming and self.packet:
+            self.taskSource = self.packet.openStream()
+            self.pulledTasks = 0
+            self.packet.roundRobinQueue.clear()
         
         self.readyQueue = []
-        self.runningTasks = []
-        self.ioWaitTasks = []
+        self.completedCount = 0
+        self.createTaskSets()
         
-        self.memoryBlocks = [None] * self.maxBlocksCount
+        self.setMemoryBlocks(self.createMemoryBlocks(self.maxBlocksCount))
+        self.memoryStatistics = createMemoryStatistics(self.placement, self.ramCapacity())
         
         self.cpu.state = StateCPU.IDLE
         self.cpu.currentTask = None
+        self.createCores()
+        self.createIoDevices()
         
         self.currentTact = 0
+        self.compressedStretches = []
         
-        self.history = {
-            'tacts': [],
-            'memoryBlocksUsed': [],
-            'cpuStates': [],
-            'taskStates': {'WAIT': [], 'RUN': [], 'READY': []},
-            'memoryUsage': [],
-            'taskTypes': {
-                'MATH': self.packet.getMathTasks() if self.packet else 0,
-                'INOUT': self.packet.getInOutTasks() if self.packet else 0
-            },
-            'rrQueueLength': []
-        }
+        self.history = createHistory(
+            self.packet.getMathTasks() if self.packet else 0,
+            self.packet.getInOutTasks() if self.packet else 0
+        )
         
         self.cpuStateCounts = {
             "ПРОСТОЙ": 0,
@@ -490,28 +877,44 @@ class OS:
             "ПЕРЕГРУЗКА": 0
         }
         
-        self.rrStatistics = {
-            'contextSwitches': 0,
-            'quantumExhaustions': 0,
-            'tasksCompletedInQuantum': 0,
-            'rrQueueLengthHistory': [],
-            'quantumEfficiency': []
-        }
+        self.rrStatistics = createRrStatistics()
+        self.schedulingStatistics = createSchedulingStatistics(self.scheduler)
         
         if self.packet:
             for task in self.packet.tasks:
-                task.state = StateTask.WAIT
-                task.executionTime = 0
-                task.remainingQuantum = 0
-                task.contextSwitches = 0
+                task.resetTask()
         
-        self.output("Система сброшена в начальное состояние")
+        if self.traceLevel >= TraceLevel.INFO:
+            self.trace(TraceLevel.INFO, 'reset')
+    
+    #состояние для контрольной точки: получатели вывода и обертки методов (профилирование) не сохраняются,
+    #поток пакета заменяется числом прочитанных задач, а словарь выполняемых задач по id - парами (задача, ядро)
+    def __getstate__(self):
+        state = {key: value for key, value in self.__dict__.items() if not callable(getattr(type(self), key, None))}
+        state['outputCallback'] = None
+        state['traceCallback'] = None
+        state['taskSource'] = self.taskSource is not None
+        tasks = {id(cpu.currentTask): cpu.currentTask for cpu in self.cpus if cpu.currentTask}
+        for device in self.devices:
+            tasks.update((id(task), task) for task in device.queue)
+            if device.currentTask:
+                tasks[id(device.currentTask)] = device.currentTask
+        state['coreTasks'] = [(tasks[key], core) for key, core in self.coreTasks.items()]
+        return state
+    
+    #восстановление из контрольной точки: чтение потока пакета продолжается с места остановки
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.coreTasks = {id(task): core for task, core in state['coreTasks']}
+        self.taskSource = self.packet.resumeStream(self.pulledTasks) if state['taskSource'] else None
+        self.updateTraceLevel()
     
     #проверка условий завершения симуляции
     def isSimulationComplete(self) -> bool:
         return (
             len(self.waitQueue) == 0 and 
+            self.taskSource is None and
             len(self.runningTasks) == 0 and 
             len(self.ioWaitTasks) == 0 and
-            all(task is None or task.state.value == "ВЫПОЛНЕНА" for task in self.memoryBlocks)
+            all(task.state == StateTask.READY for task in self.memoryBlocks.tasks())
         )
\ No newline at end of file
@@ -1,7 +1,11 @@
 #пакет
-from task import Task, TypeTask, StateTask
+from task import Task, TypeTask, StateTask, REQUIRED_TIME
+from tasktable import TaskTable, TaskEntries
+from scheduler import RoundRobinQueue, ReadyQueue, createScheduler
+from binpacket import BinaryPacketFile, isBinaryPacket, iterBinaryTasks
 from enum import Enum
 from dataclasses import dataclass, field
+import itertools
 import json
 
 #тип пакета
@@ -11,43 +15,229 @@ class TypePacket(Enum):
     EQUALS_PACK = "РАВНЫЙ ПО КОЛ-ВУ"
     BALANCED_PACK = "СБАЛАНСИРОВАННЫЙ"
 
+#список задач пакета: порядок добавления сохраняется, поиск по номеру и удаление за O(1)
+class TaskList:
+    #конструктор
+    def __init__(self, tasks=()):
+        self.entries = {}  #id задачи -> задача, в порядке добавления
+        self.byNum = {}  #номер -> задачи с этим номером в порядке добавления
+        for task in tasks:
+            self.append(task)
+    
+    #добавление задачи в конец списка
+    def append(self, task: Task):
+        self.entries[id(task)] = task
+        self.byNum.setdefault(task.num, []).append(task)
+    
+    #удаление задачи
+    def remove(self, task: Task):
+        if self.entries.pop(id(task), None) is None:
+            raise ValueError("задача отсутствует в пакете")
+        sameNum = self.byNum[task.num]
+        if len(sameNum) == 1:
+            del self.byNum[task.num]
+        else:
+            del sameNum[next(i for i, other in enumerate(sameNum) if other is task)]
+    
+    #первая задача с заданным номером
+    def find(self, num: int):
+        sameNum = self.byNum.get(num)
+        return sameNum[0] if sameNum else None
+    
+    #очистка списка
+    def clear(self):
+        self.entries.clear()
+        self.byNum.clear()
+    
+    def __contains__(self, task) -> bool:
+        return id(task) in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+    
+    #итерация без копирования: вызывающий код, изменяющий список во время обхода, обходит копию
+    def __iter__(self):
+        return iter(self.entries.values())
+    
+    def __repr__(self) -> str:
+        return f"TaskList({list(self.entries.values())!r})"
+    
+    #id задач меняются при восстановлении, поэтому сохраняются сами задачи
+    def __getstate__(self):
+        return {'tasks': list(self.entries.values()), 'byNum': self.byNum}
+    
+    def __setstate__(self, state):
+        self.entries = {id(task): task for task in state['tasks']}
+        self.byNum = state['byNum']
+
+#множество задач в порядке добавления с проверкой наличия за O(1);
+#для компактного пакета хранит номера строк таблицы, а не представления строк
+class TaskSet(TaskEntries):
+    #конструктор; table - таблица задач компактного пакета
+    def __init__(self, table=None):
+        self.table = table  #таблица задач компактного пакета
+        self.entries = {}  #ключ записи -> запись задачи, в порядке добавления
+    
+    #добавление задачи, повторное добавление ничего не меняет
+    def append(self, task: Task):
+        entry = self.entryOf(task)
+        self.entries[self.keyOf(entry)] = entry
+    
+    #удаление задачи
+    def remove(self, task: Task):
+        del self.entries[self.keyOf(self.entryOf(task))]
+    
+    #очистка множества
+    def clear(self):
+        self.entries.clear()
+    
+    def __contains__(self, task) -> bool:
+        return self.keyOf(self.entryOf(task)) in self.entries
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __bool__(self) -> bool:
+        return bool(self.entries)
+    
+    def __iter__(self):
+        for entry in self.entries.values():
+            yield self.taskOf(entry)
+    
+    #id задач меняются при восстановлении, поэтому сохраняются сами записи
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['entries'] = list(self.entries.values())
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.entries = {self.keyOf(entry): entry for entry in state['entries']}
+
+#выполняющиеся задачи со счетчиками задач в состоянии RUN по типам;
+#счетчики обновляются при добавлении и удалении задач и по уведомлениям пакета о смене состояний
+class RunningTasks(TaskSet):
+    #конструктор; table - таблица задач компактного пакета
+    def __init__(self, table=None):
+        super().__init__(table)
+        self.runCounts = {taskType: 0 for taskType in TypeTask}  #тип -> количество задач в состоянии RUN
+    
+    def append(self, task: Task):
+        if task not in self:
+            super().append(task)
+            if task.state == StateTask.RUN:
+                self.runCounts[task.type] += 1
+    
+    def remove(self, task: Task):
+        super().remove(task)
+        if task.state == StateTask.RUN:
+            self.runCounts[task.type] -= 1
+    
+    def clear(self):
+        super().clear()
+        self.runCounts = {taskType: 0 for taskType in TypeTask}
+    
+    #количество задач в состоянии RUN: заданного типа или всех типов
+    def runCount(self, taskType: TypeTask = None) -> int:
+        if taskType is None:
+            return sum(self.runCounts.values())
+        return self.runCounts[taskType]
+    
+    #учет смены состояния задачи, если она есть в множестве
+    def taskStateChanged(self, task: Task, oldState: StateTask, newState: StateTask):
+        if (oldState == StateTask.RUN) != (newState == StateTask.RUN) and task in self:
+            self.runCounts[task.type] += 1 if newState == StateTask.RUN else -1
+
 @dataclass
-class Packet:
-    tasks: list = field(default_factory=list)  #список задач в пакете
+class Packet(TaskEntries):
+    tasks: TaskList = field(default_factory=TaskList)  #список задач в пакете
     type: TypePacket = None  #тип пакета
-    roundRobinQueue: list = field(default_factory=list)  #очередь Round Robin
+    roundRobinQueue: ReadyQueue = field(default_factory=RoundRobinQueue)  #очередь готовых задач планировщика (по умолчанию Round Robin)
+    scheduler: str = 'rr'  #политика планирования (ключ SCHEDULERS)
+    coreQueues: list = field(default_factory=list)  #собственные очереди ядер при распределении с перехватом задач
+    memoryBlocks: object = None  #разделы памяти ОС, получающие уведомления о завершении задач
+    runningTasks: object = None  #выполняющиеся задачи ОС, получающие уведомления о смене состояний задач
 
-    #инициализация пустого пакета или пакета из файла
-    def __init__(self, filename: str = None):
+    #инициализация пустого пакета или пакета из файла; compact - хранить задачи в таблице TaskTable
+    def __init__(self, filename: str = None, compact: bool = False):
+        self.scheduler = 'rr'
+        self.coreQueues = []
+        self.memoryBlocks = None
+        self.runningTasks = None
         if filename:
-            tasksList = self.createByJson(filename)
-            self.tasks = tasksList if len(tasksList) > 0 else []
-            if self.tasks:
-                self.type = self.checkPacketType()
-                self.roundRobinQueue = self.tasks.copy()
-            else:
-                self.type = None
-                self.roundRobinQueue = []
+            tasksList = TaskTable(self.iterTasks(filename)) if compact else TaskList(self.createByJson(filename))
+            self.tasks = tasksList if len(tasksList) > 0 else TaskList()
+            self.takeOwnership()
+            self.roundRobinQueue = RoundRobinQueue(self.tasks, self.table)
+        else:
+            self.tasks = TaskList()
+            self.roundRobinQueue = RoundRobinQueue()
+        self.recountTasks()
+        self.type = self.checkPacketType() if self.tasks else None
+    
+    #таблица задач компактного пакета; очереди и множества задач ОС хранят номера ее строк
+    @property
+    def table(self):
+        return self.tasks if isinstance(self.tasks, TaskTable) else None
+    
+    #записи всех задач пакета в порядке добавления для очереди ожидания ОС
+    def taskEntries(self):
+        return self.tasks.indexes() if isinstance(self.tasks, TaskTable) else self.tasks
+    
+    #пакет становится владельцем своих задач и получает уведомления о смене их состояний
+    def takeOwnership(self):
+        if isinstance(self.tasks, TaskTable):
+            self.tasks.owner = self
+        else:
+            for task in self.tasks:
+                task.owner = self
+    
+    #пересчет счетчиков пакета за один проход по задачам
+    def recountTasks(self):
+        self.stateCounts = {state: 0 for state in StateTask}  #количество задач в каждом состоянии
+        self.mathCount = 0  #количество математических задач
+        self.inoutCount = 0  #количество задач ввода-вывода
+        self.tasksMemory = 0  #суммарная память задач
+        self.mathTime = 0  #суммарное время математических задач
+        self.inoutTime = 0  #суммарное время задач ввода-вывода
+        for task in self.tasks:
+            self.countTask(task, 1)
+        for queue in self.readyQueues():
+            queue.recount()
+    
+    #учет задачи в счетчиках пакета: sign = 1 при добавлении, -1 при удалении
+    def countTask(self, task: Task, sign: int):
+        self.stateCounts[task.state] += sign
+        self.tasksMemory += sign * task.memory
+        if task.type == TypeTask.MATH:
+            self.mathCount += sign
+            self.mathTime += sign * task.requiredTime
         else:
-            self.tasks = []
-            self.type = None
-            self.roundRobinQueue = []
+            self.inoutCount += sign
+            self.inoutTime += sign * task.requiredTime
+    
+    #уведомление от задачи о смене состояния (вызывается из Task.changeState)
+    def taskStateChanged(self, task: Task, oldState: StateTask, newState: StateTask):
+        self.stateCounts[oldState] -= 1
+        self.stateCounts[newState] += 1
+        self.roundRobinQueue.taskStateChanged(task, oldState, newState)
+        for queue in self.coreQueues:
+            queue.taskStateChanged(task, oldState, newState)
+        if self.memoryBlocks is not None:
+            self.memoryBlocks.taskStateChanged(task, oldState, newState)
+        if self.runningTasks is not None:
+            self.runningTasks.taskStateChanged(task, oldState, newState)
     
     #автоматическое определение типа пакета   
     def checkPacketType(self):
-        inout = 0
-        math = 0
-        totalMathTime = 0
-        totalInoutTime = 0
-        
-        for task in self.tasks:  
-            if task.type == TypeTask.MATH:
-                math += 1
-                totalMathTime += task.requiredTime
-            else:
-                inout += 1
-                totalInoutTime += task.requiredTime
-                
+        return self.typeByCounts(self.mathCount, self.inoutCount, self.mathTime, self.inoutTime)
+    
+    #определение типа пакета по количеству и суммарному времени задач
+    @staticmethod
+    def typeByCounts(math: int, inout: int, totalMathTime: int, totalInoutTime: int):
         if totalMathTime == totalInoutTime:
             return TypePacket.BALANCED_PACK
         
@@ -58,7 +248,80 @@ class Packet:
         else:
             return TypePacket.INOUT_PACK
     
-    #получение следующей задачи Round Robin 
+    #смена политики планирования: задачи переносятся в очередь новой политики в прежнем порядке
+    def setScheduler(self, scheduler: str):
+        self.roundRobinQueue = createScheduler(scheduler, self.roundRobinQueue, self.table)
+        self.coreQueues = [createScheduler(scheduler, queue, self.table) for queue in self.coreQueues]
+        self.scheduler = scheduler
+    
+    #создание пустых очередей ядер; при count = 0 все ядра берут задачи из общей очереди
+    def setCoreQueues(self, count: int):
+        self.coreQueues = [createScheduler(self.scheduler, table=self.table) for _ in range(count)]
+    
+    #все очереди готовых задач: общая и очереди ядер
+    def readyQueues(self) -> list:
+        return [self.roundRobinQueue] + self.coreQueues
+    
+    #очередь, в которую возвращаются вытесненные задачи ядра
+    def queueFor(self, core: int) -> ReadyQueue:
+        return self.coreQueues[core] if self.coreQueues else self.roundRobinQueue
+    
+    #есть ли записи хотя бы в одной очереди
+    def hasQueuedTasks(self) -> bool:
+        return bool(self.roundRobinQueue) or any(self.coreQueues)
+    
+    #находится ли задача в какой-либо очереди
+    def isQueued(self, task: Task) -> bool:
+        return task in self.roundRobinQueue or any(task in queue for queue in self.coreQueues)
+    
+    #получение следующей задачи для ядра: собственная очередь, общая очередь, перехват у самого загруженного ядра
+    #из общей очереди ядро забирает свою долю задач, у другого ядра - половину его очереди
+    #busy - id задачи -> ядро, на котором она выполняется; такие задачи другим ядрам не выдаются
+    #preferGlobal - проверить общую очередь раньше собственной, чтобы задачи в ней не голодали
+    #возвращает задачу и источник: 'local', 'global' или 'steal'
+    def getNextTaskForCore(self, core: int, currentTask: Task = None, busy: dict = None,
+                           preferGlobal: bool = False) -> tuple:
+        if not self.hasQueuedTasks():
+            return None, None
+        
+        if currentTask and currentTask.state != StateTask.READY:
+            currentTask.contextSwitches += 1
+            self.queueFor(core).requeue(currentTask)
+        
+        if self.coreQueues:
+            own = [('local', self.coreQueues[core]), ('global', self.roundRobinQueue)]
+            if preferGlobal:
+                own.reverse()
+            victims = sorted((queue for i, queue in enumerate(self.coreQueues) if i != core and queue),
+                             key=lambda queue: queue.pending, reverse=True)
+            sources = own + [('steal', queue) for queue in victims]
+        else:
+            sources = [('global', self.roundRobinQueue)]
+        
+        for source, queue in sources:
+            nextTask = self.popRunnable(queue, core, busy)
+            if nextTask:
+                if source != 'local' and self.coreQueues:
+                    share = len(queue) // len(self.coreQueues) if source == 'global' else len(queue) // 2
+                    for _ in range(share):
+                        task = self.popRunnable(queue, core, busy)
+                        if task is None:
+                            break
+                        self.coreQueues[core].append(task)
+                return nextTask, source
+                    
+        return None, None
+    
+    #извлечение первой задачи очереди, которую может выполнить ядро; завершенные и занятые записи отбрасываются
+    @staticmethod
+    def popRunnable(queue: ReadyQueue, core: int, busy: dict = None) -> Task:
+        while queue:
+            task = queue.popleft()
+            if task.state != StateTask.READY and (not busy or busy.get(id(task), core) == core):
+                return task
+        return None
+    
+    #получение следующей задачи по политике планирования (по умолчанию Round Robin)
     def getNextTaskRr(self, currentTask: Task = None) -> Task:
         if not self.roundRobinQueue:
             return None
@@ -66,18 +329,11 @@ class Packet:
         #если текущая задача существует и не завершена
         if currentTask and currentTask.state != StateTask.READY:
             currentTask.contextSwitches += 1
-            self.roundRobinQueue.append(currentTask)
+            self.roundRobinQueue.requeue(currentTask)
             
-        #удаляем все завершенные задачи из начала очереди
-        while self.roundRobinQueue and self.roundRobinQueue[0]:
-            task = self.roundRobinQueue[0]
-            if task.state == StateTask.READY:
-                self.roundRobinQueue.pop(0)
-            else:
-                break
-                
+        #завершенные задачи извлекаются и отбрасываются
         while self.roundRobinQueue:
-            nextTask = self.roundRobinQueue.pop(0)
+            nextTask = self.roundRobinQueue.popleft()
             
             #проверяем, что задача существует и не завершена
             if nextTask and nextTask.state != StateTask.READY:
@@ -87,12 +343,14 @@ class Packet:
     
     #удаление завершенной задачи из очереди Round Robin
     def removeCompletedTask(self, task: Task):
-        if task and task in self.roundRobinQueue:
-            self.roundRobinQueue.remove(task)
+        if task:
+            for queue in self.readyQueues():
+                if task in queue:
+                    queue.remove(task)
     
-    #получение длины очереди Round Robin
+    #получение длины очереди Round Robin (вместе с очередями ядер)
     def getRrQueueLength(self) -> int:
-        return len([task for task in self.roundRobinQueue if task and task.state != StateTask.READY])
+        return sum(queue.pending for queue in self.readyQueues())
     
     #получить общее количество задач
     def getTasksCount(self):
@@ -100,85 +358,125 @@ class Packet:
     
     #получить общую память пакета
     def getTasksMemory(self):
-        memory = 0
-        for task in self.tasks:
-            memory += task.memory
-        return memory
+        return self.tasksMemory
     
     #получить количество задача в состоянии ожидания выполнения
     def getWaitTasks(self):
-        count = 0
-        for task in self.tasks:
-            if task.state == StateTask.WAIT:
-                count += 1
-        return count
+        return self.stateCounts[StateTask.WAIT]
     
     #получить количество задача в состоянии выполнения
     def getRunTasks(self):
-        count = 0
-        for task in self.tasks:
-            if task.state == StateTask.RUN:
-                count += 1
-        return count
+        return self.stateCounts[StateTask.RUN]
     
     #получить количество выполненых задач   
     def getReadyTasks(self):
-        count = 0
-        for task in self.tasks:
-            if task.state == StateTask.READY:
-                count += 1
-        return count
+        return self.stateCounts[StateTask.READY]
     
     #получить количество математических задач
     def getMathTasks(self):
-        count = 0
-        for task in self.tasks:
-            if task.type == TypeTask.MATH:
-                count += 1
-        return count    
+        return self.mathCount
     
     #получить количество задач ввода-вывода
     def getInOutTasks(self):
-        count = 0
-        for task in self.tasks:
-            if task.type == TypeTask.INOUT:
-                count += 1
-        return count
+        return self.inoutCount
 
     #создать пакет из json-файла
     @classmethod
     def createByJson(cls, filename: str):
+        if cls.isJsonLines(filename) or isBinaryPacket(filename):
+            return list(cls.iterTasks(filename))
+        
         with open(filename, 'r', encoding='utf-8') as f:
             data = json.load(f)        
     
         tasksList = []
         for taskData in data['tasks']:
-            task = Task(
-                num=taskData['num'],
-                type=TypeTask[taskData['type']],
-                memory=taskData['memory']
-            )
-            tasksList.append(task)
+            tasksList.append(cls.createTask(taskData))
         return tasksList
     
+    #создать задачу из записи пакета
+    @staticmethod
+    def createTask(taskData: dict) -> Task:
+        return Task(
+            num=taskData['num'],
+            type=TypeTask[taskData['type']],
+            memory=taskData['memory']
+        )
+    
+    #пакет в формате JSON Lines: одна задача на строку
+    @staticmethod
+    def isJsonLines(filename: str) -> bool:
+        return filename.endswith(('.jsonl', '.ndjson'))
+    
+    #ленивое чтение задач из файла без загрузки всего пакета в память
+    @classmethod
+    def iterTasks(cls, filename: str, chunkSize: int = 1 << 16):
+        if isBinaryPacket(filename):
+            yield from iterBinaryTasks(filename)
+            return
+        
+        if cls.isJsonLines(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield cls.createTask(json.loads(line))
+            return
+        
+        #инкрементальный разбор массива "tasks" формата ready_packets
+        decoder = json.JSONDecoder()
+        with open(filename, 'r', encoding='utf-8') as f:
+            buffer = ''
+            start = -1
+            while start < 0:
+                chunk = f.read(chunkSize)
+                if not chunk:
+                    raise ValueError(f"В файле {filename} нет массива tasks")
+                buffer += chunk
+                key = buffer.find('"tasks"')
+                if key >= 0:
+                    start = buffer.find('[', key)
+            
+            pos = start + 1
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) and buffer[pos] == ']':
+                    return
+                
+                try:
+                    taskData, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    chunk = f.read(chunkSize)
+                    if not chunk:
+                        raise
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                
+                yield cls.createTask(taskData)
+                pos = end
+    
     #добавить задачу в пакет
     def addTask(self, task: Task):
-        self.tasks.append(task)
+        if isinstance(self.tasks, TaskTable):
+            task = self.tasks.view(self.tasks.add(task.num, task.type, task.memory))
+        else:
+            self.tasks.append(task)
+            task.owner = self
+        self.countTask(task, 1)
         self.roundRobinQueue.append(task)
         self.type = self.checkPacketType()
     
     #удалить задачу по номеру
     def removeTask(self, taskNum: int):
-        taskToRemove = None
-        for task in self.tasks:
-            if task.num == taskNum:
-                taskToRemove = task
-                break
+        taskToRemove = self.tasks.find(taskNum)
         
         if taskToRemove:
             self.tasks.remove(taskToRemove)
-            if taskToRemove in self.roundRobinQueue:
-                self.roundRobinQueue.remove(taskToRemove)
+            self.countTask(taskToRemove, -1)
+            if not isinstance(self.tasks, TaskTable):
+                taskToRemove.owner = None
+            self.removeCompletedTask(taskToRemove)
             
             #переопределяем тип пакета после удаления задачи
             if self.tasks:
@@ -188,10 +486,7 @@ class Packet:
     
     #получить задачу по номеру
     def getTaskByNum(self, taskNum: int) -> Task:
-        for task in self.tasks:
-            if task.num == taskNum:
-                return task
-        return None
+        return self.tasks.find(taskNum)
     
     #получить задачи по состоянию
     def getTasksByState(self, state: StateTask) -> list:
@@ -203,19 +498,79 @@ class Packet:
     
     #получить общее время выполнения всех задач
     def getTotalExecutionTime(self) -> int:
-        totalTime = 0
-        for task in self.tasks:
-            totalTime += task.requiredTime
-        return totalTime
+        return self.mathTime + self.inoutTime
     
     #сбросить все задачи в состояние ожидания
     def resetAllTasks(self):
         for task in self.tasks:
             task.resetTask()
-        self.roundRobinQueue = self.tasks.copy()
+        self.roundRobinQueue = createScheduler(self.scheduler, self.tasks, self.table)
+        self.setCoreQueues(len(self.coreQueues))
     
     #очистить пакет
     def clearPacket(self):
+        if not isinstance(self.tasks, TaskTable):
+            for task in self.tasks:
+                task.owner = None
         self.tasks.clear()
-        self.roundRobinQueue.clear()
-        self.type = None
\ No newline at end of file
+        for queue in self.readyQueues():
+            queue.clear()
+        self.recountTasks()
+        self.type = None
+
+#пакет, задачи которого читаются из файла по мере освобождения разделов памяти
+class StreamPacket(Packet):
+    #инициализация: один проход по файлу для подсчета итогов без хранения задач
+    def __init__(self, filename: str):
+        super().__init__()
+        self.filename = filename  #файл пакета
+        self.tasksCount = 0  #количество задач
+        
+        if isBinaryPacket(filename):
+            self.readBinaryTotals(filename)
+        else:
+            self.countTotals(filename)
+        self.stateCounts[StateTask.WAIT] = self.tasksCount
+        
+        self.type = self.checkPacketType() if self.tasksCount else None
+    
+    #итоги двоичного пакета берутся из заголовка без чтения записей
+    def readBinaryTotals(self, filename: str):
+        with BinaryPacketFile(filename) as packetFile:
+            self.tasksCount = packetFile.count
+            self.mathCount = packetFile.mathCount
+            self.inoutCount = packetFile.inoutCount
+            self.tasksMemory = packetFile.totalMemory
+        self.mathTime = REQUIRED_TIME[TypeTask.MATH] * self.mathCount
+        self.inoutTime = REQUIRED_TIME[TypeTask.INOUT] * self.inoutCount
+    
+    #подсчет итогов одним проходом по файлу
+    def countTotals(self, filename: str):
+        for task in self.iterTasks(filename):
+            self.tasksCount += 1
+            self.tasksMemory += task.memory
+            if task.type == TypeTask.MATH:
+                self.mathCount += 1
+                self.mathTime += task.requiredTime
+            else:
+                self.inoutCount += 1
+                self.inoutTime += task.requiredTime
+    
+    #новый поток задач пакета; еще не прочитанные задачи считаются ожидающими
+    def openStream(self):
+        self.stateCounts = {state: 0 for state in StateTask}
+        self.stateCounts[StateTask.WAIT] = self.tasksCount
+        return self.ownTasks(self.iterTasks(self.filename))
+    
+    #поток задач, продолжающийся после первых skip уже прочитанных (при восстановлении из контрольной точки)
+    def resumeStream(self, skip: int):
+        return self.ownTasks(itertools.islice(self.iterTasks(self.filename), skip, None))
+    
+    #задачи потока получают пакет владельцем, чтобы счетчики состояний оставались верными
+    def ownTasks(self, tasks):
+        for task in tasks:
+            task.owner = self
+            yield task
+    
+    def getTasksCount(self):
+        return self.tasksCount
\ No newline at end of file
@@ -0,0 +1,91 @@
+#профилирование такта ОС: время и количество вызовов по фазам, пиковая память симулятора
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+#фазы такта в порядке выполнения; advanceSteadyTacts - пропуск тактов без событий в событийном режиме
+TACT_PHASES = ('freeCompletedTasks', 'loadTasksToMemory', 'roundRobinSchedule', 'executeCurrentTask',
+               'serviceIo', 'manageCpuStates', 'manageCoreStates', 'collectStatistics', 'advanceSteadyTacts')
+
+@dataclass
+class PhaseTiming:
+    seconds: float = 0.0  #суммарное время фазы (вместе с вложенными вызовами)
+    calls: int = 0  #количество вызовов
+
+class TactProfiler:
+    #конструктор; при memory=True память отслеживается с момента создания, чтобы учесть загрузку пакета
+    def __init__(self, memory: bool = False):
+        self.memory = memory  #отслеживать пиковую память через tracemalloc (заметно замедляет симуляцию)
+        self.tact = PhaseTiming()  #такт целиком
+        self.phases = {name: PhaseTiming() for name in TACT_PHASES}  #фазы такта
+        self.peakMemory = 0  #пиковая память симулятора в байтах
+        self.startedTracing = False  #отслеживание памяти запущено этим профилировщиком
+        self.startMemoryTracing()
+
+    #запуск отслеживания памяти, если оно нужно и еще не идет
+    def startMemoryTracing(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+
+    #подключение к ОС: методы фаз заменяются в экземпляре обертками с замером времени,
+    #поэтому без профилировщика такт выполняется методами класса без накладных расходов
+    def attach(self, system):
+        self.detach(system)
+        system.runTact = self.wrap(system.runTact, self.tact)
+        for name, timing in self.phases.items():
+            setattr(system, name, self.wrap(getattr(system, name), timing))
+        self.startMemoryTracing()
+
+    #отключение от ОС: обертки удаляются, снова действуют методы класса
+    @staticmethod
+    def detach(system):
+        for name in ('runTact',) + TACT_PHASES:
+            system.__dict__.pop(name, None)
+
+    #обертка метода с замером времени и подсчетом вызовов
+    @staticmethod
+    def wrap(method, timing: PhaseTiming):
+        clock = time.perf_counter
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timing.seconds += clock() - start
+                timing.calls += 1
+        return timed
+
+    #пиковая память симулятора в байтах (None, если память не отслеживается)
+    def getPeakMemory(self):
+        if not self.memory:
+            return None
+        if tracemalloc.is_tracing():
+            self.peakMemory = max(self.peakMemory, tracemalloc.get_traced_memory()[1])
+        return self.peakMemory
+
+    #завершение профилирования: фиксируется пиковая память, отслеживание памяти останавливается
+    def finish(self):
+        self.getPeakMemory()
+        if self.startedTracing:
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    #отчет: время фаз, их доля во времени моделирования (такты и пропуски тактов) и количество вызовов
+    def report(self) -> dict:
+        total = self.tact.seconds + self.phases['advanceSteadyTacts'].seconds
+        phases = {}
+        for name, timing in self.phases.items():
+            if timing.calls:
+                phases[name] = {
+                    'seconds': timing.seconds,
+                    'calls': timing.calls,
+                    'share': timing.seconds / total if total else 0.0
+                }
+        return {
+            'tacts': self.tact.calls,
+            'seconds': total,
+            'tactSeconds': self.tact.seconds,
+            'phases': phases,
+            'peakMemory': self.getPeakMemory()
+        }
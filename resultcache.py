@@ -0,0 +1,143 @@
+#кэш результатов симуляции на диске: ключ - хеш содержимого пакета, параметров симуляции и версии движка
+import dataclasses
+import hashlib
+import json
+import os
+import zlib
+from typing import Optional
+
+from simulation import Simulation
+
+#модули, от которых зависят результаты симуляции: их изменение делает старые записи недействительными
+ENGINE_MODULES = ('osys.py', 'cpu.py', 'task.py', 'tasktable.py', 'packet.py', 'binpacket.py', 'memory.py',
+                  'allocator.py', 'scheduler.py', 'iodevice.py', 'history.py', 'simulation.py')
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'os_simulation')  #каталог кэша
+DEFAULT_MAX_BYTES = 256 * 2**20  #наибольший размер кэша на диске
+ENTRY_EXTENSION = '.json.z'  #расширение записей кэша
+CHUNK_SIZE = 1 << 20  #размер порции при хешировании файлов
+TIMING_RESULTS = ('runTime', 'loadTime')  #замеры времени в результатах, не переносимые из кэша
+
+#параметры симуляции, от которых зависят результаты, и их значения по умолчанию
+CACHE_PARAMETERS = ('maxBlocksCount', 'ram', 'maxTacts', 'quantumSize', 'eventDriven', 'streaming', 'compact',
+                    'placement', 'scheduler', 'cores', 'dispatch', 'ioDevices', 'ioServiceTime')
+PARAMETER_DEFAULTS = {item.name: item.default for item in dataclasses.fields(Simulation)
+                      if item.name in CACHE_PARAMETERS and item.default is not dataclasses.MISSING}
+
+engineHash = None  #версия движка, вычисляется при первом обращении
+
+#хеш файла по содержимому
+def fileDigest(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+#версия движка: хеш исходных текстов модулей симуляции
+def engineVersion() -> str:
+    global engineHash
+    if engineHash is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module in ENGINE_MODULES:
+            digest.update(module.encode())
+            digest.update(fileDigest(os.path.join(directory, module)).encode())
+        engineHash = digest.hexdigest()
+    return engineHash
+
+#ключ записи: одинаковые пакеты под разными именами и одинаковые параметры дают один ключ;
+#не заданные параметры принимают значения по умолчанию Simulation, history - сохраняется ли потактовая история
+def cacheKey(jsonFile: str, parameters: dict, history: bool = True) -> str:
+    identity = {
+        'engine': engineVersion(),
+        'packet': fileDigest(jsonFile),
+        'parameters': {name: parameters.get(name, PARAMETER_DEFAULTS.get(name)) for name in CACHE_PARAMETERS},
+        'history': history
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+#результаты из кэша для текущего прогона: имя пакета заменяется текущим (одинаковое содержимое
+#может лежать под разными именами), замеры времени относятся к исходному прогону и обнуляются
+def cachedResults(results: dict, jsonFile: str) -> dict:
+    results = dict(results)
+    results['jsonFile'] = jsonFile
+    for key in TIMING_RESULTS:
+        if key in results:
+            results[key] = 0.0
+    results['cached'] = True
+    return results
+
+class ResultCache:
+    #конструктор
+    def __init__(self, directory: str = DEFAULT_CACHE_DIRECTORY, maxBytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory  #каталог записей
+        self.maxBytes = maxBytes  #наибольший суммарный размер записей
+        os.makedirs(directory, exist_ok=True)
+
+    #путь к записи по ключу
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_EXTENSION)
+
+    #результаты по ключу или None; время изменения записи обновляется, отмечая недавнее использование.
+    #запись может быть вытеснена другим процессом между чтением и обновлением времени - это промах
+    def get(self, key: str) -> Optional[dict]:
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(zlib.decompress(f.read()))
+            if entry.get('engine') != engineVersion():
+                self.discard(path)
+                return None
+            results = entry['results']
+            os.utime(path)
+        except OSError:
+            return None
+        except (ValueError, KeyError, AttributeError, zlib.error):
+            self.discard(path)
+            return None
+        return results
+
+    #сохранение результатов в сжатом виде с последующим вытеснением давно не использованных записей
+    def put(self, key: str, results: dict):
+        path = self.path(key)
+        partial = f"{path}.{os.getpid()}.part"
+        data = json.dumps({'engine': engineVersion(), 'results': results}, ensure_ascii=False)
+        with open(partial, 'wb') as f:
+            f.write(zlib.compress(data.encode('utf-8')))
+        os.replace(partial, path)
+        self.evict()
+
+    #вытеснение LRU: удаляются записи с самым старым временем использования, пока кэш больше предела
+    def evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(ENTRY_EXTENSION):
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.maxBytes:
+                break
+            self.discard(path)
+            total -= size
+
+    #удаление записи (запись могла быть уже удалена другим процессом)
+    @staticmethod
+    def discard(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    #удаление всех записей
+    def clear(self):
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(ENTRY_EXTENSION):
+                    self.discard(item.path)
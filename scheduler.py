@@ -0,0 +1,337 @@
+#планировщики: очереди готовых задач с политикой выбора, вытеснения и размера кванта
+from task import Task, TypeTask, StateTask
+from tasktable import TaskEntries
+from abc import ABC, abstractmethod
+from collections import deque
+import heapq
+
+class ReadyQueue(TaskEntries):
+    usesQuantum = True  #переключение задач по истечении кванта
+
+    #конструктор; table - таблица задач компактного пакета, в записях очереди хранятся номера ее строк
+    def __init__(self, tasks=(), table=None):
+        self.table = table  #таблица задач компактного пакета
+        self.entries = self.createEntries()  #записи очереди, включая удаленные (надгробия)
+        self.live = {}  #id задачи -> количество действующих записей
+        self.tombstones = {}  #id задачи -> количество удаленных, но не вытолкнутых записей
+        self.size = 0  #количество действующих записей
+        self.pending = 0  #количество действующих записей незавершенных задач
+        for task in tasks:
+            self.append(task)
+
+    #хранилище записей; по умолчанию FIFO
+    def createEntries(self):
+        return deque()
+
+    #запись задачи в хранилище
+    def push(self, task: Task, entry):
+        self.entries.append(entry)
+
+    #извлечение очередной записи из хранилища
+    def pop(self):
+        return self.entries.popleft()
+
+    #записи хранилища в порядке извлечения
+    def ordered(self):
+        return iter(self.entries)
+
+    #добавление задачи в очередь
+    def append(self, task: Task):
+        entry = self.entryOf(task)
+        self.push(task, entry)
+        key = self.keyOf(entry)
+        self.live[key] = self.live.get(key, 0) + 1
+        self.size += 1
+        if task.state != StateTask.READY:
+            self.pending += 1
+
+    #возврат вытесненной задачи в очередь
+    def requeue(self, task: Task):
+        self.append(task)
+
+    #извлечение очередной задачи, удаленные записи пропускаются
+    def popleft(self) -> Task:
+        while self.entries:
+            entry = self.pop()
+            key = self.keyOf(entry)
+            dead = self.tombstones.get(key, 0)
+            if dead:
+                if dead == 1:
+                    del self.tombstones[key]
+                else:
+                    self.tombstones[key] = dead - 1
+                continue
+            self.discardLive(key)
+            task = self.taskOf(entry)
+            if task.state != StateTask.READY:
+                self.pending -= 1
+            return task
+        raise IndexError(f"pop from an empty {type(self).__name__}")
+
+    #ленивое удаление задачи: запись помечается и пропускается при извлечении
+    def remove(self, task: Task):
+        key = self.keyOf(self.entryOf(task))
+        if key not in self.live:
+            raise ValueError("задача отсутствует в очереди готовых задач")
+        self.discardLive(key)
+        if task.state != StateTask.READY:
+            self.pending -= 1
+        self.tombstones[key] = self.tombstones.get(key, 0) + 1
+        if not self.size:
+            self.clear()
+
+    #уменьшение счетчика действующих записей задачи
+    def discardLive(self, key: int):
+        count = self.live[key]
+        if count == 1:
+            del self.live[key]
+        else:
+            self.live[key] = count - 1
+        self.size -= 1
+
+    #очистка очереди
+    def clear(self):
+        self.entries.clear()
+        self.live.clear()
+        self.tombstones.clear()
+        self.size = 0
+        self.pending = 0
+
+    #учет смены состояния задачи во всех ее действующих записях
+    def taskStateChanged(self, task: Task, oldState: StateTask, newState: StateTask):
+        count = self.live.get(self.keyOf(self.entryOf(task)))
+        if count:
+            if newState == StateTask.READY:
+                self.pending -= count
+            elif oldState == StateTask.READY:
+                self.pending += count
+
+    #пересчет незавершенных задач в очереди
+    def recount(self):
+        self.pending = sum(1 for task in self if task.state != StateTask.READY)
+
+    #размер кванта для задачи
+    def quantumFor(self, task: Task, quantumSize: int) -> int:
+        return quantumSize
+
+    #нужно ли снять текущую задачу с процессора
+    def shouldPreempt(self, cpu) -> bool:
+        return cpu.isQuantumExhausted()
+
+    #копия очереди в виде списка действующих задач
+    def copy(self) -> list:
+        return list(self)
+
+    #id задач меняются при восстановлении: счетчики сохраняются вместе с записями хранилища
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        entries = {self.keyOf(entry): entry for entry in self.ordered()}
+        state['live'] = [(entries[key], count) for key, count in self.live.items()]
+        state['tombstones'] = [(entries[key], count) for key, count in self.tombstones.items()]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.live = {self.keyOf(entry): count for entry, count in state['live']}
+        self.tombstones = {self.keyOf(entry): count for entry, count in state['tombstones']}
+
+    def __contains__(self, task) -> bool:
+        return self.keyOf(self.entryOf(task)) in self.live
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __iter__(self):
+        skipped = {}
+        for entry in self.ordered():
+            key = self.keyOf(entry)
+            dead = self.tombstones.get(key, 0) - skipped.get(key, 0)
+            if dead > 0:
+                skipped[key] = skipped.get(key, 0) + 1
+                continue
+            yield self.taskOf(entry)
+
+#очередь Round Robin: deque с ленивым удалением и множеством принадлежности
+class RoundRobinQueue(ReadyQueue):
+    pass
+
+#очередь с приоритетом на куче: записи (ключ, порядковый номер, запись задачи), при равных ключах - FIFO
+class HeapReadyQueue(ReadyQueue, ABC):
+    usesQuantum = False
+    preemptive = False  #вытеснение текущей задачи более срочной
+
+    #конструктор
+    def __init__(self, tasks=(), table=None):
+        self.counter = 0  #порядковый номер очередной записи
+        super().__init__(tasks, table)
+
+    def createEntries(self):
+        return []
+
+    #ключ задачи: меньший извлекается раньше
+    @abstractmethod
+    def key(self, task: Task):
+        pass
+
+    def push(self, task: Task, entry):
+        heapq.heappush(self.entries, (self.key(task), self.counter, entry))
+        self.counter += 1
+
+    def pop(self):
+        return heapq.heappop(self.entries)[2]
+
+    def ordered(self):
+        return (entry[2] for entry in sorted(self.entries))
+
+    #ближайшая незавершенная задача без извлечения; удаленные и завершенные записи отбрасываются
+    def peek(self):
+        while self.entries:
+            entry = self.entries[0][2]
+            key = self.keyOf(entry)
+            dead = self.tombstones.get(key, 0)
+            if dead:
+                heapq.heappop(self.entries)
+                if dead == 1:
+                    del self.tombstones[key]
+                else:
+                    self.tombstones[key] = dead - 1
+                continue
+            task = self.taskOf(entry)
+            if task.state == StateTask.READY:
+                heapq.heappop(self.entries)
+                self.discardLive(key)
+            else:
+                return task
+        return None
+
+    #вытеснение, если в очереди есть задача с меньшим ключом
+    def shouldPreempt(self, cpu) -> bool:
+        if not self.preemptive:
+            return False
+        task = self.peek()
+        return task is not None and self.key(task) < self.key(cpu.currentTask)
+
+#кратчайшая задача первой (без вытеснения)
+class ShortestJobFirstQueue(HeapReadyQueue):
+    def key(self, task: Task):
+        return task.requiredTime
+
+#кратчайшее оставшееся время первым (с вытеснением)
+class ShortestRemainingTimeQueue(HeapReadyQueue):
+    preemptive = True
+
+    def key(self, task: Task):
+        return task.getRemainingTime()
+
+#статические приоритеты по типу задачи (меньше - важнее), с вытеснением
+class PriorityReadyQueue(HeapReadyQueue):
+    preemptive = True
+    priorities = {TypeTask.INOUT: 0, TypeTask.MATH: 1}  #задачи ввода-вывода обслуживаются первыми
+
+    def key(self, task: Task):
+        return self.priorities[task.type]
+
+#уровни многоуровневой очереди: отдельная FIFO-очередь на каждый уровень, 0 - высший
+class FeedbackLevels:
+    #конструктор
+    def __init__(self, count: int):
+        self.levels = [deque() for _ in range(count)]  #очереди уровней
+        self.count = 0  #количество записей на всех уровнях
+
+    #добавление записи на уровень
+    def append(self, task: Task, level: int):
+        self.levels[level].append(task)
+        self.count += 1
+
+    #извлечение записи с наивысшего непустого уровня
+    def popleft(self) -> Task:
+        for level in self.levels:
+            if level:
+                self.count -= 1
+                return level.popleft()
+        raise IndexError("pop from empty FeedbackLevels")
+
+    #очистка всех уровней
+    def clear(self):
+        for level in self.levels:
+            level.clear()
+        self.count = 0
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def __iter__(self):
+        for level in self.levels:
+            yield from level
+
+#многоуровневая очередь с обратной связью: исчерпавшая квант задача опускается на уровень ниже
+class MultilevelFeedbackQueue(ReadyQueue):
+    levelsCount = 3  #количество уровней
+
+    #конструктор
+    def __init__(self, tasks=(), table=None):
+        self.levelOf = {}  #ключ записи задачи -> (запись, уровень); задачи без записи на высшем уровне
+        super().__init__(tasks, table)
+
+    def createEntries(self):
+        return FeedbackLevels(self.levelsCount)
+
+    #текущий уровень задачи
+    def levelFor(self, task: Task) -> int:
+        return self.levelOf.get(self.keyOf(self.entryOf(task)), (None, 0))[1]
+
+    def push(self, task: Task, entry):
+        self.entries.append(entry, self.levelFor(task))
+
+    #вытесненная задача понижается на один уровень
+    def requeue(self, task: Task):
+        entry = self.entryOf(task)
+        self.levelOf[self.keyOf(entry)] = (entry, min(self.levelFor(task) + 1, self.levelsCount - 1))
+        self.append(task)
+
+    #квант удваивается с каждым уровнем
+    def quantumFor(self, task: Task, quantumSize: int) -> int:
+        return quantumSize << self.levelFor(task)
+
+    def clear(self):
+        super().clear()
+        self.levelOf.clear()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['levelOf'] = list(self.levelOf.values())
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.levelOf = {self.keyOf(entry): (entry, level) for entry, level in state['levelOf']}
+
+#политики планирования
+SCHEDULERS = {
+    'rr': RoundRobinQueue,
+    'sjf': ShortestJobFirstQueue,
+    'srtf': ShortestRemainingTimeQueue,
+    'mlfq': MultilevelFeedbackQueue,
+    'priority': PriorityReadyQueue
+}
+
+#названия политик для вывода
+SCHEDULER_NAMES = {
+    'rr': "Round Robin",
+    'sjf': "SJF (кратчайшая задача первой)",
+    'srtf': "SRTF (кратчайшее оставшееся время)",
+    'mlfq': "MLFQ (многоуровневая очередь)",
+    'priority': "Приоритетное планирование"
+}
+
+#распределение задач между ядрами: общая очередь или собственные очереди ядер с перехватом задач
+DISPATCH_MODES = ('global', 'stealing')
+
+#создание очереди готовых задач по названию политики; table - таблица задач компактного пакета
+def createScheduler(name: str, tasks=(), table=None) -> ReadyQueue:
+    if name not in SCHEDULERS:
+        raise ValueError(f"Неизвестная политика планирования: {name}")
+    return SCHEDULERS[name](tasks, table)
@@ -1,8 +1,15 @@
 #симуляция
 import time
+import heapq
+import copy
+import checkpoint
+from profiling import TactProfiler
 from osys import OS
+from history import historyToDict, historyFromDict, createHistory, createRrStatistics
+from tracing import TraceLevel
 from packet import Packet
-from dataclasses import dataclass, field
+from scheduler import SCHEDULER_NAMES
+from dataclasses import dataclass, field, InitVar
 from typing import Optional
 
 @dataclass
@@ -12,17 +19,43 @@ class Simulation:
     jsonFile: str  #файл с задачами в формате JSON
     maxTacts: int  #максимальное количество тактов выполнения
     quantumSize: int = 1  #размер кванта времени для Round Robin
+    eventDriven: bool = False  #событийный режим: такты без событий пропускаются
+    streaming: bool = False  #потоковое чтение пакета: задачи загружаются по мере освобождения разделов
+    compact: bool = False  #хранение задач пакета в компактной таблице TaskTable
+    placement: Optional[str] = None  #размещение задач в ram: firstFit, bestFit, buddy (None - фиксированные разделы)
+    scheduler: str = 'rr'  #политика планирования: rr, sjf, srtf, mlfq, priority
+    cores: int = 1  #количество ядер процессора
+    dispatch: str = 'global'  #распределение задач по ядрам: global - общая очередь, stealing - очереди ядер с перехватом
+    ioDevices: int = 0  #количество устройств ввода-вывода (0 - INOUT задачи выполняются на процессоре)
+    ioServiceTime: int = 1  #тактов устройства на один такт задачи ввода-вывода
     os: Optional[OS] = None  #экземпляр операционной системы
     startTime: float = 0  #время начала симуляции
     endTime: float = 0  #время окончания симуляции
     totalTacts: int = 0  #фактическое количество выполненных тактов
+    started: bool = False  #симуляция начата: заголовок выведен (сохраняется в контрольной точке)
     memoryChanges: list = field(default_factory=list)  #история изменений памяти
+    stopRequested: bool = False  #запрошена досрочная остановка (флаг выставляется из другого потока)
+    profile: bool = False  #замер времени фаз такта
+    profileMemory: bool = False  #замер пиковой памяти симулятора (через tracemalloc)
+    profiler: Optional[TactProfiler] = None  #профилировщик такта
+    loadTime: float = 0  #время загрузки пакета и инициализации ОС
+    loadPacket: InitVar[bool] = True  #загрузить пакет в ОС; False - для результатов готового прогона (fromResults)
     
     #пост-инициализации
-    def __post_init__(self):
-        self.os = OS(ram=self.ram, maxBlocksCount=self.maxBlocksCount, quantumSize=self.quantumSize)
-        self.os.initialize(self.jsonFile)
+    def __post_init__(self, loadPacket: bool):
+        if self.profile or self.profileMemory:
+            self.profiler = TactProfiler(memory=self.profileMemory)
+        loadStart = time.time()
+        self.os = OS(ram=self.ram, maxBlocksCount=self.maxBlocksCount, quantumSize=self.quantumSize,
+                     placement=self.placement, scheduler=self.scheduler,
+                     cores=self.cores, dispatch=self.dispatch,
+                     ioDevices=self.ioDevices, ioServiceTime=self.ioServiceTime)
+        if loadPacket:
+            self.os.initialize(self.jsonFile, streaming=self.streaming, compact=self.compact)
+        if self.profiler:
+            self.profiler.attach(self.os)
         self.startTime = time.time()
+        self.loadTime = self.startTime - loadStart
         self.memoryChanges = [f"Начальное количество: {self.maxBlocksCount} разделов, "
                               f"Квант: {self.quantumSize} тактов"]
     
@@ -39,58 +72,147 @@ class Simulation:
     #запуск симуляции
     def runSimulation(self):
         self.totalTacts = 0
+        self.started = False
+        self.resumeSimulation()
+    
+    #выполнение симуляции до такта tact (не дальше maxTacts); заголовок выводится один раз, перед первым тактом
+    def runUntil(self, tact: int):
+        if not self.started:
+            self.started = True
+            self.startTime = time.time()
+            if self.os.traceLevel >= TraceLevel.INFO:
+                self.os.output("СТАРТ СИМУЛЯЦИИ Round Robin")
+                totalMemoryMb = self.os.packet.getTasksMemory()
+                totalMemoryGb = totalMemoryMb / 1024
+                self.os.output(f"Суммарно RAM пакета: {totalMemoryGb:.1f} ГБ")
+                self.os.output(f"Всего задач: {self.os.packet.getTasksCount()}")
+                self.os.output(f"MATH задач: {self.os.packet.getMathTasks()}")
+                self.os.output(f"INOUT задач: {self.os.packet.getInOutTasks()}")
+                self.os.output(f"Начальное количество разделов памяти: {self.maxBlocksCount}")
+                self.os.output(f"Размер кванта времени: {self.quantumSize} тактов")
+                self.os.output(f"Тип пакета: {self.os.packet.type.value if self.os.packet.type else 'Не определен'}")
+        elif self.isSimOver():
+            return
         
-        if self.os.outputCallback:
-            self.os.outputCallback("СТАРТ СИМУЛЯЦИИ Round Robin")
-            totalMemoryMb = self.os.packet.getTasksMemory()
-            totalMemoryGb = totalMemoryMb / 1024
-            self.os.outputCallback(f"Суммарно RAM пакета: {totalMemoryGb:.1f} ГБ")
-            self.os.outputCallback(f"Всего задач: {self.os.packet.getTasksCount()}")
-            self.os.outputCallback(f"MATH задач: {self.os.packet.getMathTasks()}")
-            self.os.outputCallback(f"INOUT задач: {self.os.packet.getInOutTasks()}")
-            self.os.outputCallback(f"Начальное количество разделов памяти: {self.maxBlocksCount}")
-            self.os.outputCallback(f"Размер кванта времени: {self.quantumSize} тактов")
-            self.os.outputCallback(f"Тип пакета: {self.os.packet.type.value if self.os.packet.type else 'Не определен'}")
-        
-        for tact in range(self.maxTacts):
-            self.totalTacts = tact + 1
-            self.os.runTact()
-
-            if self.isSimOver():
-                break
+        limit = min(tact, self.maxTacts)
+        if self.eventDriven:
+            self.runEventLoop(limit)
+        else:
+            while self.totalTacts < limit and not self.stopRequested:
+                self.totalTacts += 1
+                self.os.runTact()
 
+                if self.isSimOver():
+                    break
+    
+    #продолжение симуляции с текущего такта (после runUntil или восстановления из контрольной точки)
+    def resumeSimulation(self):
+        self.runUntil(self.maxTacts)
         self.endTime = time.time()
+        if self.profiler:
+            self.profiler.finish()
         
-        if self.os.outputCallback:
-            self.os.outputCallback("\nФИНИШ СИМУЛЯЦИИ")
-            self.os.outputCallback(f"Всего выполнено тактов: {self.totalTacts}")
-            self.os.outputCallback(f"Финальное количество разделов памяти: {self.maxBlocksCount}")
+        if self.os.traceLevel >= TraceLevel.INFO:
+            self.os.output("\nФИНИШ СИМУЛЯЦИИ")
+            if self.stopRequested:
+                self.os.output(f"Симуляция прервана на такте {self.totalTacts}")
+            self.os.output(f"Всего выполнено тактов: {self.totalTacts}")
+            self.os.output(f"Финальное количество разделов памяти: {self.maxBlocksCount}")
             
             rrStats = self.os.getRoundRobinStatistics()
-            self.os.outputCallback(f"\nСТАТИСТИКА ROUND ROBIN:")
-            self.os.outputCallback(f"  Всего переключений контекста: {rrStats['contextSwitches']}")
-            self.os.outputCallback(f"  Исчерпаний кванта: {rrStats['quantumExhaustions']}")
-            self.os.outputCallback(f"  Задач завершено в пределах кванта: {rrStats['tasksCompletedInQuantum']}")
+            self.os.output(f"\nСТАТИСТИКА ROUND ROBIN:")
+            self.os.output(f"  Всего переключений контекста: {rrStats['contextSwitches']}")
+            self.os.output(f"  Исчерпаний кванта: {rrStats['quantumExhaustions']}")
+            self.os.output(f"  Задач завершено в пределах кванта: {rrStats['tasksCompletedInQuantum']}")
             
             if rrStats['contextSwitches'] > 0:
                 efficiency = (rrStats['tasksCompletedInQuantum'] / rrStats['contextSwitches']) * 100
-                self.os.outputCallback(f"  Эффективность использования квантов: {efficiency:.1f}%")
+                self.os.output(f"  Эффективность использования квантов: {efficiency:.1f}%")
+            
+            #для Round Robin вывод остается прежним; статистика планирования доступна в getResults
+            if self.scheduler != 'rr':
+                schedulingStats = self.os.getSchedulingStatistics()
+                self.os.output(f"\nПЛАНИРОВАНИЕ ({SCHEDULER_NAMES[self.scheduler]}):")
+                self.os.output(f"  Завершено задач: {schedulingStats['completed']}")
+                self.os.output(f"  Среднее время оборота: {schedulingStats['meanTurnaround']:.1f} тактов")
+                self.os.output(f"  Среднее время ожидания: {schedulingStats['meanWaiting']:.1f} тактов, "
+                               f"максимальное {schedulingStats['maxWaiting']}")
+            
+            if self.cores > 1:
+                self.os.output(f"\nЯДРА ПРОЦЕССОРА ({self.cores}, распределение {self.dispatch}):")
+                for core, coreStats in enumerate(self.os.getCoreStatistics(), 1):
+                    self.os.output(f"  Ядро {core}: занятость {coreStats['utilization'] * 100:.1f}%, "
+                                   f"завершено задач {coreStats['completed']}, "
+                                   f"переключений {coreStats['contextSwitches']}, перехватов {coreStats['steals']}")
+            
+            if self.ioDevices:
+                ioStats = self.os.getIoStatistics()
+                self.os.output(f"\nУСТРОЙСТВА ВВОДА-ВЫВОДА ({self.ioDevices}, обслуживание {self.ioServiceTime} такт/такт задачи):")
+                for device, (served, utilization, queueLength) in enumerate(
+                        zip(ioStats['served'], ioStats['utilization'], ioStats['meanQueueLength']), 1):
+                    self.os.output(f"  Устройство {device}: обслужено запросов {served}, занятость {utilization * 100:.1f}%, "
+                                   f"средняя длина очереди {queueLength:.1f}")
+            
+            if self.placement:
+                memoryStats = self.os.getMemoryStatistics()
+                self.os.output(f"\nРАЗМЕЩЕНИЕ В ОПЕРАТИВНОЙ ПАМЯТИ ({self.placement}):")
+                self.os.output(f"  Загружено задач: {memoryStats['admitted']}, не помещаются: {memoryStats['rejected']}")
+                self.os.output(f"  Задержка допуска: средняя {memoryStats['meanLatency']:.1f}, "
+                               f"максимальная {memoryStats['maxLatency']} тактов")
+                if memoryStats['fragmentation']:
+                    fragmentation = memoryStats['fragmentation']
+                    self.os.output(f"  Внешняя фрагментация: средняя {sum(fragmentation) / len(fragmentation) * 100:.1f}%")
             
             if len(self.memoryChanges) > 1:
-                self.os.outputCallback("\nИстория изменений разделов памяти:")
+                self.os.output("\nИстория изменений разделов памяти:")
                 for change in self.memoryChanges:
-                    self.os.outputCallback(f"  {change}")
+                    self.os.output(f"  {change}")
+            
+            if self.profiler:
+                profile = self.profiler.report()
+                self.os.output(f"\nПРОФИЛЬ ТАКТА ({profile['tacts']} тактов, {profile['seconds']:.3f} с):")
+                self.os.output(f"  Загрузка пакета: {self.loadTime:.3f} с, моделирование: {self.getRunTime():.3f} с")
+                for name, phase in profile['phases'].items():
+                    self.os.output(f"  {name}: {phase['seconds']:.3f} с ({phase['share'] * 100:.1f}%), "
+                                   f"вызовов {phase['calls']}")
+                if profile['peakMemory'] is not None:
+                    self.os.output(f"  Пиковая память симулятора: {profile['peakMemory'] / 2**20:.1f} МБ")
+    
+    #событийный цикл: такты между событиями из очереди с приоритетом применяются разом
+    def runEventLoop(self, limit: int):
+        agenda = []
+        tact = self.totalTacts
+        
+        while tact < limit and not self.stopRequested:
+            tact += 1
+            self.totalTacts = tact
+            self.os.runTact()
+            
+            if self.isSimOver():
+                break
+            if not self.os.isSteady():
+                continue
+            
+            agenda.clear()
+            for event in self.os.getUpcomingEvents():
+                heapq.heappush(agenda, event)
+            heapq.heappush(agenda, (self.os.currentTact + limit - tact + 1, 'limit'))
+            
+            skip = agenda[0][0] - self.os.currentTact - 1
+            if skip > 0:
+                self.os.advanceSteadyTacts(skip)
+                tact += skip
+                self.totalTacts = tact
+    
+    #запрос досрочной остановки: симуляция завершается после текущего такта
+    def requestStop(self):
+        self.stopRequested = True
     
     #проверка условий завершения симуляции
     def isSimOver(self) -> bool:
-        return (
-            len(self.os.waitQueue) == 0 and 
-            len(self.os.runningTasks) == 0 and 
-            len(self.os.ioWaitTasks) == 0 and
-            all(task is None or task.state.value == "ВЫПОЛНЕНА" for task in self.os.memoryBlocks)
-        )
-    
-    #получить время выполнения симуляции
+        return self.os.isSimulationComplete()
+    
+    #получить время выполнения симуляции (без загрузки пакета)
     def getRunTime(self) -> float:
         return self.endTime - self.startTime
     
@@ -98,6 +220,71 @@ class Simulation:
     def getMemoryChanges(self) -> list:
         return self.memoryChanges.copy()
     
+    #результаты симуляции в виде словаря, пригодного для сохранения в JSON
+    def getResults(self, includeHistory: bool = True) -> dict:
+        results = {
+            'jsonFile': self.jsonFile,
+            'maxBlocksCount': self.maxBlocksCount,
+            'ram': self.ram,
+            'maxTacts': self.maxTacts,
+            'quantumSize': self.quantumSize,
+            'totalTacts': self.totalTacts,
+            'runTime': self.getRunTime(),
+            'loadTime': self.loadTime,
+            'packetType': self.os.packet.type.value if self.os.packet and self.os.packet.type else None,
+            'rrStatistics': historyToDict(self.os.getRoundRobinStatistics()),
+            'schedulingStatistics': self.os.getSchedulingStatistics(),
+            'coreStatistics': self.os.getCoreStatistics(),
+            'ioStatistics': self.os.getIoStatistics(),
+            'cpuStateCounts': self.os.getCpuStateCounts(),
+            'memoryChanges': self.getMemoryChanges()
+        }
+        if self.placement:
+            memoryStats = self.os.getMemoryStatistics()
+            if not includeHistory:
+                del memoryStats['fragmentation'], memoryStats['freeMemory']
+            results['memoryStatistics'] = historyToDict(memoryStats)
+        if self.profiler:
+            results['profile'] = self.profiler.report()
+        if includeHistory:
+            results['history'] = historyToDict(self.os.history)
+        return results
+    
+    #восстановление из контрольной точки или копии: обертки профилировщика не копируются и подключаются заново
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.profiler:
+            self.profiler.attach(self.os)
+    
+    #независимая копия симуляции в памяти: история тактов разделяется до первой записи (копирование при записи),
+    #получатели вывода не копируются
+    def fork(self) -> 'Simulation':
+        return copy.deepcopy(self)
+    
+    #сохранение контрольной точки симуляции в файл
+    def saveCheckpoint(self, filename: str):
+        checkpoint.saveCheckpoint(self, filename)
+    
+    #восстановление результатов готового прогона (например, из кэша) без выполнения тактов:
+    #история, статистика Round Robin и состояния процессора становятся доступны как после симуляции
+    def restoreResults(self, results: dict):
+        taskTypes = results['history']['taskTypes']
+        self.os.history = historyFromDict(createHistory(taskTypes['MATH'], taskTypes['INOUT']), results['history'])
+        self.os.rrStatistics = historyFromDict(createRrStatistics(), results['rrStatistics'])
+        self.os.cpuStateCounts = dict(results['cpuStateCounts'])
+        self.os.currentTact = results['totalTacts']
+        self.totalTacts = results['totalTacts']
+        self.started = True
+        self.memoryChanges = list(results['memoryChanges'])
+        self.startTime = self.endTime = time.time()
+    
+    #симуляция с результатами готового прогона (например, из кэша): пакет не читается, такты не выполняются
+    @classmethod
+    def fromResults(cls, results: dict, **parameters) -> 'Simulation':
+        simulation = cls(loadPacket=False, **parameters)
+        simulation.restoreResults(results)
+        return simulation
+    
     #сброс симуляции к начальному состоянию
     def reset(self):
         if self.os:
@@ -106,6 +293,8 @@ class Simulation:
         self.startTime = time.time()
         self.endTime = 0
         self.totalTacts = 0
+        self.started = False
+        self.stopRequested = False
         self.memoryChanges = [f"Начальное количество: {self.maxBlocksCount} разделов, "
                               f"Квант: {self.quantumSize} тактов"]
     
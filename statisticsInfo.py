@@ -1,9 +1,13 @@
 #статистика
 import pyqtgraph as pg
 import numpy as np
+from history import Series, snapshotHistory
+from downsample import decimate, GrowingDecimation, MIN_BUCKETS
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QGridLayout, QLabel)
 from PyQt6.QtCore import Qt
 
+CPU_STATE_COLORS = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#ffa726']  #цвета столбцов состояний процессора
+
 class Statistics(QWidget):    
     #конструктор
     def __init__(self, simulation):
@@ -11,15 +15,30 @@ class Statistics(QWidget):
         self.simulation = simulation
         self.initUI()
     
-    #сбор данных из истории выполнения ОС
+    #сбор данных из истории выполнения ОС (ряды - массивы NumPy только для чтения, без копирования);
+    #срез истории согласован по длине, поэтому данные можно читать и во время симуляции
     def collectRealData(self):
-        history = self.simulation.os.history.copy()
+        history = self.toArrays(snapshotHistory(self.simulation.os.history))
         
         history['cpuStateCounts'] = self.simulation.os.getCpuStateCounts()
         
         history['rrStatistics'] = self.simulation.os.getRoundRobinStatistics()
         return history
     
+    #замена буферов истории на представления NumPy
+    def toArrays(self, source: dict) -> dict:
+        result = {}
+        for key, value in source.items():
+            if isinstance(value, Series):
+                result[key] = np.asarray(value.view())
+            elif isinstance(value, memoryview):
+                result[key] = np.asarray(value)
+            elif isinstance(value, dict):
+                result[key] = self.toArrays(value)
+            else:
+                result[key] = value
+        return result
+    
     #инициализация визуализации
     def initUI(self):
         mainLayout = QVBoxLayout()
@@ -33,6 +52,19 @@ class Statistics(QWidget):
         self.infoLayout = QVBoxLayout(self.infoContainer)
         mainLayout.addWidget(self.infoContainer)
         
+        #строки сводки создаются один раз, при обновлении меняется только текст
+        self.infoLabel = QLabel()
+        self.infoLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.infoLabel.setStyleSheet("font-size: 12pt; color: #666; margin: 5px;")
+        self.changesLabel = QLabel()
+        self.changesLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.changesLabel.setStyleSheet("font-size: 11pt; color: #2c3e50; margin: 3px; font-style: italic;")
+        self.rrLabel = QLabel()
+        self.rrLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.rrLabel.setStyleSheet("font-size: 11pt; color: #ff6b00; margin: 3px;")
+        for label in (self.infoLabel, self.changesLabel, self.rrLabel):
+            self.infoLayout.addWidget(label)
+        
         self.setupGraphs()
         
         graphsContainer = QWidget()
@@ -99,11 +131,6 @@ class Statistics(QWidget):
     
     #обновление информации о симуляции
     def updateSimulationInfo(self):
-        for i in reversed(range(self.infoLayout.count())):
-            widget = self.infoLayout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
         history = self.collectRealData()
         
         infoText = f"Всего тактов: {self.simulation.totalTacts} | " \
@@ -111,28 +138,21 @@ class Statistics(QWidget):
                    f"MATH задач: {history['taskTypes']['MATH']} | " \
                    f"INOUT задач: {history['taskTypes']['INOUT']} | " \
                    f"Разделов памяти: {self.simulation.maxBlocksCount}"
-        infoLabel = QLabel(infoText)
-        infoLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        infoLabel.setStyleSheet("font-size: 12pt; color: #666; margin: 5px;")
-        self.infoLayout.addWidget(infoLabel)
+        self.infoLabel.setText(infoText)
         
         memoryChanges = self.simulation.getMemoryChanges()
         if len(memoryChanges) > 1:
             changesText = "Изменения памяти: " + " → ".join([change.split(": ")[1].split(" ")[0] for change in memoryChanges])
-            changesLabel = QLabel(changesText)
-            changesLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            changesLabel.setStyleSheet("font-size: 11pt; color: #2c3e50; margin: 3px; font-style: italic;")
-            self.infoLayout.addWidget(changesLabel)
+            self.changesLabel.setText(changesText)
+        self.changesLabel.setVisible(len(memoryChanges) > 1)
             
         if 'rrStatistics' in history:
             rrStats = history['rrStatistics']
             rrText = f"Round Robin: Переключений: {rrStats['contextSwitches']} | " \
                      f"Исчерпаний кванта: {rrStats['quantumExhaustions']} | " \
                      f"Завершено в кванте: {rrStats['tasksCompletedInQuantum']}"
-            rrLabel = QLabel(rrText)
-            rrLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            rrLabel.setStyleSheet("font-size: 11pt; color: #ff6b00; margin: 3px;")
-            self.infoLayout.addWidget(rrLabel)
+            self.rrLabel.setText(rrText)
+        self.rrLabel.setVisible('rrStatistics' in history)
     
     #настройка графиков
     def setupGraphs(self):
@@ -150,7 +170,10 @@ class Statistics(QWidget):
         self.cpuPlot.setLabel('bottom', 'Состояния процессора')
         self.cpuPlot.showGrid(x=True, y=True, alpha=0.3)
         
-        self.cpuBars = None
+        #столбцы создаются один раз, при обновлении меняются только высоты
+        self.cpuBars = pg.BarGraphItem(x=range(len(CPU_STATE_COLORS)), height=[0] * len(CPU_STATE_COLORS),
+                                       width=0.6, brushes=CPU_STATE_COLORS)
+        self.cpuPlot.addItem(self.cpuBars)
             
         self.tasksPlot = pg.PlotWidget()
         self.tasksPlot.setBackground('w')
@@ -190,6 +213,78 @@ class Statistics(QWidget):
         self.efficiencyPlot.showGrid(x=True, y=True, alpha=0.3)
         self.efficiencyPlot.setYRange(0, 100)
         self.efficiencyCurve = self.efficiencyPlot.plot(pen=pg.mkPen('purple', width=3))
+        
+        self.curveData = {}  #кривая -> (график, полный ряд x, полный ряд y, множитель значений)
+        self.decimations = {}  #кривая -> прореживание всего ряда, дополняемое по мере роста истории
+        for plot in (self.memoryPlot, self.tasksPlot, self.rrQueuePlot, self.freeMemPlot, self.efficiencyPlot):
+            plot.getViewBox().sigXRangeChanged.connect(
+                lambda viewBox, viewRange, plot=plot: self.refreshDetail(plot))
+        
+        #надписи об отсутствии данных постоянно находятся на графиках и только показываются или скрываются
+        self.noDataTexts = []
+        for plot in self.getPlots():
+            text = pg.TextItem("Нет данных для отображения", color='red', anchor=(0.5, 0.5))
+            text.setPos(5, 0)
+            text.hide()
+            plot.addItem(text)
+            self.noDataTexts.append(text)
+    
+    #все графики статистики
+    def getPlots(self) -> list:
+        return [self.memoryPlot, self.cpuPlot, self.tasksPlot,
+                self.rrQueuePlot, self.freeMemPlot, self.efficiencyPlot]
+    
+    #переход к новой симуляции: графики и их элементы сохраняются, данные сбрасываются и заполняются заново
+    def setSimulation(self, simulation):
+        self.simulation = simulation
+        self.resetCharts()
+        self.updateCharts()
+    
+    #очистка данных графиков без удаления кривых и столбцов
+    def resetCharts(self):
+        for curve in self.curveData:
+            curve.setData([], [])
+        self.curveData.clear()
+        self.decimations.clear()
+        self.cpuBars.setOpts(height=[0] * len(CPU_STATE_COLORS))
+        for plot in self.getPlots():
+            plot.getViewBox().enableAutoRange(axis='x')
+    
+    #данные кривой: полный ряд сохраняется, на график передается прореженная видимая часть;
+    #прореживание всего ряда дополняется только точками, добавленными с прошлого обновления,
+    #и строится заново, лишь если ширина графика изменилась больше чем вдвое
+    def setCurveData(self, plot, curve, x, y, scale: float = 1.0):
+        self.curveData[curve] = (plot, x, y, scale)
+        width = max(int(plot.getViewBox().width()), MIN_BUCKETS)
+        decimation = self.decimations.get(curve)
+        if decimation is None or not decimation.buckets <= 2 * width <= 4 * decimation.buckets:
+            decimation = self.decimations[curve] = GrowingDecimation(width)
+        decimation.update(y)
+        self.renderCurve(curve)
+    
+    #отрисовка кривой с детализацией по ширине графика: при автомасштабе - весь ряд, иначе видимый диапазон
+    def renderCurve(self, curve):
+        plot, x, y, scale = self.curveData[curve]
+        viewBox = plot.getViewBox()
+        if viewBox.autoRangeEnabled()[0]:
+            indices = self.decimations[curve].indices
+            x, y = x[indices], y[indices]
+        else:
+            start, end = viewBox.viewRange()[0]
+            x, y = decimate(x, y, int(viewBox.width()), start, end)
+        curve.setData(x, y * scale)
+    
+    #наибольшее значение ряда кривой (по прореженному ряду, в котором сохранены все максимумы)
+    def curveMaximum(self, curve) -> float:
+        plot, x, y, scale = self.curveData[curve]
+        indices = self.decimations[curve].indices
+        return y[indices].max() * scale if len(indices) else 0
+    
+    #пересчет прореживания кривых графика при масштабировании и прокрутке
+    def refreshDetail(self, plot):
+        for curve, (owner, x, y, scale) in self.curveData.items():
+            if owner is plot:
+                self.renderCurve(curve)
     
     #обновление графиков реальными данными
     def updateCharts(self):
@@ -197,16 +292,28 @@ class Statistics(QWidget):
         
         history = self.collectRealData()
         
-        if not history['tacts']:
+        if len(history['tacts']) == 0:
             self.showNoDataMessage()
             return
-            
+        
+        self.plotHistory(history)
+    
+    #обновление графиков во время симуляции: только кривые и диаграмма состояний, без сводки
+    def updateLiveCharts(self):
+        history = self.collectRealData()
+        if len(history['tacts']) > 0:
+            self.plotHistory(history)
+    
+    #вывод рядов истории на графики
+    def plotHistory(self, history: dict):
         tacts = history['tacts']
+        for text in self.noDataTexts:
+            text.hide()
         
         try:
             #график 1: использование памяти
-            if history['memoryBlocksUsed'] and len(history['memoryBlocksUsed']) == len(tacts):
-                self.memoryCurve.setData(tacts, history['memoryBlocksUsed'])
+            if len(history['memoryBlocksUsed']) == len(tacts):
+                self.setCurveData(self.memoryPlot, self.memoryCurve, tacts, history['memoryBlocksUsed'])
                 self.memoryPlot.setYRange(0, self.simulation.maxBlocksCount)
             
             #график 2: состояния CPU
@@ -222,14 +329,7 @@ class Statistics(QWidget):
                 states = list(stateCounts.keys())
                 counts = list(stateCounts.values())
                 
-                colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#ffa726']
-                
-                if self.cpuBars:
-                    self.cpuPlot.removeItem(self.cpuBars)
-                
-                bg = pg.BarGraphItem(x=range(len(states)), height=counts, width=0.6, brushes=colors)
-                self.cpuPlot.addItem(bg)
-                self.cpuBars = bg
+                self.cpuBars.setOpts(x=range(len(states)), height=counts)
                 
                 self.cpuPlot.getAxis('bottom').setTicks([[(i, self.getShortStateName(state)) 
                                                         for i, state in enumerate(states)]])
@@ -241,38 +341,35 @@ class Statistics(QWidget):
             #график 3: статусы задач 
             for state, curve in self.taskCurves.items():
                 if (state in history['taskStates'] and 
-                    history['taskStates'][state] and 
                     len(history['taskStates'][state]) == len(tacts)):
-                    curve.setData(tacts, history['taskStates'][state])
+                    self.setCurveData(self.tasksPlot, curve, tacts, history['taskStates'][state])
             
             #график 4: очередь Round Robin
             if ('rrQueueLength' in history and 
-                history['rrQueueLength'] and 
                 len(history['rrQueueLength']) == len(tacts)):
-                self.rrQueueCurve.setData(tacts, history['rrQueueLength'])
-                maxQueueLength = max(history['rrQueueLength']) if history['rrQueueLength'] else 1
+                self.setCurveData(self.rrQueuePlot, self.rrQueueCurve, tacts, history['rrQueueLength'])
+                maxQueueLength = self.curveMaximum(self.rrQueueCurve)
                 self.rrQueuePlot.setYRange(0, maxQueueLength * 1.1)
             elif 'rrQueueLength' in history:
                 minLen = min(len(tacts), len(history['rrQueueLength']))
                 if minLen > 0:
-                    self.rrQueueCurve.setData(tacts[:minLen], history['rrQueueLength'][:minLen])
+                    self.setCurveData(self.rrQueuePlot, self.rrQueueCurve, tacts[:minLen], history['rrQueueLength'][:minLen])
             
             #график 5: свободная память
-            if history['memoryUsage'] and len(history['memoryUsage']) == len(tacts):
-                self.freeMemCurve.setData(tacts, history['memoryUsage'])
+            if len(history['memoryUsage']) == len(tacts):
+                self.setCurveData(self.freeMemPlot, self.freeMemCurve, tacts, history['memoryUsage'])
             
             #график 6: эффективность
-            if (history['taskStates']['READY'] and 
-                len(history['taskStates']['READY']) == len(tacts)):
+            if len(history['taskStates']['READY']) == len(tacts):
                 totalTasks = sum(history['taskTypes'].values())
                 completedTasks = history['taskStates']['READY']
                 if totalTasks > 0:
-                    completionRate = [(tasks / totalTasks) * 100 for tasks in completedTasks]
-                    self.efficiencyCurve.setData(tacts, completionRate)
+                    self.setCurveData(self.efficiencyPlot, self.efficiencyCurve, tacts, completedTasks,
+                                      scale=100.0 / totalTasks)
             
         except Exception as e:
             print(f"Ошибка при обновлении графиков: {e}")
-            print(f"Длины массивов: tacts={len(tacts) if tacts else 0}")
+            print(f"Длины массивов: tacts={len(tacts)}")
             print(f"memoryBlocksUsed={len(history['memoryBlocksUsed']) if 'memoryBlocksUsed' in history else 'нет'}")
             print(f"rrQueueLength={len(history['rrQueueLength']) if 'rrQueueLength' in history else 'нет'}")
             import traceback
@@ -290,12 +387,9 @@ class Statistics(QWidget):
     
     #вывод сообщения об отсутствии данных
     def showNoDataMessage(self):
-        for graph in [self.memoryPlot, self.cpuPlot, self.tasksPlot, 
-                     self.rrQueuePlot, self.freeMemPlot, self.efficiencyPlot]:
-            graph.clear()
-            text = pg.TextItem("Нет данных для отображения", color='red', anchor=(0.5, 0.5))
-            text.setPos(5, 0)
-            graph.addItem(text)
+        self.resetCharts()
+        for text in self.noDataTexts:
+            text.show()
     
     #метод для полного обновления статистики после новой симуляции
     def refreshStatistics(self):
@@ -0,0 +1,213 @@
+#перебор параметров симуляции с параллельным запуском в нескольких процессах
+import argparse
+import csv
+import functools
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from allocator import ALLOCATORS
+from cli import expandPackets
+from resultcache import ResultCache, cacheKey, cachedResults, DEFAULT_CACHE_DIRECTORY, DEFAULT_MAX_BYTES
+from scheduler import SCHEDULERS, DISPATCH_MODES
+from simulation import Simulation
+
+#составление сетки параметров
+def buildGrid(packets: list, quantumSizes: list, blockCounts: list, ramSizes: list = (1,),
+              maxTacts: int = 1000, eventDriven: bool = False, placement: str = None,
+              schedulers: list = ('rr',), coreCounts: list = (1,), dispatch: str = 'global',
+              ioDeviceCounts: list = (0,), ioServiceTime: int = 1) -> list:
+    return [
+        {
+            'jsonFile': jsonFile,
+            'quantumSize': quantumSize,
+            'maxBlocksCount': blocksCount,
+            'ram': ram,
+            'maxTacts': maxTacts,
+            'eventDriven': eventDriven,
+            'placement': placement,
+            'scheduler': scheduler,
+            'cores': cores,
+            'dispatch': dispatch,
+            'ioDevices': ioDevices,
+            'ioServiceTime': ioServiceTime
+        }
+        for jsonFile, quantumSize, blocksCount, ram, scheduler, cores, ioDevices in itertools.product(
+            packets, quantumSizes, blockCounts, ramSizes, schedulers, coreCounts, ioDeviceCounts)
+    ]
+
+#запуск симуляции для одной точки сетки (выполняется в дочернем процессе);
+#при заданном каталоге кэша точки, посчитанные ранее, берутся из него
+def runPoint(point: dict, cacheDirectory: str = None, cacheBytes: int = DEFAULT_MAX_BYTES) -> dict:
+    cache = results = None
+    if cacheDirectory:
+        cache = ResultCache(cacheDirectory, cacheBytes)
+        key = cacheKey(point['jsonFile'], point, history=False)
+        results = cache.get(key)
+        if results is not None:
+            results = cachedResults(results, point['jsonFile'])
+    if results is None:
+        simulation = Simulation(**point)
+        simulation.runSimulation()
+        results = simulation.getResults(includeHistory=False)
+        if cache is not None:
+            cache.put(key, results)
+
+    row = dict(point)
+    row['packetType'] = results['packetType']
+    row['totalTacts'] = results['totalTacts']
+    row['runTime'] = results['runTime']
+    for key in ('contextSwitches', 'quantumExhaustions', 'tasksCompletedInQuantum'):
+        row[key] = results['rrStatistics'][key]
+    for key in ('meanTurnaround', 'meanWaiting', 'maxWaiting'):
+        row[key] = results['schedulingStatistics'][key]
+    row['completed'] = results['schedulingStatistics']['completed']
+    row['throughput'] = row['completed'] / max(1, row['totalTacts'])
+    coreStatistics = results['coreStatistics']
+    row['utilization'] = sum(statistics['utilization'] for statistics in coreStatistics) / len(coreStatistics)
+    row['steals'] = sum(statistics['steals'] for statistics in coreStatistics)
+    ioStatistics = results['ioStatistics']
+    row['ioUtilization'] = sum(ioStatistics['utilization']) / max(1, ioStatistics['devices'])
+    for state, count in results['cpuStateCounts'].items():
+        row[state] = count
+    if 'memoryStatistics' in results:
+        for key in ('admitted', 'rejected', 'meanLatency', 'maxLatency', 'internalWaste'):
+            row[key] = results['memoryStatistics'][key]
+    return row
+
+#запуск всей сетки параметров, строки результатов возвращаются в порядке сетки
+def runSweep(grid: list, workers: int = None, cacheDirectory: str = None,
+             cacheBytes: int = DEFAULT_MAX_BYTES) -> list:
+    run = functools.partial(runPoint, cacheDirectory=cacheDirectory, cacheBytes=cacheBytes)
+    if workers == 1:
+        return [run(point) for point in grid]
+    #крупные порции уменьшают накладные расходы на передачу задач между процессами
+    chunkSize = max(1, len(grid) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, grid, chunksize=chunkSize))
+
+#запуск сетки пакетной симуляцией: точки с одинаковыми параметрами считаются одним проходом NumPy
+def runBatchSweep(grid: list) -> list:
+    from batchsim import BatchSimulation
+    
+    groups = {}
+    for index, point in enumerate(grid):
+        if point.get('placement'):
+            raise ValueError("пакетная симуляция не поддерживает размещение задач по объему памяти")
+        if point.get('scheduler', 'rr') != 'rr':
+            raise ValueError("пакетная симуляция поддерживает только планирование Round Robin")
+        if point.get('cores', 1) != 1:
+            raise ValueError("пакетная симуляция поддерживает только одноядерный процессор")
+        if point.get('ioDevices', 0):
+            raise ValueError("пакетная симуляция не поддерживает устройства ввода-вывода")
+        key = (point['quantumSize'], point['maxBlocksCount'], point['ram'], point['maxTacts'])
+        groups.setdefault(key, []).append(index)
+    
+    rows = [None] * len(grid)
+    for (quantumSize, blocksCount, ram, maxTacts), indexes in groups.items():
+        batch = BatchSimulation([grid[i]['jsonFile'] for i in indexes], blocksCount, ram, maxTacts, quantumSize)
+        batch.runSimulation()
+        for i, results in zip(indexes, batch.getResults()):
+            row = dict(grid[i])
+            row['packetType'] = results['packetType']
+            row['totalTacts'] = results['totalTacts']
+            row['runTime'] = results['runTime']
+            row.update(results['rrStatistics'])
+            row.update(results['cpuStateCounts'])
+            rows[i] = row
+    return rows
+
+#сохранение таблицы результатов в CSV
+def writeCsv(rows: list, stream):
+    if not rows:
+        return
+    writer = csv.DictWriter(stream, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+
+#разбор списка целых чисел и диапазонов вида 1,2,5-8
+def parseIntList(text: str) -> list:
+    values = []
+    for part in text.split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            values.extend(range(int(start), int(end) + 1))
+        else:
+            values.append(int(part))
+    return values
+
+#разбор списка политик планирования вида rr,sjf
+def parseSchedulers(text: str) -> list:
+    names = text.split(',')
+    for name in names:
+        if name not in SCHEDULERS:
+            raise argparse.ArgumentTypeError(f"неизвестная политика планирования: {name}")
+    return names
+
+#разбор аргументов командной строки
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m sweep",
+        description="Перебор параметров симуляции Round Robin на всех ядрах"
+    )
+    parser.add_argument("packets", nargs="+", help="файлы пакетов задач, допускаются шаблоны")
+    parser.add_argument("-q", "--quantum", type=parseIntList, default=[1], help="размеры кванта, например 1,2,4-6")
+    parser.add_argument("-b", "--blocks", type=parseIntList, default=[1], help="количества разделов, например 1-8")
+    parser.add_argument("-r", "--ram", type=parseIntList, default=[1], help="объемы оперативной памяти в ГБ, например 1,2,4")
+    parser.add_argument("-p", "--placement", choices=list(ALLOCATORS), default=None,
+                        help="размещение задач в оперативной памяти по объему (по умолчанию фиксированные разделы)")
+    parser.add_argument("-S", "--scheduler", type=parseSchedulers, default=['rr'],
+                        help="политики планирования через запятую, например rr,sjf,mlfq")
+    parser.add_argument("-n", "--cores", type=parseIntList, default=[1],
+                        help="количества ядер процессора, например 1,2,4,8")
+    parser.add_argument("-d", "--dispatch", choices=DISPATCH_MODES, default='global',
+                        help="распределение задач по ядрам: общая очередь или очереди ядер с перехватом")
+    parser.add_argument("-i", "--io-devices", type=parseIntList, default=[0],
+                        help="количества устройств ввода-вывода, например 0,1,2 (0 - INOUT задачи на процессоре)")
+    parser.add_argument("--io-service-time", type=int, default=1, help="тактов устройства на один такт задачи")
+    parser.add_argument("-t", "--tacts", type=int, default=1000, help="максимальное количество тактов")
+    parser.add_argument("-e", "--event-driven", action="store_true", help="событийный режим симуляции")
+    parser.add_argument("--batch", action="store_true",
+                        help="пакетная симуляция на массивах NumPy (без истории, все точки в одном процессе)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="количество процессов (по умолчанию все ядра)")
+    parser.add_argument("--cache", action="store_true",
+                        help="брать точки, посчитанные ранее, из кэша результатов на диске")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIRECTORY, help="каталог кэша результатов")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // 2**20,
+                        help="наибольший размер кэша в МБ")
+    parser.add_argument("-o", "--output", default="-", help="файл результатов (по умолчанию stdout)")
+    parser.add_argument("--csv", action="store_true", help="сохранить таблицу в CSV вместо JSON")
+    return parser.parse_args(argv)
+
+#точка входа
+def main(argv=None) -> int:
+    args = parseArgs(argv)
+    grid = buildGrid(expandPackets(args.packets), args.quantum, args.blocks,
+                     ramSizes=args.ram, maxTacts=args.tacts, eventDriven=args.event_driven,
+                     placement=args.placement, schedulers=args.scheduler,
+                     coreCounts=args.cores, dispatch=args.dispatch,
+                     ioDeviceCounts=args.io_devices, ioServiceTime=args.io_service_time)
+    try:
+        cacheDirectory = args.cache_dir if args.cache else None
+        rows = runBatchSweep(grid) if args.batch else runSweep(grid, args.workers, cacheDirectory,
+                                                               args.cache_size * 2**20)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ошибка перебора параметров: {e}", file=sys.stderr)
+        return 1
+
+    stream = sys.stdout if args.output == "-" else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        if args.csv:
+            writeCsv(rows, stream)
+        else:
+            json.dump(rows, stream, ensure_ascii=False, indent=2)
+            stream.write("\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
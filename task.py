@@ -1,6 +1,6 @@
 #задача
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 #типы задач
 class TypeTask(Enum):
@@ -13,27 +13,22 @@ class StateTask(Enum):
     RUN = "В ПРОЦЕССЕ ВЫПОЛНЕНИЯ"
     READY = "ВЫПОЛНЕНА"
 
-@dataclass
-class Task:
-    num: int  #номер задачи
-    type: TypeTask  #тип задачи
-    memory: int  #объем памяти для задачи
-    state: StateTask = StateTask.WAIT  #текущее состояние задачи
-    executionTime: int = 0  #время, затраченное на выполнение
-    requiredTime: int = 0  #общее требуемое время для выполнения
-    remainingQuantum: int = 0  #оставшееся время в текущем кванте
-    contextSwitches: int = 0  #количество переключений контекста для этой задачи
+#требуемое время выполнения задачи по типу
+REQUIRED_TIME = {
+    TypeTask.MATH: 3,  #MATH задачи выполняются 3 такта
+    TypeTask.INOUT: 2  #INOUT задачи выполняются 2 такта
+}
 
-    #устанавливает требуемое время в зависимости от типа задачи
-    def __post_init__(self):
-        if self.type == TypeTask.MATH:
-            self.requiredTime = 3  #MATH задачи выполняются 3 такта
-        else:
-            self.requiredTime = 2  #INOUT задачи выполняются 2 такта
+#поведение задачи, общее для объектов Task и строк таблицы задач (TaskTable)
+class TaskBase:
+    __slots__ = ()
     
-    #изменение состояния задачи
+    #изменение состояния задачи; пакет-владелец обновляет свои счетчики состояний
     def changeState(self, stateTask: StateTask):
+        oldState = self.state
         self.state = stateTask
+        if self.owner is not None and oldState != stateTask:
+            self.owner.taskStateChanged(self, oldState, stateTask)
     
     #выполнение одного такта задачи
     def execute(self) -> bool:
@@ -83,7 +78,23 @@ class Task:
     
     #сброс задачи в начальное состояние
     def resetTask(self):
-        self.state = StateTask.WAIT
+        self.changeState(StateTask.WAIT)
         self.executionTime = 0
         self.remainingQuantum = 0
-        self.contextSwitches = 0
\ No newline at end of file
+        self.contextSwitches = 0
+
+@dataclass(slots=True)
+class Task(TaskBase):
+    num: int  #номер задачи
+    type: TypeTask  #тип задачи
+    memory: int  #объем памяти для задачи
+    state: StateTask = StateTask.WAIT  #текущее состояние задачи
+    executionTime: int = 0  #время, затраченное на выполнение
+    requiredTime: int = 0  #общее требуемое время для выполнения
+    remainingQuantum: int = 0  #оставшееся время в текущем кванте
+    contextSwitches: int = 0  #количество переключений контекста для этой задачи
+    owner: object = field(default=None, repr=False, compare=False)  #пакет, ведущий счетчики задач
+
+    #устанавливает требуемое время в зависимости от типа задачи
+    def __post_init__(self):
+        self.requiredTime = REQUIRED_TIME[self.type]
\ No newline at end of file
@@ -0,0 +1,241 @@
+#таблица задач: компактное хранение задач пакета в параллельных типизированных массивах
+from array import array
+from weakref import WeakValueDictionary
+from typing import Optional
+
+from task import TaskBase, TypeTask, StateTask, REQUIRED_TIME
+
+#коды типов и состояний задач в таблице
+TASK_TYPES = tuple(TypeTask)
+TASK_TYPE_CODES = {taskType: code for code, taskType in enumerate(TASK_TYPES)}
+TASK_STATES = tuple(StateTask)
+TASK_STATE_CODES = {state: code for code, state in enumerate(TASK_STATES)}
+
+#записи задач в очередях и множествах: для задач компактного пакета хранятся номера строк таблицы,
+#а представления строк создаются только при обращении к задаче
+class TaskEntries:
+    table = None  #таблица задач компактного пакета; None - записями служат сами задачи
+
+    #запись для задачи
+    def entryOf(self, task):
+        return task if self.table is None else task.index
+
+    #задача по записи
+    def taskOf(self, entry):
+        return entry if self.table is None else self.table.view(entry)
+
+    #ключ записи в словарях: id задачи или номер строки
+    def keyOf(self, entry) -> int:
+        return id(entry) if self.table is None else entry
+
+class TaskTable:
+    #конструктор
+    def __init__(self, tasks=()):
+        self.nums = array('q')  #номера задач
+        self.types = array('b')  #коды типов задач
+        self.memories = array('l')  #объем памяти задач
+        self.states = array('b')  #коды состояний задач
+        self.executionTimes = array('l')  #время, затраченное на выполнение
+        self.requiredTimes = array('l')  #требуемое время выполнения
+        self.remainingQuanta = array('l')  #оставшееся время в текущем кванте
+        self.contextSwitches = array('l')  #количество переключений контекста
+        self.removed = bytearray()  #надгробия: 1 - задача удалена из таблицы
+        self.removedCount = 0  #количество удаленных задач
+        self.rows = {}  #номер задачи -> первая строка с этим номером
+        self.views = WeakValueDictionary()  #выданные представления строк: одна строка - один объект
+        self.owner = None  #пакет, ведущий счетчики задач
+        for task in tasks:
+            self.add(task.num, task.type, task.memory)
+
+    #добавление задачи, возвращает номер строки
+    def add(self, num: int, taskType: TypeTask, memory: int) -> int:
+        self.nums.append(num)
+        self.types.append(TASK_TYPE_CODES[taskType])
+        self.memories.append(memory)
+        self.states.append(TASK_STATE_CODES[StateTask.WAIT])
+        self.executionTimes.append(0)
+        self.requiredTimes.append(REQUIRED_TIME[taskType])
+        self.remainingQuanta.append(0)
+        self.contextSwitches.append(0)
+        self.removed.append(0)
+        index = len(self.nums) - 1
+        self.rows.setdefault(num, index)
+        return index
+
+    #представление строки таблицы в виде задачи
+    def view(self, index: int) -> 'TaskView':
+        task = self.views.get(index)
+        if task is None:
+            if not 0 <= index < len(self.nums):
+                raise IndexError("индекс задачи вне таблицы")
+            task = TaskView(self, index)
+            self.views[index] = task
+        return task
+
+    #первая задача с заданным номером
+    def find(self, num: int) -> Optional['TaskView']:
+        index = self.rows.get(num)
+        return self.view(index) if index is not None else None
+
+    #номера строк неудаленных задач в порядке добавления
+    def indexes(self):
+        if not self.removedCount:
+            return range(len(self.nums))
+        return (index for index, removed in enumerate(self.removed) if not removed)
+
+    #значения столбца для неудаленных задач
+    def column(self, values: array):
+        if not self.removedCount:
+            return values
+        return [values[index] for index in self.indexes()]
+
+    #количество задач с заданным состоянием
+    def countState(self, state: StateTask) -> int:
+        return self.column(self.states).count(TASK_STATE_CODES[state])
+
+    #количество задач заданного типа
+    def countType(self, taskType: TypeTask) -> int:
+        return self.column(self.types).count(TASK_TYPE_CODES[taskType])
+
+    #суммарная память задач
+    def totalMemory(self) -> int:
+        return sum(self.column(self.memories))
+
+    #суммарное требуемое время задач
+    def totalRequiredTime(self) -> int:
+        return sum(self.column(self.requiredTimes))
+
+    #сброс всех задач в начальное состояние
+    def resetAll(self):
+        count = len(self.nums)
+        self.states = array('b', [TASK_STATE_CODES[StateTask.WAIT]]) * count
+        self.executionTimes = array('l', [0]) * count
+        self.remainingQuanta = array('l', [0]) * count
+        self.contextSwitches = array('l', [0]) * count
+        if self.owner is not None:
+            self.owner.recountTasks()
+
+    #удаление задачи: строка помечается надгробием и не сдвигается,
+    #чтобы номера строк в выданных представлениях и очередях оставались верными
+    def remove(self, task: 'TaskView'):
+        index = task.index
+        if task.table is not self or self.removed[index]:
+            raise ValueError("задача отсутствует в пакете")
+        self.removed[index] = 1
+        self.removedCount += 1
+        num = self.nums[index]
+        if self.rows.get(num) == index:
+            del self.rows[num]
+            for row in range(index + 1, len(self.nums)):
+                if self.nums[row] == num and not self.removed[row]:
+                    self.rows[num] = row
+                    break
+
+    #очистка таблицы
+    def clear(self):
+        for column in (self.nums, self.types, self.memories, self.states, self.executionTimes,
+                       self.requiredTimes, self.remainingQuanta, self.contextSwitches, self.removed):
+            del column[:]
+        self.removedCount = 0
+        self.rows.clear()
+        self.views = WeakValueDictionary()
+
+    #слабый словарь представлений не сохраняется: в состоянии он заменяется обычным, чтобы
+    #восстановленные представления строк оставались единственными объектами своих строк
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['views'] = dict(self.views)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.views = WeakValueDictionary(state['views'])
+
+    def __len__(self) -> int:
+        return len(self.nums) - self.removedCount
+
+    def __getitem__(self, index: int) -> 'TaskView':
+        if index < 0:
+            index += len(self.nums)
+        return self.view(index)
+
+    def __iter__(self):
+        for index in self.indexes():
+            yield self.view(index)
+
+#представление строки таблицы с интерфейсом задачи Task
+class TaskView(TaskBase):
+    __slots__ = ('table', 'index', '__weakref__')
+
+    def __init__(self, table: TaskTable, index: int):
+        self.table = table  #таблица задач
+        self.index = index  #номер строки в таблице
+
+    @property
+    def num(self) -> int:
+        return self.table.nums[self.index]
+
+    @property
+    def type(self) -> TypeTask:
+        return TASK_TYPES[self.table.types[self.index]]
+
+    @property
+    def memory(self) -> int:
+        return self.table.memories[self.index]
+
+    #удаленная задача больше не уведомляет пакет о смене состояния
+    @property
+    def owner(self):
+        return None if self.table.removed[self.index] else self.table.owner
+
+    @property
+    def state(self) -> StateTask:
+        return TASK_STATES[self.table.states[self.index]]
+
+    @state.setter
+    def state(self, value: StateTask):
+        self.table.states[self.index] = TASK_STATE_CODES[value]
+
+    @property
+    def executionTime(self) -> int:
+        return self.table.executionTimes[self.index]
+
+    @executionTime.setter
+    def executionTime(self, value: int):
+        self.table.executionTimes[self.index] = value
+
+    @property
+    def requiredTime(self) -> int:
+        return self.table.requiredTimes[self.index]
+
+    @requiredTime.setter
+    def requiredTime(self, value: int):
+        self.table.requiredTimes[self.index] = value
+
+    @property
+    def remainingQuantum(self) -> int:
+        return self.table.remainingQuanta[self.index]
+
+    @remainingQuantum.setter
+    def remainingQuantum(self, value: int):
+        self.table.remainingQuanta[self.index] = value
+
+    @property
+    def contextSwitches(self) -> int:
+        return self.table.contextSwitches[self.index]
+
+    @contextSwitches.setter
+    def contextSwitches(self, value: int):
+        self.table.contextSwitches[self.index] = value
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TaskView):
+            return self.table is other.table and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.index))
+
+    def __repr__(self) -> str:
+        return f"TaskView(num={self.num}, type={self.type}, memory={self.memory}, state={self.state}, " \
+               f"executionTime={self.executionTime}, requiredTime={self.requiredTime})"
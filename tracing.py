@@ -0,0 +1,48 @@
+#трассировка работы ОС: структурированные события с уровнями подробности
+from enum import IntEnum
+from dataclasses import dataclass, field
+
+#уровни подробности трассировки
+class TraceLevel(IntEnum):
+    OFF = 0  #трассировка отключена
+    INFO = 1  #сводка и ход выполнения
+    EVENTS = 2  #загрузка, планирование, завершение задач, переключения процессора
+    DEBUG = 3  #потактовое выполнение и отладочная информация
+
+#шаблоны сообщений для событий трассировки
+TRACE_MESSAGES = {
+    'progress': "Такт {tact}: завершено {completed}/{total}, память {used}/{blocks}{current}",
+    'steadyStretch': "Такты {first}-{last}: без событий{current}",
+    'blocksChanged': "Изменено количество разделов памяти: {old} -> {new}",
+    'tasksReturned': "Возвращено в очередь: {count} задач",
+    'reset': "Система сброшена в начальное состояние",
+    'rrSwitch': "Round Robin: переключение на задачу {num} ({type})",
+    'rrContinue': "Round Robin: нет новых задач, продолжаем выполнение задачи {num}",
+    'rrNoTasks': "Round Robin: нет доступных задач для выполнения",
+    'taskStolen': "Ядро {core}: задача {num} перехвачена из очереди другого ядра",
+    'taskLoaded': "Задача {num} ({type}) загружена в раздел {block}",
+    'taskStarted': "Начато выполнение задачи {num} ({type}) в разделе {block}",
+    'taskCompleted': "Задача {num} ({type}) завершена!",
+    'ioSubmitted': "Задача {num} (INOUT) передана устройству ввода-вывода {device}, запросов на устройстве: {queue}",
+    'taskFreed': "Задача {num} завершена, освобождается раздел {block}",
+    'taskRejected': "Задача {num} ({memory} МБ) не помещается в оперативную память ({capacity} МБ) и пропущена",
+    'blocksExceeded': "ПРЕДУПРЕЖДЕНИЕ: Превышено максимальное количество разделов! ({used} > {blocks})",
+    'cpuSwitch': "ПЕРЕКЛЮЧЕНИЕ CPU: {old} -> {new} {reason}",
+    'taskRunning': "Задача {num} ({type}) выполняется: {executed}/{required} тактов, квант: {quantum}",
+    'taskProgress': "Задача {num} ({type}) выполняется: {executed}/{required} тактов",
+    'taskPreempted': "Задача {num} ({type}) была вытеснена",
+    'taskState': "Задача {num} в состоянии {state}",
+    'noActiveTask': "Нет активной задачи для выполнения",
+    'cpuDebug': "Отладочная информация: Используется разделов={used}/{blocks}, MATH={math}, INOUT={inout}",
+}
+
+@dataclass
+class TraceEvent:
+    tact: int  #такт, на котором произошло событие
+    level: TraceLevel  #уровень подробности события
+    kind: str  #вид события (ключ TRACE_MESSAGES)
+    fields: dict = field(default_factory=dict)  #данные события
+
+    #текстовое представление события
+    def format(self) -> str:
+        return TRACE_MESSAGES[self.kind].format(**self.fields)